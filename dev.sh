@@ -28,7 +28,7 @@
 #   - Comprehensive error checking and user feedback
 # 
 # REQUIREMENTS:
-#   - bash, python3, yq, jq
+#   - bash, python3 (with PyYAML and Pillow)
 #   - ROMs folder in repo root (symlinked to public/roms)
 #   - Games metadata in public/games/
 # =============================================================================
@@ -125,10 +125,10 @@ if [ ! -L "public/roms" ]; then
 fi
 
 # Check required tools
-for tool in python3 yq jq; do
+for tool in python3; do
     if ! command -v $tool &> /dev/null; then
         echo -e "${RED}❌ Error: Required tool '$tool' not found${NC}"
-        echo "   Please install: pip install yq && brew install jq"
+        echo "   Please install python3, PyYAML and Pillow (pip install pyyaml pillow)"
         exit 1
     fi
 done
@@ -142,8 +142,69 @@ document.addEventListener('DOMContentLoaded', () => {
     initializeNewsletter();
 });
 
+// Base URL of the generated game lists: local files for development, Google Cloud Storage for production
+function gamelistBaseUrl() {
+    const isLocalhost = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
+    return isLocalhost ? '' : 'https://storage.googleapis.com/bonjourarcade/';
+}
+
+/**
+ * Fetches the compact list index, falling back to the full gamelist.json if the
+ * index is not available. The index is read through artifact-manifest.json, a
+ * tiny file naming its content-hashed copy (gamelist-index.<hash>.json), so the
+ * browser can keep the index itself in its cache until it actually changes.
+ */
+async function fetchGameList() {
+    const baseUrl = gamelistBaseUrl();
+    let indexUrl = `${baseUrl}gamelist-index.json`;
+    try {
+        const manifestResponse = await fetch(`${baseUrl}artifact-manifest.json`, { cache: 'no-cache' });
+        if (manifestResponse.ok) {
+            const manifest = await manifestResponse.json();
+            const entry = manifest.files && manifest.files['gamelist-index.json'];
+            if (entry && entry.path) {
+                indexUrl = `${baseUrl}${entry.path}`;
+            }
+        }
+    } catch (error) {
+        console.warn('Could not fetch artifact-manifest.json:', error);
+    }
+    try {
+        const response = await fetch(indexUrl);
+        if (response.ok) {
+            return await response.json();
+        }
+        console.warn(`${indexUrl} not available (Status: ${response.status}), loading gamelist.json`);
+    } catch (error) {
+        console.warn(`Could not fetch ${indexUrl}, loading gamelist.json:`, error);
+    }
+    const response = await fetch(`${baseUrl}gamelist.json`);
+    if (!response.ok) {
+        // Handle common errors like file not found
+        if(response.status === 404) {
+            throw new Error(`gamelist.json not found at ${response.url}. Did you run the generation script?`);
+        } else {
+            throw new Error(`HTTP error fetching gamelist.json! Status: ${response.status}`);
+        }
+    }
+    return response.json();
+}
+
+/**
+ * Fetches the full entry of one game (gamelist/<id>.json), or null if it is not available.
+ */
+async function fetchGameDetails(gameId) {
+    try {
+        const response = await fetch(`${gamelistBaseUrl()}gamelist/${encodeURIComponent(gameId)}.json`);
+        return response.ok ? await response.json() : null;
+    } catch (error) {
+        console.warn(`Could not fetch details of game '${gameId}':`, error);
+        return null;
+    }
+}
+
 /**
- * Fetches the gamelist.json file and triggers functions to update the page.
+ * Fetches the game list and triggers functions to update the page.
  */
 // Detect if browser is Firefox
 function isFirefox() {
@@ -169,31 +230,25 @@ async function fetchGameData() {
             console.warn('Could not fetch current game from API:', error);
         }
 
-        // Use local gamelist.json for development, Google Cloud Storage for production
-        const isLocalhost = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
-        const gamelistUrl = isLocalhost ? 'gamelist.json' : 'https://storage.googleapis.com/bonjourarcade/gamelist.json';
-        const response = await fetch(gamelistUrl);
-
-        if (!response.ok) {
-            // Handle common errors like file not found
-            if(response.status === 404) {
-                throw new Error(`gamelist.json not found at ${response.url}. Did you run the generation script?`);
-            } else {
-                throw new Error(`HTTP error fetching gamelist.json! Status: ${response.status}`);
-            }
-        }
-        // Parse the JSON data from the response
-        const data = await response.json();
+        // The list index only has what the grid needs; the featured game's full entry
+        // (announcement message...) is its own small file, fetched at the same time
+        const [data, featuredDetails] = await Promise.all([
+            fetchGameList(),
+            currentGameId ? fetchGameDetails(currentGameId) : null,
+        ]);
 
         // Check if the received data structure is as expected (now simplified)
         if (!data || !Array.isArray(data.games)) {
-             throw new Error("Invalid data structure received from gamelist.json.");
+             throw new Error("Invalid data structure received from the game list.");
         }
 
         // Find the current game of the week from the games list
         let gameOfTheWeek = null;
         if (currentGameId) {
             gameOfTheWeek = data.games.find(game => game.id === currentGameId);
+            if (gameOfTheWeek && featuredDetails) {
+                Object.assign(gameOfTheWeek, featuredDetails);
+            }
         }
 
         // Store game of the week data globally for potential redirects
@@ -696,7 +751,8 @@ function populatePreviousGames(games) {
         }
         title.textContent = displayTitle;
 
-        link.appendChild(img);
+        // Offer the WebP/AVIF variants at the thumbnail's 150px width when available
+        link.appendChild(withCoverVariants(img, game, '150px'));
         link.appendChild(title);
         gameItem.appendChild(link);
         gridContainer.appendChild(gameItem);
@@ -748,6 +804,27 @@ function displayError(selector, message) {
     }
 }
 
+// Wrap an <img> in a <picture> listing the cover variants (coverVariants in gamelist.json)
+// so browsers that support AVIF or WebP download those instead of the PNG.
+function withCoverVariants(img, game, sizes) {
+    const variants = game.coverVariants;
+    if (!variants || Object.keys(variants).length === 0) {
+        return img;
+    }
+    const picture = document.createElement('picture');
+    ['avif', 'webp'].forEach(format => {
+        const widths = variants[format];
+        if (!widths) return;
+        const source = document.createElement('source');
+        source.type = 'image/' + format;
+        source.srcset = Object.entries(widths).map(([width, url]) => `${url} ${width}w`).join(', ');
+        source.sizes = sizes;
+        picture.appendChild(source);
+    });
+    picture.appendChild(img);
+    return picture;
+}
+
 function capitalizeFirst(str) {
     if (!str) return '';
     return str.charAt(0).toUpperCase() + str.slice(1);
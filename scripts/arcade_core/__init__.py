@@ -0,0 +1,26 @@
+"""
+Shared loaders for the BonjourArcade scripts.
+
+Catalog (public/gamelist.json), Predictions (predictions.yaml/predictions.json)
+and GameMetadata (public/games/<id>/metadata.yaml) load their files lazily,
+once per process, and reload them only when they change on disk. Titles are
+resolved to game IDs through the tiered TitleIndex (see titles.py). Use the
+get_*() functions to share one instance across a whole run.
+"""
+
+from .catalog import Catalog, get_catalog
+from .metadata import GameMetadata, get_game_metadata
+from .predictions import Predictions, get_predictions
+from .titles import TitleIndex, TitleMatch, normalize_title
+
+__all__ = [
+    'Catalog',
+    'GameMetadata',
+    'Predictions',
+    'TitleIndex',
+    'TitleMatch',
+    'get_catalog',
+    'get_game_metadata',
+    'get_predictions',
+    'normalize_title',
+]
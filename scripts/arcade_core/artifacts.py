@@ -0,0 +1,193 @@
+"""
+Post-build stage for the generated JSON and text artifacts of public/.
+
+For every artifact (ARTIFACTS: the gamelist, its index and detail files, the
+title index, the predictions schedule, plinko/gamelist.txt...), compress()
+writes <file>.gz (gzip level 9) and <file>.br (brotli quality 11, when the
+brotli module is installed) next to it. GitLab Pages serves these variants
+directly to browsers that accept them. A variant that would not be smaller
+than its source is not written (and a stale one is removed). Variants newer
+than their source are kept as they are, so an unchanged detail file costs a
+stat.
+
+The heavy files (HASHED_ARTIFACTS) also get a content-hashed copy,
+gamelist.<sha256[:12]>.json, with the same variants, that never changes once
+written and can be cached for a year. The pointer manifest (public/artifact-manifest.json) maps each
+file to its current hashed copy; it is the only file clients need to
+revalidate. Older hashed copies are removed from public/.
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PUBLIC_DIR = 'public'
+MANIFEST_NAME = 'artifact-manifest.json'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+VARIANT_EXTENSIONS = ('br', 'gz')
+
+# Globs relative to public/
+ARTIFACTS = (
+    'gamelist.json',
+    'gamelist-index.json',
+    'gamelist/*.json',
+    'title-index.json',
+    'plinko/predict/predictions.json',
+    'plinko/gamelist.txt',
+    'leaderboards/history.json',
+    'api/current-game',
+)
+HASHED_ARTIFACTS = ('gamelist.json', 'gamelist-index.json')
+
+Compressed = namedtuple('Compressed', ['path', 'size', 'gzip_size', 'brotli_size', 'seconds', 'reused'])
+Compressed.__doc__ = """Outcome of compressing one artifact.
+
+gzip_size and brotli_size are None when that variant was not written (not
+smaller than the source, or brotli is not installed). reused is True when the
+variants were already up to date.
+"""
+
+
+def encoders():
+    """(extension, function) of the variants this Python can write, most efficient first."""
+    found = []
+    if brotli is not None:
+        found.append(('br', lambda data: brotli.compress(data, quality=BROTLI_QUALITY)))
+    found.append(('gz', lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)))
+    return found
+
+
+def collect_artifacts(public_dir=PUBLIC_DIR, patterns=ARTIFACTS):
+    """The sorted paths of the artifacts that exist."""
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(public_dir, pattern)):
+            if os.path.isfile(path):
+                paths.add(path)
+    return sorted(paths)
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def compress(path, force=False):
+    """Write the compressed variants of one file. Returns a Compressed."""
+    start = time.perf_counter()
+    source_mtime = os.stat(path).st_mtime_ns
+    sizes = {}
+    reused = not force
+    data = None
+    available = encoders()
+    writable = [extension for extension, _ in available]
+    for extension in VARIANT_EXTENSIONS:
+        # A variant this Python cannot rewrite must not outlive its source
+        variant_mtime = _mtime(f"{path}.{extension}")
+        if extension not in writable and variant_mtime is not None and variant_mtime < source_mtime:
+            os.remove(f"{path}.{extension}")
+    for extension, encode in available:
+        variant = f"{path}.{extension}"
+        variant_mtime = _mtime(variant)
+        if not force and variant_mtime is not None and variant_mtime >= source_mtime:
+            sizes[extension] = os.path.getsize(variant)
+            continue
+        reused = False
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        compressed = encode(data)
+        if len(compressed) < len(data):
+            _write_atomic(variant, compressed)
+            sizes[extension] = len(compressed)
+        elif variant_mtime is not None:
+            os.remove(variant)
+    size = len(data) if data is not None else os.path.getsize(path)
+    return Compressed(path, size, sizes.get('gz'), sizes.get('br'), time.perf_counter() - start, reused)
+
+
+def compress_all(paths, force=False, max_workers=None):
+    """Compress many files concurrently (zlib and brotli release the GIL). Returns the Compressed, in order."""
+    if not paths:
+        return []
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(paths)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda path: compress(path, force), paths))
+
+
+def _hashed_pattern(path):
+    stem, extension = os.path.splitext(os.path.basename(path))
+    return re.compile(rf"^{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(extension)}$")
+
+
+def hashed_copies(path):
+    """The existing content-hashed copies of a file."""
+    directory = os.path.dirname(path) or '.'
+    pattern = _hashed_pattern(path)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(os.path.join(directory, name) for name in names if pattern.match(name))
+
+
+def write_hashed_copy(path):
+    """Copy a file to <stem>.<hash><ext> and remove its older hashed copies (and their variants).
+
+    The file's up-to-date compressed variants are copied along, so run this
+    after compress(). Returns the manifest entry of the file: {'path',
+    'sha256', 'size'}, path being the hashed copy's name relative to the
+    file's directory.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    stem, extension = os.path.splitext(os.path.basename(path))
+    hashed_name = f"{stem}.{digest[:HASH_LENGTH]}{extension}"
+    hashed_path = os.path.join(os.path.dirname(path), hashed_name)
+    if not os.path.exists(hashed_path):
+        _write_atomic(hashed_path, data)
+    source_mtime = os.stat(path).st_mtime_ns
+    for variant in VARIANT_EXTENSIONS:
+        # Same content, same variants: no need to compress the copy again
+        variant_mtime = _mtime(f"{path}.{variant}")
+        if variant_mtime is not None and variant_mtime >= source_mtime and not os.path.exists(f"{hashed_path}.{variant}"):
+            with open(f"{path}.{variant}", 'rb') as f:
+                _write_atomic(f"{hashed_path}.{variant}", f.read())
+    for old in hashed_copies(path):
+        if old != hashed_path:
+            for stale in [old] + [f"{old}.{variant}" for variant in VARIANT_EXTENSIONS]:
+                if os.path.exists(stale):
+                    os.remove(stale)
+    return {'path': hashed_name, 'sha256': digest, 'size': len(data)}
+
+
+def write_manifest(files, public_dir=PUBLIC_DIR):
+    """Write the pointer manifest {'version', 'files': {name: entry}} atomically. Returns its path."""
+    path = os.path.join(public_dir, MANIFEST_NAME)
+    data = {'version': MANIFEST_VERSION, 'files': files}
+    _write_atomic(path, (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8'))
+    return path
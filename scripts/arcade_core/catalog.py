@@ -0,0 +1,96 @@
+"""
+The game catalog: public/gamelist.json with lookups by game ID and title.
+"""
+
+import json
+import os
+
+from .files import CachedFile
+from .titles import TITLE_INDEX_PATH, TITLE_INDEX_VERSION, TitleIndex
+
+GAMELIST_PATH = 'public/gamelist.json'
+
+
+class TitleIndexFile(CachedFile):
+    """The title index artifact written by build_gamelist.py."""
+
+    def parse(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('version') != TITLE_INDEX_VERSION:
+            raise ValueError(f"unsupported title index format in {path}")
+        return TitleIndex(data)
+
+
+class Catalog(CachedFile):
+    """public/gamelist.json, loaded once and indexed by game ID and title.
+
+    Games come from the `games` array, plus the legacy `gameOfTheWeek` and
+    `previousGames` keys when present. Titles are resolved through the title
+    index artifact when it is at least as recent as gamelist.json, otherwise
+    through an index built in memory from the games.
+    """
+
+    def __init__(self, path=GAMELIST_PATH, title_index_path=TITLE_INDEX_PATH):
+        super().__init__(path)
+        self._games = []
+        self._by_id = {}
+        self._title_index = None
+        self._title_index_file = TitleIndexFile(title_index_path)
+
+    def parse(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def reindex(self):
+        gamelist = self._data if isinstance(self._data, dict) else {}
+        games = list(gamelist.get('games') or [])
+        if gamelist.get('gameOfTheWeek') and gamelist['gameOfTheWeek'].get('id'):
+            games.append(gamelist['gameOfTheWeek'])
+        games.extend(gamelist.get('previousGames') or [])
+
+        self._games = games
+        self._by_id = {}
+        for game in games:
+            self._by_id.setdefault(game.get('id'), game)
+        self._title_index = None
+
+    @property
+    def games(self):
+        """All games of the catalog, in gamelist order."""
+        self.load()
+        return self._games
+
+    def get(self, game_id):
+        """Return the gamelist entry of a game ID, or None."""
+        self.load()
+        return self._by_id.get(game_id)
+
+    @property
+    def title_index(self):
+        """The TitleIndex of the catalog's games."""
+        self.load()
+        artifact = self._title_index_file
+        try:
+            if os.stat(artifact.path).st_mtime_ns >= self._stamp[0]:
+                return artifact.load()
+        except (OSError, ValueError):
+            pass
+        if self._title_index is None:
+            self._title_index = TitleIndex.from_games(self._games)
+        return self._title_index
+
+    def resolve_title(self, title):
+        """Resolve a title to a game ID. Returns a titles.TitleMatch."""
+        return self.title_index.resolve(title)
+
+
+_shared = {}
+
+
+def get_catalog(path=GAMELIST_PATH, title_index_path=TITLE_INDEX_PATH):
+    """Return the process-wide Catalog for these paths."""
+    key = (path, title_index_path)
+    if key not in _shared:
+        _shared[key] = Catalog(path, title_index_path)
+    return _shared[key]
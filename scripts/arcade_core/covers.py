@@ -0,0 +1,84 @@
+"""
+Cover image variants: WebP/AVIF encodes of each cover.png at several widths.
+
+generate_thumbnails.py writes the variants next to the cover
+(public/games/<id>/cover-<width>.<format>), and build_gamelist.py records them in
+gamelist.json as `coverVariants`, {format: {width: url}}, for srcset/<picture>.
+The widths come from the same rule on both sides (variant_widths() of the
+cover's width), but the gamelist only lists the variant files that exist on
+disk, so it must be built after the variants (the build scripts run
+generate_thumbnails.py first, or rebuild the gamelist once it is done).
+"""
+
+import functools
+import os
+import struct
+
+VARIANT_WIDTHS = (150, 300, 600)
+VARIANT_FORMATS = ('avif', 'webp')  # most efficient first
+VARIANT_OPTIONS = {
+    'avif': {'quality': 60, 'speed': 6},
+    'webp': {'quality': 80, 'method': 6},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def available_formats():
+    """The variant formats the installed Pillow can encode (none without Pillow)."""
+    try:
+        from PIL import features
+    except ImportError:
+        return ()
+    formats = []
+    for fmt in VARIANT_FORMATS:
+        try:
+            if features.check(fmt):
+                formats.append(fmt)
+        except ValueError:
+            # Older Pillow versions do not know about this format at all
+            continue
+    return tuple(formats)
+
+
+def png_size(path):
+    """Return (width, height) from a PNG's IHDR chunk, or None if it is not a PNG."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+    except OSError:
+        return None
+    if len(header) < 24 or header[:8] != b'\x89PNG\r\n\x1a\n' or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def variant_widths(source_width):
+    """Widths to encode for a source: every standard width below it, plus the source width itself if smaller than the largest."""
+    widths = [width for width in VARIANT_WIDTHS if width < source_width]
+    if source_width < VARIANT_WIDTHS[-1]:
+        widths.append(source_width)
+    return widths
+
+
+def variant_filename(width, fmt):
+    return f"cover-{width}.{fmt}"
+
+
+def existing_variants(cover_dir, source_width):
+    """The variants of a cover found in cover_dir, as (width, format) pairs, most efficient format first."""
+    if not source_width:
+        return []
+    return [
+        (width, fmt)
+        for fmt in VARIANT_FORMATS
+        for width in variant_widths(source_width)
+        if os.path.isfile(os.path.join(cover_dir, variant_filename(width, fmt)))
+    ]
+
+
+def cover_variants(game_id, variants):
+    """Return the coverVariants map of a game, {format: {width: url}}, from its existing (width, format) variants."""
+    result = {}
+    for width, fmt in variants:
+        result.setdefault(fmt, {})[str(width)] = f"/games/{game_id}/{variant_filename(width, fmt)}"
+    return result
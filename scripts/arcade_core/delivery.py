@@ -0,0 +1,292 @@
+"""
+Delivery queue: POST newsletter deliveries with retries, backoff and a persisted outbox.
+
+Every delivery (one ConvertKit broadcast, one message per webhook) has an
+idempotency key, e.g. "202545:webhook:discord_bonjourarcade", and is attempted
+up to max_attempts times:
+
+- 2xx: sent.
+- 429: wait for the delay the server asks for (Retry-After, Discord's
+  X-RateLimit-Reset-After header or the retry_after field of its JSON body),
+  then retry. Delays longer than MAX_RETRY_AFTER fail the delivery instead.
+- 408/425/5xx, timeouts and connection errors: retry after an exponential
+  backoff with jitter (base_delay * 2^attempt, capped at max_delay).
+- other 4xx: fail without retrying.
+
+Deliveries that are not safe to repeat (a ConvertKit broadcast) are only retried
+after an ambiguous failure (read timeout, 5xx: the server may have processed
+the request) if their already_delivered() check says the first attempt did not
+go through. The key is also sent as an Idempotency-Key header.
+
+The outbox (a small JSON file, .cache/newsletter/outbox.json by default) records
+the state of every key. Keys already marked sent are skipped, so re-running a
+failed job resumes only the deliveries that failed. The outbox never stores URLs
+or payloads, which contain webhook tokens and API secrets.
+"""
+
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+OUTBOX_PATH = '.cache/newsletter/outbox.json'
+OUTBOX_VERSION = 1
+
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+# Longest Retry-After the queue will wait for; longer delays fail the delivery
+MAX_RETRY_AFTER = 120.0
+MAX_WORKERS = 8
+# (connect, read) timeout in seconds for every request
+TIMEOUT = (5, 15)
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+Delivery = namedtuple('Delivery', ['key', 'label', 'url', 'payload', 'headers', 'safe_to_repeat', 'already_delivered'])
+
+DeliveryResult = namedtuple('DeliveryResult', ['key', 'label', 'ok', 'skipped', 'status_code', 'attempts', 'elapsed', 'error', 'response'])
+DeliveryResult.__doc__ = """Outcome of one delivery.
+
+skipped is True when the outbox already had the key marked as sent (nothing was
+posted). status_code is None when no response was received. response is the
+last requests.Response, or None. elapsed is in seconds, retries and waits included.
+"""
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class Outbox:
+    """The persisted state of every delivery key; an Outbox(None) only lives in memory."""
+
+    def __init__(self, path=OUTBOX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != OUTBOX_VERSION:
+            return {}
+        return data.get('deliveries', {})
+
+    def get(self, key):
+        with self._lock:
+            return dict(self.entries.get(key, {}))
+
+    def is_sent(self, key):
+        with self._lock:
+            return self.entries.get(key, {}).get('status') == 'sent'
+
+    def record(self, key, **fields):
+        """Update a key's entry and write the outbox to disk, atomically."""
+        with self._lock:
+            entry = self.entries.setdefault(key, {})
+            entry.update(fields, updated=now_iso())
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': OUTBOX_VERSION, 'deliveries': self.entries}, f, indent=2, sort_keys=True, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+def parse_retry_after(response):
+    """Seconds the server asked to wait before retrying, or None.
+
+    Reads Retry-After (seconds or an HTTP date), Discord's X-RateLimit-Reset-After
+    header, and the retry_after field of Discord's 429 JSON body, and returns the largest.
+    """
+    delays = []
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            delays.append(float(retry_after))
+        except ValueError:
+            try:
+                when = email.utils.parsedate_to_datetime(retry_after)
+                delays.append((when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    reset_after = response.headers.get('X-RateLimit-Reset-After')
+    if reset_after:
+        try:
+            delays.append(float(reset_after))
+        except ValueError:
+            pass
+    if response.status_code == 429:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and isinstance(body.get('retry_after'), (int, float)):
+            delays.append(float(body['retry_after']))
+    if not delays:
+        return None
+    return max(0.0, max(delays))
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+    """Exponential backoff with jitter: a random delay in [d/2, d], d = base_delay * 2^(attempt-1) capped at max_delay."""
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def reached_server(error):
+    """False when a requests ConnectionError happened before the request was sent (refused, DNS, connect timeout)."""
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, 'reason', reason)
+    return not isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+class DeliveryQueue:
+    """Send deliveries concurrently, each with its own retries, recording them in an Outbox."""
+
+    def __init__(self, outbox=None, session=None, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, max_retry_after=MAX_RETRY_AFTER, timeout=TIMEOUT,
+                 max_workers=MAX_WORKERS, resend=False, sleep=time.sleep):
+        self.outbox = outbox if outbox is not None else Outbox(None)
+        self.session = session
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.resend = resend
+        self.sleep = sleep
+        self.deliveries = []
+
+    def add(self, key, label, url, payload, headers=None, safe_to_repeat=True, already_delivered=None):
+        """Queue a JSON POST of payload to url under an idempotency key."""
+        self.deliveries.append(Delivery(key, label, url, payload, dict(headers or {}), safe_to_repeat, already_delivered))
+
+    def backoff(self, attempt):
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+
+    def run(self):
+        """Send every queued delivery. Returns the DeliveryResults in the order they were added."""
+        deliveries, self.deliveries = self.deliveries, []
+        if not deliveries:
+            return []
+        session = self.session or requests.Session()
+        try:
+            workers = max(1, min(self.max_workers, len(deliveries)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(lambda delivery: self.send(session, delivery), deliveries))
+        finally:
+            if self.session is None:
+                session.close()
+
+    def send(self, session, delivery):
+        """Deliver one item, retrying as described in the module docstring."""
+        start = time.perf_counter()
+        if not self.resend and self.outbox.is_sent(delivery.key):
+            return DeliveryResult(delivery.key, delivery.label, True, True, None, 0, 0.0, None, None)
+
+        headers = dict(delivery.headers)
+        headers.setdefault('Idempotency-Key', delivery.key)
+        status_code = None
+        response = None
+        error = None
+        # A previous run may have ended on an ambiguous failure: check before posting again
+        ambiguous = self.outbox.get(delivery.key).get('ambiguous', False)
+        attempt = 0
+        while attempt < self.max_attempts:
+            if ambiguous and not delivery.safe_to_repeat:
+                # The previous attempt may have gone through: only repeat it if we can tell it did not
+                if delivery.already_delivered is None:
+                    error = f"{error or 'Previous attempt failed'}; it may have been delivered, not repeating it"
+                    break
+                try:
+                    delivered = delivery.already_delivered()
+                except Exception as e:
+                    error = f"{error or 'Previous attempt failed'}; could not check whether it was delivered: {e}"
+                    break
+                if delivered:
+                    self.outbox.record(delivery.key, label=delivery.label, status='sent', attempts=attempt,
+                                       status_code=None, error=None, ambiguous=False)
+                    return DeliveryResult(delivery.key, delivery.label, True, False, None, attempt,
+                                          time.perf_counter() - start, None, None)
+            attempt += 1
+            delay = None
+            try:
+                response = session.post(delivery.url, json=delivery.payload, headers=headers, timeout=self.timeout)
+                status_code = response.status_code
+                if response.ok:
+                    self.outbox.record(delivery.key, label=delivery.label, status='sent', attempts=attempt,
+                                       status_code=status_code, error=None, ambiguous=False)
+                    return DeliveryResult(delivery.key, delivery.label, True, False, status_code, attempt,
+                                          time.perf_counter() - start, None, response)
+                error = f"HTTP {status_code} {response.reason or ''}".strip()
+                if status_code not in RETRYABLE_STATUS:
+                    break
+                ambiguous = status_code >= 500
+                retry_after = parse_retry_after(response)
+                if retry_after is not None:
+                    if retry_after > self.max_retry_after:
+                        error = f"{error} (server asked to retry after {retry_after:.0f}s)"
+                        break
+                    delay = retry_after
+            except requests.exceptions.ConnectionError as e:
+                response = None
+                status_code = None
+                error = str(e)
+                ambiguous = reached_server(e)
+            except requests.exceptions.Timeout as e:
+                # A read timeout: the server has the request but did not answer in time
+                response = None
+                status_code = None
+                error = str(e)
+                ambiguous = True
+            except requests.exceptions.RequestException as e:
+                response = None
+                status_code = None
+                error = str(e)
+                break
+            self.outbox.record(delivery.key, label=delivery.label, status='retrying', attempts=attempt,
+                               status_code=status_code, error=error, ambiguous=ambiguous)
+            if attempt < self.max_attempts:
+                self.sleep(delay if delay is not None else self.backoff(attempt))
+
+        self.outbox.record(delivery.key, label=delivery.label, status='failed', attempts=attempt,
+                           status_code=status_code, error=error, ambiguous=ambiguous)
+        return DeliveryResult(delivery.key, delivery.label, False, False, status_code, attempt,
+                              time.perf_counter() - start, error, response)
+
+
+def print_delivery_report(results, what='Deliveries'):
+    """Print one line per delivery result. Returns True if every delivery succeeded."""
+    for result in results:
+        if result.skipped:
+            print(f"⏭️  '{result.label}' was already sent ({result.key}), skipping")
+        elif result.ok:
+            retries = f", {result.attempts} attempts" if result.attempts > 1 else ''
+            status = f"HTTP {result.status_code}" if result.status_code else 'confirmed after an ambiguous failure'
+            print(f"✅ Sent to '{result.label}' ({status}, {result.elapsed * 1000:.0f} ms{retries})")
+        else:
+            print(f"❌ Error sending to '{result.label}' after {result.attempts} attempt{'s' if result.attempts != 1 else ''} "
+                  f"({result.elapsed * 1000:.0f} ms): {result.error}")
+            if result.response is not None and result.response.text:
+                print(f"Response: {result.response.text}")
+    sent = sum(1 for result in results if result.ok)
+    if results:
+        print(f"📊 {what}: {sent}/{len(results)} sent")
+    return sent == len(results)
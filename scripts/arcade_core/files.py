@@ -0,0 +1,46 @@
+"""
+Memoized file loading shared by the arcade_core objects.
+
+A CachedFile parses its file the first time it is needed and keeps the result
+until the file's mtime (or size) changes, so repeated lookups within a process
+are dictionary hits instead of file I/O.
+"""
+
+import os
+
+
+class CachedFile:
+    """A parsed file, reloaded only when it changes on disk.
+
+    Subclasses implement parse(path). load() (or `data`) raises
+    FileNotFoundError when the file does not exist, and whatever parse() raises
+    when it is invalid.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._stamp = None
+        self._data = None
+
+    def parse(self, path):
+        raise NotImplementedError
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    @property
+    def data(self):
+        return self.load()
+
+    def load(self):
+        """Return the parsed file, re-parsing it only if it changed since the last call."""
+        st = os.stat(self.path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            self._data = self.parse(self.path)
+            self._stamp = stamp
+            self.reindex()
+        return self._data
+
+    def reindex(self):
+        """Hook called after every (re)load, to rebuild lookups derived from `data`."""
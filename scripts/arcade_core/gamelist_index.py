@@ -0,0 +1,146 @@
+"""
+Sharded gamelist: a compact index for list pages plus one detail file per game.
+
+gamelist.json carries every field of every game (the ROM path, controls,
+announcement message...), but most pages only render a grid or pick a game at
+random, and the play page needs a single entry. build_gamelist.py therefore
+also writes, next to gamelist.json:
+
+- public/gamelist-index.json: {"version": 1, "games": [...]} with only the
+  INDEX_FIELDS of each entry, compact JSON, in gamelist order. Empty values
+  ("", null, {}, []) are left out; the pages already treat a missing field like
+  an empty one, so they render these entries unchanged.
+- public/gamelist/<id>.json: the full gamelist entry of one game, exactly the
+  object found in gamelist.json (the first one when two ROMs share an ID, as
+  the pages' games.find() would pick). Files are only rewritten when their
+  content changes, so an upload by checksum only sends the games that changed,
+  and files of games that are gone are removed.
+
+gamelist.json itself is still written for older clients and the scripts.
+page_sizes() estimates what each page downloads before and after the split.
+"""
+
+import gzip
+import json
+import os
+
+INDEX_PATH = 'public/gamelist-index.json'
+DETAILS_DIR = 'public/gamelist'
+INDEX_VERSION = 1
+
+# What the list/grid pages read (main.js, all/, randomgame/); the rest is in the detail files
+INDEX_FIELDS = (
+    'id', 'title', 'problem', 'developer', 'year', 'genre', 'recommended', 'added', 'hide',
+    'coverArt', 'coverVariants', 'pageUrl', 'core', 'new_flag', 'controls',
+)
+
+# Page -> what it downloads: the index and/or the detail file of one game
+PAGES = (
+    ('/ (home)', True, True),
+    ('/play', False, True),
+    ('/gotw', False, True),
+    ('/all', True, False),
+    ('/randomgame (screensaver)', True, False),
+)
+
+_EMPTY = ('', None, {}, [])
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def render_index(games):
+    """The text of gamelist-index.json for a list of gamelist entries."""
+    entries = [
+        {key: game[key] for key in INDEX_FIELDS if game.get(key) not in _EMPTY}
+        for game in games
+    ]
+    return _dumps({'version': INDEX_VERSION, 'games': entries}) + '\n'
+
+
+def render_detail(game):
+    """The text of a game's detail file: its full gamelist entry."""
+    return _dumps(game) + '\n'
+
+
+def detail_path(game_id, details_dir=DETAILS_DIR):
+    return os.path.join(details_dir, f"{game_id}.json")
+
+
+def write_index(games, path=INDEX_PATH):
+    """Write gamelist-index.json atomically. Returns its size in bytes."""
+    text = render_index(games)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return len(text.encode('utf-8'))
+
+
+def write_details(games, details_dir=DETAILS_DIR):
+    """Write the detail file of every game and remove the ones of games that are gone.
+
+    Returns (written, unchanged, removed) counts.
+    """
+    os.makedirs(details_dir, exist_ok=True)
+    written = unchanged = removed = 0
+    names = set()
+    for game in games:
+        path = detail_path(game['id'], details_dir)
+        name = os.path.basename(path)
+        if name in names:
+            continue
+        names.add(name)
+        data = render_detail(game).encode('utf-8')
+        try:
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    unchanged += 1
+                    continue
+        except OSError:
+            pass
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        written += 1
+    for entry in os.scandir(details_dir):
+        if entry.is_file() and entry.name.endswith('.json') and entry.name not in names:
+            os.remove(entry.path)
+            removed += 1
+    return written, unchanged, removed
+
+
+def _sizes(text):
+    data = text.encode('utf-8')
+    return len(data), len(gzip.compress(data, mtime=0))
+
+
+def page_sizes(games, gamelist_text, featured_id=None):
+    """Bytes each page downloads with gamelist.json and with the index/detail files.
+
+    Returns [(page, (before, before_gzip), (after, after_gzip))]. Pages that
+    load one game's details are counted with the featured game's file, or the
+    median-sized one when there is no featured game.
+    """
+    before = _sizes(gamelist_text)
+    index = _sizes(render_index(games))
+    details = {}
+    for game in games:
+        details.setdefault(game['id'], render_detail(game))
+    if featured_id in details:
+        detail = _sizes(details[featured_id])
+    elif details:
+        texts = sorted(details.values(), key=len)
+        detail = _sizes(texts[len(texts) // 2])
+    else:
+        detail = (0, 0)
+    sizes = []
+    for page, uses_index, uses_detail in PAGES:
+        after = (
+            (index[0] if uses_index else 0) + (detail[0] if uses_detail else 0),
+            (index[1] if uses_index else 0) + (detail[1] if uses_detail else 0),
+        )
+        sizes.append((page, before, after))
+    return sizes
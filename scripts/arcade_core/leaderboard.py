@@ -0,0 +1,270 @@
+"""
+Leaderboard client for the listGameScores cloud function, with an on-disk TTL cache.
+
+listGameScores returns every score ever recorded for a game, so responses are
+cached per (game_id, time range) in .cache/leaderboard/<game_id>.<range>.json,
+keeping only the fields the scripts use (userId, player, score):
+
+- an entry younger than the TTL is used without any request;
+- an older entry is refreshed, sending its ETag as If-None-Match (a 304 only
+  renews it); if the refresh fails, the stale entry is used with a warning.
+
+Failed requests (429, 502, 503, 504, timeouts and connection errors) are
+retried up to max_attempts times, waiting for the server's Retry-After or an
+exponential backoff with jitter (see arcade_core/delivery.py); a Retry-After
+longer than MAX_RETRY_AFTER gives up at once.
+
+fetch_many() fetches several games concurrently through one pooled session, and
+top_scores() picks the best score of the N best players with a heap, without
+grouping every score by player first.
+
+The cache can be seeded from a fixture (seed_cache(), or `scripts/leaderboard_cache.py --seed`):
+a JSON object mapping game IDs to a list of scores, or to {time range: scores}.
+With offline=True (or LEADERBOARD_OFFLINE=1), the client never touches the network
+and serves cached entries whatever their age, so runs without network access are
+deterministic. LEADERBOARD_API_URL overrides the listGameScores URL, e.g. to use
+the local stub server (scripts/stub_server.py).
+"""
+
+import heapq
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .delivery import BASE_DELAY, MAX_DELAY, MAX_RETRY_AFTER, backoff_delay, parse_retry_after
+
+LEADERBOARD_API_URL = 'https://us-central1-alloarcade.cloudfunctions.net/listGameScores'
+CACHE_DIR = '.cache/leaderboard'
+CACHE_VERSION = 1
+DEFAULT_TTL = 3600
+MAX_WORKERS = 8
+# (connect, read) timeout in seconds for every request
+TIMEOUT = (5, 20)
+USER_AGENT = 'BonjourArcade-Newsletter/1.0'
+MAX_ATTEMPTS = 4
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+_UNSAFE_CHARS = re.compile(r'[^0-9A-Za-z_.-]')
+
+
+class LeaderboardError(Exception):
+    """The scores of a game could not be fetched, and nothing usable is cached."""
+
+
+def compact_scores(scores):
+    """Keep only the fields used from each score: userId, player and score."""
+    return [
+        {'userId': score.get('userId'), 'player': score.get('player', 'Joueur Inconnu'), 'score': score.get('score', 0)}
+        for score in scores
+    ]
+
+
+def top_scores(scores, count=3):
+    """The best score of each of the count best players, ranked from 1.
+
+    The scores are heapified by score (O(n)) and popped until count distinct
+    players are found, instead of keeping every player's best and sorting them all.
+    """
+    heap = [(-(score.get('score') or 0), index) for index, score in enumerate(scores)]
+    heapq.heapify(heap)
+    seen = set()
+    top = []
+    while heap and len(top) < count:
+        _, index = heapq.heappop(heap)
+        score = scores[index]
+        user_id = score.get('userId')
+        if user_id in seen:
+            continue
+        seen.add(user_id)
+        top.append({
+            'userId': user_id,
+            'player': score.get('player', 'Joueur Inconnu'),
+            'score': score.get('score') or 0,
+            'rank': len(top) + 1,
+        })
+    return top
+
+
+class LeaderboardClient:
+    """Fetch listGameScores results through the on-disk cache."""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, offline=None, session=None,
+                 api_url=None, max_workers=MAX_WORKERS, timeout=TIMEOUT, max_attempts=MAX_ATTEMPTS,
+                 base_delay=BASE_DELAY, max_delay=MAX_DELAY, max_retry_after=MAX_RETRY_AFTER, sleep=time.sleep):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = os.getenv('LEADERBOARD_OFFLINE') == '1' if offline is None else offline
+        # $LEADERBOARD_API_URL points the client at another server (e.g. the stub of stub_server.py)
+        self.api_url = api_url or os.getenv('LEADERBOARD_API_URL', LEADERBOARD_API_URL)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.sleep = sleep
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    def cache_path(self, game_id, time_range='all'):
+        name = f"{_UNSAFE_CHARS.sub('_', game_id)}.{_UNSAFE_CHARS.sub('_', time_range)}.json"
+        return os.path.join(self.cache_dir, name)
+
+    def read_cache(self, game_id, time_range='all'):
+        try:
+            with open(self.cache_path(game_id, time_range), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != CACHE_VERSION or entry.get('game_id') != game_id:
+            return None
+        return entry
+
+    def write_cache(self, game_id, time_range, scores, etag=None, fetched_at=None):
+        """Write a cache entry atomically and return it."""
+        entry = {
+            'version': CACHE_VERSION,
+            'game_id': game_id,
+            'time_range': time_range,
+            'fetched_at': time.time() if fetched_at is None else fetched_at,
+            'etag': etag,
+            'scores': compact_scores(scores),
+        }
+        path = self.cache_path(game_id, time_range)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return entry
+
+    def seed_cache(self, fixture_path):
+        """Load a fixture into the cache. Returns the number of (game, time range) entries written."""
+        with open(fixture_path, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        if not isinstance(fixture, dict):
+            raise ValueError(f"{fixture_path} must map game IDs to scores")
+        count = 0
+        for game_id, value in fixture.items():
+            ranges = value if isinstance(value, dict) else {'all': value}
+            for time_range, scores in ranges.items():
+                if not isinstance(scores, list):
+                    raise ValueError(f"{fixture_path}: scores of {game_id} ({time_range}) must be a list")
+                self.write_cache(game_id, time_range, scores)
+                count += 1
+        return count
+
+    def fetch(self, game_id, time_range='all', etag=None):
+        """POST to listGameScores. Returns (scores, etag), or (None, etag) on 304 Not Modified.
+
+        429, 502, 503, 504, timeouts and connection errors are retried up to
+        max_attempts times before LeaderboardError is raised.
+        """
+        headers = {'Content-Type': 'application/json', 'User-Agent': USER_AGENT}
+        if etag:
+            headers['If-None-Match'] = etag
+        payload = {'data': {'timeRange': time_range, 'gameId': game_id}}
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.session.post(self.api_url, json=payload, headers=headers, timeout=self.timeout)
+                if response.status_code == 304:
+                    return None, etag
+                if response.status_code in RETRYABLE_STATUS and attempt < self.max_attempts:
+                    retry_after = parse_retry_after(response)
+                    if retry_after is not None and retry_after > self.max_retry_after:
+                        raise LeaderboardError(f"Could not fetch leaderboard for {game_id}: "
+                                               f"HTTP {response.status_code}, retry after {retry_after:.0f}s")
+                    self.sleep(retry_after if retry_after is not None else backoff_delay(attempt, self.base_delay, self.max_delay))
+                    continue
+                response.raise_for_status()
+                data = response.json()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if attempt < self.max_attempts:
+                    self.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+                    continue
+                raise LeaderboardError(f"Could not fetch leaderboard for {game_id} after {attempt} attempts: {e}") from e
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise LeaderboardError(f"Could not fetch leaderboard for {game_id}: {e}") from e
+            break
+        result = data.get('result') or {}
+        if not result.get('success'):
+            raise LeaderboardError(f"Leaderboard API returned unsuccessful response for {game_id}")
+        scores = result.get('scores') or []
+        return scores, response.headers.get('ETag')
+
+    def scores(self, game_id, time_range='all'):
+        """All scores of a game ({userId, player, score} dicts), from the cache while it is fresh.
+
+        Raises LeaderboardError when they can neither be fetched nor read from the cache.
+        """
+        entry = self.read_cache(game_id, time_range)
+        if entry is not None and (self.offline or time.time() - entry['fetched_at'] < self.ttl):
+            return entry['scores']
+        if self.offline:
+            raise LeaderboardError(f"No cached leaderboard for {game_id} ({time_range}) in offline mode")
+        try:
+            scores, etag = self.fetch(game_id, time_range, etag=entry.get('etag') if entry else None)
+        except LeaderboardError as e:
+            if entry is None:
+                raise
+            age = (time.time() - entry['fetched_at']) / 60
+            print(f"⚠️  Warning: {e}; using the cached leaderboard from {age:.0f} min ago", file=sys.stderr)
+            return entry['scores']
+        if scores is None:
+            # Not modified: renew the cached entry
+            entry = self.write_cache(game_id, time_range, entry['scores'], etag=etag)
+        else:
+            entry = self.write_cache(game_id, time_range, scores, etag=etag)
+        return entry['scores']
+
+    def fetch_many(self, game_ids, time_range='all'):
+        """Scores of several games, fetched concurrently. Returns ({game_id: scores}, {game_id: error message})."""
+        game_ids = list(dict.fromkeys(game_ids))
+        results = {}
+        errors = {}
+        if not game_ids:
+            return results, errors
+
+        def load(game_id):
+            try:
+                return game_id, self.scores(game_id, time_range), None
+            except LeaderboardError as e:
+                return game_id, None, str(e)
+
+        workers = max(1, min(self.max_workers, len(game_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for game_id, scores, error in pool.map(load, game_ids):
+                if error is None:
+                    results[game_id] = scores
+                else:
+                    errors[game_id] = error
+        return results, errors
+
+    def top_scores(self, game_id, count=3, time_range='all'):
+        """The best score of each of the count best players of a game (see top_scores())."""
+        return top_scores(self.scores(game_id, time_range), count)
+
+
+_shared = {}
+
+
+def get_leaderboard_client(cache_dir=None, ttl=None):
+    """Return the process-wide LeaderboardClient (defaults: $LEADERBOARD_CACHE_DIR, $LEADERBOARD_CACHE_TTL)."""
+    cache_dir = cache_dir or os.getenv('LEADERBOARD_CACHE_DIR', CACHE_DIR)
+    ttl = float(os.getenv('LEADERBOARD_CACHE_TTL', DEFAULT_TTL)) if ttl is None else ttl
+    key = (cache_dir, ttl)
+    if key not in _shared:
+        _shared[key] = LeaderboardClient(cache_dir=cache_dir, ttl=ttl)
+    return _shared[key]
@@ -0,0 +1,162 @@
+"""
+Append-only archive of the leaderboards of past games of the week.
+
+Each line of the archive (JSONL, .cache/leaderboard-archive/archive.jsonl by
+default) is a compact snapshot of one week's game:
+
+    {"seed": 202545, "game_id": "gunbird", "title": "Gunbird", "taken_at": "...",
+     "players": 12, "top": [["<userId>", "<player>", 51200], ...]}
+
+Lines are only ever appended, and only when a week's top scores changed since
+its last snapshot, so the file keeps the history of every week. It is indexed
+by (seed, game_id) when loaded. build_history() turns the latest snapshot of
+every week into the static JSON served with the site
+(public/leaderboards/history.json): per-week top scores and a hall of fame, so
+the newsletter and the site can show past weeks without calling the live
+leaderboard API for every past game.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+from .leaderboard import top_scores
+
+ARCHIVE_PATH = '.cache/leaderboard-archive/archive.jsonl'
+HISTORY_PATH = 'public/leaderboards/history.json'
+HISTORY_VERSION = 1
+TOP_COUNT = 10
+
+
+def make_snapshot(week, game_id, scores, top_count=TOP_COUNT):
+    """A snapshot record of a week's game from its full list of scores."""
+    top = [[entry['userId'], entry['player'], entry['score']] for entry in top_scores(scores, top_count)]
+    return {
+        'seed': week['seed'],
+        'game_id': game_id,
+        'title': week.get('title'),
+        'taken_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'players': len({score.get('userId') for score in scores}),
+        'top': top,
+    }
+
+
+class LeaderboardArchive:
+    """The snapshot archive, indexed by (seed, game_id) and by seed to the latest snapshot of each week."""
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self.latest = {}
+        self.by_seed = {}
+        self.count = 0
+        self._load()
+
+    def _load(self):
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except OSError:
+            return
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted write; later lines are still valid
+                    continue
+                self.count += 1
+                self._index(record)
+
+    def _index(self, record):
+        self.latest[(record['seed'], record['game_id'])] = record
+        self.by_seed[record['seed']] = record
+
+    def get(self, seed, game_id):
+        return self.latest.get((seed, game_id))
+
+    def for_seed(self, seed):
+        """The latest snapshot of a week, whatever its game, or None."""
+        return self.by_seed.get(seed)
+
+    def changed(self, snapshot):
+        """True when a snapshot differs from the latest one archived for its week."""
+        previous = self.get(snapshot['seed'], snapshot['game_id'])
+        return previous is None or previous['top'] != snapshot['top'] or previous['players'] != snapshot['players']
+
+    def append(self, snapshots):
+        """Append the snapshots that changed. Returns how many were written."""
+        new = [snapshot for snapshot in snapshots if self.changed(snapshot)]
+        if not new:
+            return 0
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for snapshot in new:
+                f.write(json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        for snapshot in new:
+            self._index(snapshot)
+        self.count += len(new)
+        return len(new)
+
+
+def build_history(archive, schedule=None):
+    """The static history JSON: every archived week (latest first) and the hall of fame.
+
+    The hall of fame ranks players by first places, then podiums, over every week.
+    """
+    weeks = []
+    fame = {}
+    for (seed, game_id), record in sorted(archive.latest.items(), key=lambda item: str(item[0][0]), reverse=True):
+        scheduled = schedule.get(seed) if schedule is not None else None
+        weeks.append({
+            'seed': seed,
+            'date': scheduled['date'] if scheduled else None,
+            'game_id': game_id,
+            'title': record.get('title'),
+            'players': record['players'],
+            'taken_at': record['taken_at'],
+            'top': [
+                {'rank': rank, 'player': player, 'score': score}
+                for rank, (_, player, score) in enumerate(record['top'], start=1)
+            ],
+        })
+        for rank, (user_id, player, _) in enumerate(record['top'][:3], start=1):
+            key = user_id or player
+            entry = fame.setdefault(key, {'player': player, 'wins': 0, 'podiums': 0, 'weeks': []})
+            entry['podiums'] += 1
+            if rank == 1:
+                entry['wins'] += 1
+            entry['weeks'].append({'seed': seed, 'game_id': game_id, 'rank': rank})
+    hall_of_fame = sorted(fame.values(), key=lambda entry: (-entry['wins'], -entry['podiums'], entry['player']))
+    return {
+        'version': HISTORY_VERSION,
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'weeks': weeks,
+        'hall_of_fame': hall_of_fame,
+    }
+
+
+def write_history(history, path=HISTORY_PATH):
+    """Write the history JSON atomically."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, separators=(',', ':'))
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def read_history_week(seed, path=HISTORY_PATH):
+    """The week of a seed in the history JSON, or None if it is not archived (or there is no history)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for week in history.get('weeks', []):
+        if str(week.get('seed')) == str(seed):
+            return week
+    return None
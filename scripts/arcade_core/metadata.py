@@ -0,0 +1,57 @@
+"""
+Per-game metadata: public/games/<game_id>/metadata.yaml.
+"""
+
+import os
+
+import yaml
+
+from .files import CachedFile
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:
+    _Loader = yaml.SafeLoader
+
+GAMES_DIR = 'public/games'
+
+
+class MetadataFile(CachedFile):
+    """One metadata.yaml file, parsed with yaml.safe_load semantics."""
+
+    def parse(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            meta = yaml.load(f, Loader=_Loader)
+        return meta if meta is not None else {}
+
+
+class GameMetadata:
+    """The metadata.yaml files of all games, each loaded lazily and cached until it changes."""
+
+    def __init__(self, games_dir=GAMES_DIR):
+        self.games_dir = games_dir
+        self._files = {}
+
+    def path(self, game_id):
+        return os.path.join(self.games_dir, game_id, 'metadata.yaml')
+
+    def get(self, game_id):
+        """Return the parsed metadata of a game.
+
+        Raises FileNotFoundError if the game has no metadata.yaml and
+        yaml.YAMLError if it is invalid. The returned dict is shared with other
+        callers; copy it before modifying it.
+        """
+        if game_id not in self._files:
+            self._files[game_id] = MetadataFile(self.path(game_id))
+        return self._files[game_id].data
+
+
+_shared = {}
+
+
+def get_game_metadata(games_dir=GAMES_DIR):
+    """Return the process-wide GameMetadata for this games directory."""
+    if games_dir not in _shared:
+        _shared[games_dir] = GameMetadata(games_dir)
+    return _shared[games_dir]
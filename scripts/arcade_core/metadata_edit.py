@@ -0,0 +1,239 @@
+"""
+Batch editor for the metadata.yaml files, preserving everything it does not edit.
+
+Edits are declarative: set_field(key, value) replaces a top-level key (or
+appends it at the end of the file), remove_field(key, only_if=value) deletes it,
+optionally only when its current value equals only_if. edit_metadata() applies
+a batch of edits to many files in one pass, in a thread pool:
+
+    edit_metadata({'*': [remove_field('enable_score', only_if=False)]})
+    edit_metadata({'gunbird': [set_field('announcement_message', text)]}, dry_run=True)
+
+Files are edited as text: a top-level key owns its line and the indented (or
+list item) lines that follow it, and only those lines are rewritten, so
+comments, blank lines, key order and the formatting of the other keys are kept
+byte for byte. Strings are written double-quoted (JSON escaping is valid YAML),
+other values with yaml.safe_dump.
+
+Every edited file is parsed again before it is written: every key that was not
+edited must have the same value as before (when the original parsed at all),
+and the edited keys must have their new value; a file failing that check is
+reported as an error and left alone. Writes are atomic (a temporary file, then
+os.replace). With dry_run=True nothing is written and each change carries a
+unified diff. Files whose text does not mention any edited key are skipped
+without being parsed, so a migration over every game costs little more than
+reading the files.
+"""
+
+import difflib
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from .metadata import GAMES_DIR
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:
+    _Loader = yaml.SafeLoader
+
+MAX_WORKERS = 8
+ALL_GAMES = '*'
+
+_ANY = object()
+_TOP_LEVEL_KEY = re.compile(r'^([A-Za-z_][\w-]*)\s*:')
+
+FieldEdit = namedtuple('FieldEdit', ['op', 'key', 'value', 'only_if'])
+FieldEdit.__doc__ = """One edit of a top-level key: op is 'set' or 'remove'; see set_field() and remove_field()."""
+
+FileChange = namedtuple('FileChange', ['game_id', 'path', 'changed', 'diff', 'error'])
+FileChange.__doc__ = """Outcome of editing one file.
+
+changed is True when the file was (or, in a dry run, would be) rewritten. diff
+is the unified diff of the change in a dry run, else None. error is None, or
+why the file was left alone.
+"""
+
+
+def set_field(key, value):
+    """Set a top-level key to value, replacing its current value or appending it at the end of the file."""
+    return FieldEdit('set', key, value, _ANY)
+
+
+def remove_field(key, only_if=_ANY):
+    """Remove a top-level key; with only_if, only when its current value equals only_if."""
+    return FieldEdit('remove', key, None, only_if)
+
+
+def render_field(key, value):
+    """The YAML lines of a top-level key: a double-quoted string, or yaml.safe_dump's rendering."""
+    if isinstance(value, str):
+        return f"{key}: {json.dumps(value, ensure_ascii=False)}\n"
+    return yaml.safe_dump({key: value}, allow_unicode=True, default_flow_style=False, sort_keys=False, width=float('inf'))
+
+
+def split_fields(lines):
+    """{key: (start, end)} line spans of the top-level keys (the last one of a duplicated key, as YAML reads it).
+
+    A span ends after the last indented or list item line of its key, before trailing blank and comment lines.
+    """
+    spans = {}
+    key = None
+    start = end = 0
+    for i, line in enumerate(lines):
+        match = _TOP_LEVEL_KEY.match(line)
+        if match:
+            if key is not None:
+                spans[key] = (start, end)
+            key, start, end = match.group(1), i, i + 1
+        elif key is not None and line.strip() and not line.startswith('#') and (line[0] in ' \t' or line.startswith('- ')):
+            # An indented continuation or list item of the current key
+            end = i + 1
+    if key is not None:
+        spans[key] = (start, end)
+    return spans
+
+
+def _parse(text):
+    meta = yaml.load(text, Loader=_Loader)
+    return meta if meta is not None else {}
+
+
+def _field_value(lines, span, key):
+    """The value of the key on these lines, or _ANY if they do not parse (an invalid value matches nothing)."""
+    try:
+        return _parse(''.join(lines[span[0]:span[1]])).get(key, _ANY)
+    except yaml.YAMLError:
+        return _ANY
+
+
+def apply_edits(text, edits):
+    """The text of a file with edits applied, and the keys they changed.
+
+    Raises ValueError when the edited text does not parse back to the expected values.
+    """
+    lines = text.splitlines(keepends=True)
+    try:
+        before = _parse(text)
+    except yaml.YAMLError:
+        before = None
+    changed_keys = []
+    for edit in edits:
+        spans = split_fields(lines)
+        span = spans.get(edit.key)
+        if edit.op == 'remove':
+            if span is None:
+                continue
+            if edit.only_if is not _ANY:
+                current = _field_value(lines, span, edit.key)
+                if current != edit.only_if or type(current) is not type(edit.only_if):
+                    continue
+            del lines[span[0]:span[1]]
+        elif edit.op == 'set':
+            if span is not None and _field_value(lines, span, edit.key) == edit.value:
+                continue
+            new_lines = render_field(edit.key, edit.value).splitlines(keepends=True)
+            if span is not None:
+                lines[span[0]:span[1]] = new_lines
+            else:
+                # Append after the last non-empty line, like a hand edit would
+                while lines and not lines[-1].strip():
+                    lines.pop()
+                if lines and not lines[-1].endswith('\n'):
+                    lines[-1] += '\n'
+                lines.extend(new_lines)
+        else:
+            raise ValueError(f"Unknown metadata edit: {edit.op}")
+        changed_keys.append(edit.key)
+
+    new_text = ''.join(lines)
+    if not changed_keys:
+        return text, []
+    try:
+        after = _parse(new_text)
+    except yaml.YAMLError as e:
+        raise ValueError(f"the edited file would not be valid YAML: {e}")
+    for edit in edits:
+        if edit.key not in changed_keys:
+            continue
+        if edit.op == 'set' and after.get(edit.key) != edit.value:
+            raise ValueError(f"'{edit.key}' would not read back as the value written")
+        if edit.op == 'remove' and edit.key in after:
+            raise ValueError(f"'{edit.key}' is defined more than once")
+    if before is not None:
+        for key, value in before.items():
+            if key not in changed_keys and after.get(key) != value:
+                raise ValueError(f"editing would change '{key}'")
+    return new_text, changed_keys
+
+
+def edit_file(game_id, path, edits, dry_run=False):
+    """Apply edits to one metadata.yaml. Returns a FileChange."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError as e:
+        return FileChange(game_id, path, False, None, str(e))
+    # Most files of a bulk migration do not mention the key at all: skip them unparsed
+    if not any(edit.op == 'set' or edit.key in text for edit in edits):
+        return FileChange(game_id, path, False, None, None)
+    try:
+        new_text, changed_keys = apply_edits(text, edits)
+    except (ValueError, yaml.YAMLError) as e:
+        return FileChange(game_id, path, False, None, str(e))
+    if not changed_keys:
+        return FileChange(game_id, path, False, None, None)
+    if dry_run:
+        diff = ''.join(difflib.unified_diff(text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                                            fromfile=path, tofile=path))
+        return FileChange(game_id, path, True, diff, None)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(new_text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        return FileChange(game_id, path, False, None, str(e))
+    return FileChange(game_id, path, True, None, None)
+
+
+def edit_metadata(edits, games_dir=GAMES_DIR, dry_run=False, max_workers=MAX_WORKERS):
+    """Apply {game_id: [edits]} to the games' metadata.yaml files, concurrently. Returns the FileChanges.
+
+    The edits of the '*' key apply to every game with a metadata.yaml, before the
+    game's own edits.
+    """
+    common = list(edits.get(ALL_GAMES, []))
+    game_ids = {game_id for game_id in edits if game_id != ALL_GAMES}
+    if common:
+        try:
+            entries = os.listdir(games_dir)
+        except OSError:
+            entries = []
+        game_ids.update(entry for entry in entries if os.path.isfile(os.path.join(games_dir, entry, 'metadata.yaml')))
+    jobs = [
+        (game_id, os.path.join(games_dir, game_id, 'metadata.yaml'), common + list(edits.get(game_id, [])))
+        for game_id in sorted(game_ids)
+    ]
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        return list(pool.map(lambda job: edit_file(*job, dry_run=dry_run), jobs))
+
+
+def print_changes(changes, dry_run=False):
+    """Print the diff (dry run) or path of every changed file and the errors. Returns (changed, errors) counts."""
+    changed = [change for change in changes if change.changed]
+    errors = [change for change in changes if change.error]
+    for change in changed:
+        if dry_run:
+            print(change.diff, end='' if change.diff.endswith('\n') else '\n')
+        else:
+            print(f"✅ Updated {change.path}")
+    for change in errors:
+        print(f"❌ Error: {change.path}: {change.error}")
+    return len(changed), len(errors)
@@ -0,0 +1,320 @@
+"""
+Predictions schedule: predictions.yaml compiled into predictions.json.
+
+compile_schedule() turns predictions.yaml into a normalized, seed-sorted
+schedule. Each week lists its seed (YYYYWW), title, game_id, the ISO date of its
+Monday and its status (past/current/future). The schedule also has lookups from
+seed, title and game_id to the index of the week. write_schedule() stores it as
+public/plinko/predict/predictions.json (see scripts/predictions_schedule.py).
+
+load_schedule() reads predictions.json, or predictions.yaml directly when the
+YAML is newer than the compiled file (or the compiled file is missing), and
+only reloads when one of them changes. Week statuses are always recomputed on
+load, so a predictions.json compiled last week is still safe to use.
+Predictions is the lazy object the scripts share through get_predictions().
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import yaml
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:
+    _Loader = yaml.SafeLoader
+
+PREDICTIONS_YAML = 'public/plinko/predict/predictions.yaml'
+PREDICTIONS_JSON = 'public/plinko/predict/predictions.json'
+SCHEDULE_VERSION = 1
+
+
+def get_current_week_seed():
+    """Get the current week's seed in YYYYWW format."""
+    now = datetime.now()
+    week = now.isocalendar()[1]
+    return f"{now.year}{week:02d}"
+
+
+def seed_to_date(seed):
+    """Convert a seed (YYYYWW format) to the corresponding Monday date."""
+    try:
+        year = int(str(seed)[:4])
+        week = int(str(seed)[4:])
+
+        # Get the first day of the year
+        jan1 = datetime(year, 1, 1)
+
+        # Find the first Monday of the year
+        while jan1.weekday() != 0:  # 0 = Monday
+            jan1 += timedelta(days=1)
+
+        # Add weeks to get to the target week
+        target_date = jan1 + timedelta(weeks=week-1)
+
+        return target_date.strftime("%Y-%m-%d")
+
+    except Exception as e:
+        print(f"Error: Could not convert seed {seed} to date: {e}", file=sys.stderr)
+        return None
+
+
+def check_week_status(seed):
+    """Check if a seed represents a current or past week."""
+    try:
+        # Parse the seed (YYYYWW format)
+        year = int(str(seed)[:4])
+        week = int(str(seed)[4:])
+
+        # Get current week
+        now = datetime.now()
+        current_year = now.year
+        current_week = now.isocalendar()[1]
+
+        # Convert to comparable values
+        seed_value = year * 100 + week
+        current_value = current_year * 100 + current_week
+
+        if seed_value == current_value:
+            return 'current'
+        elif seed_value < current_value:
+            return 'past'
+        else:
+            return 'future'
+
+    except Exception as e:
+        print(f"Error: Could not parse seed {seed}: {e}", file=sys.stderr)
+        return 'unknown'
+
+
+def _normalize_seed(seed):
+    """YAML turns most seeds into ints; keep the ones that are not numbers as strings."""
+    try:
+        return int(seed)
+    except (TypeError, ValueError):
+        return str(seed)
+
+
+def compile_schedule(predictions):
+    """Compile the parsed predictions.yaml mapping into the schedule dict written to predictions.json.
+
+    Entries are either a plain title string (old format) or a {title, game_id}
+    mapping. When a title or game_id is listed under several seeds, the lookups
+    point to the first one in the YAML file, like the old linear scans did.
+    """
+    weeks = []
+    for seed, entry in (predictions or {}).items():
+        if isinstance(entry, dict):
+            title, game_id = entry.get('title'), entry.get('game_id')
+        elif isinstance(entry, str):
+            title, game_id = entry, None
+        else:
+            continue
+        seed = _normalize_seed(seed)
+        weeks.append({
+            'seed': seed,
+            'title': str(title) if title is not None else None,
+            'game_id': str(game_id) if game_id is not None else None,
+            'date': seed_to_date(seed),
+            'status': check_week_status(seed),
+        })
+
+    first_seed_by_title = {}
+    first_seed_by_game_id = {}
+    for week in weeks:
+        if week['title']:
+            first_seed_by_title.setdefault(week['title'], week['seed'])
+        if week['game_id']:
+            first_seed_by_game_id.setdefault(week['game_id'], week['seed'])
+
+    weeks.sort(key=lambda week: (isinstance(week['seed'], str), week['seed']))
+    position = {}
+    for i, week in enumerate(weeks):
+        position.setdefault(week['seed'], i)
+
+    return {
+        'version': SCHEDULE_VERSION,
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'weeks': weeks,
+        'by_seed': {str(seed): i for seed, i in position.items()},
+        'by_title': {title: position[seed] for title, seed in first_seed_by_title.items()},
+        'by_game_id': {game_id: position[seed] for game_id, seed in first_seed_by_game_id.items()},
+    }
+
+
+class PredictionSchedule:
+    """The compiled predictions schedule, with lookups by seed, title and game_id."""
+
+    def __init__(self, data):
+        self.weeks = data['weeks']
+        self.by_seed = data['by_seed']
+        self.by_title = data['by_title']
+        self.by_game_id = data['by_game_id']
+        # Statuses depend on today's date, not on when the file was compiled
+        for week in self.weeks:
+            week['status'] = check_week_status(week['seed'])
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def get(self, seed):
+        """Return the week dict for a seed, or None if nothing is scheduled that week."""
+        i = self.by_seed.get(str(_normalize_seed(seed)))
+        return self.weeks[i] if i is not None else None
+
+    def select(self, spec):
+        """Seeds of the scheduled weeks selected by spec: "202540..202552" (inclusive, either end optional) or "202540,202542".
+
+        Seeds outside the schedule are left out; malformed seeds raise ValueError.
+        """
+        scheduled = sorted(str(week['seed']) for week in self.weeks)
+        seeds = []
+        for part in spec.split(','):
+            part = part.strip()
+            if '..' in part:
+                start, end = (bound.strip() for bound in part.split('..', 1))
+                for bound in (start, end):
+                    if bound and not (bound.isdigit() and len(bound) == 6):
+                        raise ValueError(f"Invalid week seed '{bound}' (expected YYYYWW)")
+                seeds.extend(seed for seed in scheduled if (not start or seed >= start) and (not end or seed <= end))
+            elif part:
+                if not (part.isdigit() and len(part) == 6):
+                    raise ValueError(f"Invalid week seed '{part}' (expected YYYYWW)")
+                if part in scheduled:
+                    seeds.append(part)
+        return list(dict.fromkeys(seeds))
+
+    def find(self, *keys):
+        """Return the week of the first key matching a title, then a game_id, or None."""
+        for key in keys:
+            if key and key in self.by_title:
+                return self.weeks[self.by_title[key]]
+        for key in keys:
+            if key and key in self.by_game_id:
+                return self.weeks[self.by_game_id[key]]
+        return None
+
+    def status(self, *keys):
+        """Return "SHOW_GAME|<date>", "HIDE_GAME" or "NOT_IN_PREDICTIONS" for a game."""
+        week = self.find(*keys)
+        if week is None:
+            return 'NOT_IN_PREDICTIONS'
+        if week['status'] in ('current', 'past'):
+            return f"SHOW_GAME|{week['date']}"
+        return 'HIDE_GAME'
+
+
+def read_predictions_yaml(yaml_path=PREDICTIONS_YAML):
+    """Parse predictions.yaml. Returns the mapping (empty if the file is empty or not a mapping)."""
+    with open(yaml_path, 'r') as f:
+        predictions = yaml.load(f, Loader=_Loader)
+    return predictions if isinstance(predictions, dict) else {}
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_schedule_cache = {}
+
+
+def load_schedule(yaml_path=PREDICTIONS_YAML, json_path=PREDICTIONS_JSON):
+    """Load the predictions schedule, memoized for the lifetime of the process.
+
+    Uses the compiled predictions.json unless predictions.yaml is newer, and
+    reloads only when the mtime of either file changes. Returns None if neither
+    file can be read.
+    """
+    yaml_mtime = _mtime(yaml_path)
+    json_mtime = _mtime(json_path)
+    cache_key = (yaml_path, json_path)
+    cached = _schedule_cache.get(cache_key)
+    if cached is not None and cached[0] == (yaml_mtime, json_mtime):
+        return cached[1]
+
+    data = None
+    if json_mtime is not None and (yaml_mtime is None or json_mtime >= yaml_mtime):
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Warning: Could not read {json_path}: {e}", file=sys.stderr)
+        if not isinstance(data, dict) or data.get('version') != SCHEDULE_VERSION:
+            data = None
+
+    if data is None:
+        if yaml_mtime is None:
+            return None
+        try:
+            data = compile_schedule(read_predictions_yaml(yaml_path))
+        except Exception as e:
+            print(f"Error: Could not read predictions.yaml: {e}", file=sys.stderr)
+            return None
+
+    schedule = PredictionSchedule(data)
+    _schedule_cache[cache_key] = ((yaml_mtime, json_mtime), schedule)
+    return schedule
+
+
+def write_schedule(yaml_path=PREDICTIONS_YAML, json_path=PREDICTIONS_JSON):
+    """Compile predictions.yaml into predictions.json. Returns the number of weeks written."""
+    data = compile_schedule(read_predictions_yaml(yaml_path))
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, json_path)
+    return len(data['weeks'])
+
+
+class Predictions:
+    """Lazy view of the predictions schedule, reloaded when either file changes."""
+
+    def __init__(self, yaml_path=PREDICTIONS_YAML, json_path=PREDICTIONS_JSON):
+        self.yaml_path = yaml_path
+        self.json_path = json_path
+
+    @property
+    def schedule(self):
+        """The current PredictionSchedule, or None if predictions.yaml cannot be read."""
+        return load_schedule(self.yaml_path, self.json_path)
+
+    def available(self):
+        """True if the schedule could be loaded and lists at least one week."""
+        schedule = self.schedule
+        return schedule is not None and len(schedule) > 0
+
+    def game_for_seed(self, seed):
+        """Return the week dict (seed, title, game_id, date, status) for a seed, or None."""
+        schedule = self.schedule
+        return schedule.get(seed) if schedule is not None else None
+
+    def current_week(self):
+        """Return the week dict of the current week, or None."""
+        return self.game_for_seed(get_current_week_seed())
+
+    def find(self, *keys):
+        """Return the week of the first key matching a title, then a game_id, or None."""
+        schedule = self.schedule
+        return schedule.find(*keys) if schedule is not None else None
+
+    def status(self, *keys):
+        """Return "SHOW_GAME|<date>", "HIDE_GAME" or "NOT_IN_PREDICTIONS" for a game."""
+        schedule = self.schedule
+        return schedule.status(*keys) if schedule is not None else 'NOT_IN_PREDICTIONS'
+
+
+_shared = {}
+
+
+def get_predictions(yaml_path=PREDICTIONS_YAML, json_path=PREDICTIONS_JSON):
+    """Return the process-wide Predictions object for these paths."""
+    key = (yaml_path, json_path)
+    if key not in _shared:
+        _shared[key] = Predictions(yaml_path, json_path)
+    return _shared[key]
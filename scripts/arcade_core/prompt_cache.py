@@ -0,0 +1,73 @@
+"""
+On-disk cache of AI completions, keyed by a hash of the request.
+
+The key is the SHA-256 of the service name and the full JSON request body
+(model, parameters and prompt), so changing any of them asks the service again,
+while re-running with the same prompt costs nothing. Entries are small JSON
+files under .cache/announcements/<2 hex>/<key>.json, written atomically; they
+never contain API keys, which travel in headers.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+CACHE_DIR = '.cache/announcements'
+CACHE_VERSION = 1
+
+
+class PromptCache:
+    """Completions by request hash; a disabled cache misses every lookup and stores nothing."""
+
+    def __init__(self, cache_dir=CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(service, request):
+        data = json.dumps({'service': service, 'request': request}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def contains(self, key):
+        return self.enabled and os.path.exists(self.path(key))
+
+    def get(self, key):
+        """The cached completion text of a key, or None."""
+        text = None
+        if self.enabled:
+            try:
+                with open(self.path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                if entry.get('version') == CACHE_VERSION:
+                    text = entry.get('text')
+            except (OSError, ValueError):
+                pass
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def put(self, key, text, service=None):
+        if not self.enabled:
+            return
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CACHE_VERSION,
+                'service': service,
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'text': text,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
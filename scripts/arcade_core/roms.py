@@ -0,0 +1,193 @@
+"""
+ROM manifest: every ROM of the roms/ tree with its size, content hash and system.
+
+scan_roms() walks roms/ with os.scandir the way the gamelist has always listed
+ROMs: files at the root and one level of system directories, hidden files and
+the bios/ directory skipped, symbolic links followed. build_manifest() hashes
+the ROMs (SHA-1 of the memory-mapped file, in a thread pool: hashlib releases
+the GIL on large buffers), reusing the hash recorded in the HashCache
+(.cache/rom-manifest/hashes.json) of every file whose size and mtime did not
+change. The manifest itself (roms-manifest.json by default) is portable JSON:
+
+    {"version": 1, "generated": "...", "roms": [
+        {"path": "NES/1941.bin", "system": "NES", "size": 40976, "sha1": "...",
+         "moved_from": "SNES/1941.bin"}, ...]}
+
+moved_from is only set on the build where a ROM's content disappeared from one
+path and appeared at another. find_duplicates() lists the ROMs that share
+their content. build_gamelist.py reads this manifest as well as the plain list
+of "<system>/<file>" lines it has always accepted.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROMS_DIR = 'roms'
+MANIFEST_PATH = 'roms-manifest.json'
+HASH_CACHE_PATH = '.cache/rom-manifest/hashes.json'
+MANIFEST_VERSION = 1
+MAX_WORKERS = 4
+
+ManifestStats = namedtuple('ManifestStats', ['hashed', 'reused', 'hashed_bytes', 'moves'])
+ManifestStats.__doc__ = """What build_manifest() did: ROMs hashed and reused from the cache, bytes hashed, and the moves it found ((old path, new path) pairs)."""
+
+
+def scan_roms(roms_dir=ROMS_DIR):
+    """The ROM files of roms_dir as sorted (rom_entry, os.stat_result); rom_entry is "<system>/<file>" or "<file>"."""
+    found = []
+    if not os.path.isdir(roms_dir):
+        return found
+    for entry in os.scandir(roms_dir):
+        if entry.name.startswith('.'):
+            continue
+        if entry.is_file():
+            found.append((entry.name, entry.stat()))
+        elif entry.is_dir() and entry.name != 'bios':
+            for sub in os.scandir(entry.path):
+                if not sub.name.startswith('.') and sub.is_file():
+                    found.append((f"{entry.name}/{sub.name}", sub.stat()))
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+def rom_system(rom_entry):
+    """The system directory of a ROM entry, or None for a ROM at the root of roms/."""
+    return rom_entry.split('/', 1)[0] if '/' in rom_entry else None
+
+
+def hash_file(path):
+    """SHA-1 of a file, read through a memory map."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                h.update(mapped)
+    return h.hexdigest()
+
+
+class HashCache:
+    """Hashes of the ROMs of the last run, by ROM entry, with the size and mtime they were computed for."""
+
+    def __init__(self, path=HASH_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('roms', {})
+
+    def get(self, rom_entry, stat):
+        cached = self.entries.get(rom_entry)
+        if cached and cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+            return cached.get('sha1')
+        return None
+
+    def save(self, entries):
+        """Replace the cache with {rom_entry: {'size', 'mtime_ns', 'sha1'}}."""
+        self.entries = entries
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'roms': entries}, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def find_moves(previous, current):
+    """(old path, new path) of the contents that left a path of previous for a new path of current.
+
+    previous and current map ROM entries to hashes. A content that is still at
+    its old path (a copy) is a duplicate, not a move.
+    """
+    gone = {}
+    for rom_entry, digest in previous.items():
+        if rom_entry not in current:
+            gone.setdefault(digest, []).append(rom_entry)
+    moves = []
+    for rom_entry, digest in sorted(current.items()):
+        if rom_entry not in previous and gone.get(digest):
+            moves.append((gone[digest].pop(0), rom_entry))
+    return moves
+
+
+def find_duplicates(roms):
+    """{sha1: [paths]} of the contents found at more than one path of a manifest's ROM list."""
+    paths = {}
+    for rom in roms:
+        paths.setdefault(rom['sha1'], []).append(rom['path'])
+    return {digest: found for digest, found in paths.items() if len(found) > 1}
+
+
+def build_manifest(roms_dir=ROMS_DIR, cache=None, full=False, max_workers=MAX_WORKERS):
+    """Scan and hash the ROMs. Returns (manifest dict, ManifestStats) and refreshes the cache.
+
+    With full=True every ROM is hashed again; the cache is still used to find moves.
+    """
+    cache = cache if cache is not None else HashCache()
+    files = scan_roms(roms_dir)
+    hashes = {}
+    to_hash = []
+    for rom_entry, stat in files:
+        digest = None if full else cache.get(rom_entry, stat)
+        if digest is None:
+            to_hash.append(rom_entry)
+        else:
+            hashes[rom_entry] = digest
+    if to_hash:
+        workers = max(1, min(max_workers, len(to_hash)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            paths = [os.path.join(roms_dir, rom_entry) for rom_entry in to_hash]
+            hashes.update(zip(to_hash, pool.map(hash_file, paths)))
+
+    previous = {rom_entry: cached.get('sha1') for rom_entry, cached in cache.entries.items()}
+    moves = find_moves(previous, hashes)
+    moved_from = {new: old for old, new in moves}
+    roms = []
+    for rom_entry, stat in files:
+        rom = {'path': rom_entry, 'system': rom_system(rom_entry), 'size': stat.st_size, 'sha1': hashes[rom_entry]}
+        if rom_entry in moved_from:
+            rom['moved_from'] = moved_from[rom_entry]
+        roms.append(rom)
+    cache.save({
+        rom_entry: {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': hashes[rom_entry]}
+        for rom_entry, stat in files
+    })
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'roms': roms,
+    }
+    sizes = dict(files)
+    hashed_bytes = sum(sizes[rom_entry].st_size for rom_entry in to_hash)
+    return manifest, ManifestStats(len(to_hash), len(files) - len(to_hash), hashed_bytes, moves)
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Write a manifest atomically, one ROM per line."""
+    lines = ',\n'.join(f"  {json.dumps(rom, ensure_ascii=False)}" for rom in manifest['roms'])
+    header = {key: value for key, value in manifest.items() if key != 'roms'}
+    text = json.dumps(header, ensure_ascii=False)[:-1] + (', "roms": [\n' + lines + '\n]}\n' if lines else ', "roms": []}\n')
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def parse_manifest(text):
+    """The manifest dict of a JSON ROM manifest's text, or None if the text is not one (e.g. a plain list of paths)."""
+    if not text.lstrip().startswith('{'):
+        return None
+    data = json.loads(text)
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION or not isinstance(data.get('roms'), list):
+        raise ValueError("unsupported ROM manifest format")
+    return data
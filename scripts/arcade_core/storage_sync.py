@@ -0,0 +1,505 @@
+"""
+Differential uploads to the storage bucket (gs://bonjourarcade) of the site's
+artifacts and the ROMs.
+
+The bucket keeps a sync manifest of what was uploaded (by default
+.sync/<target>.json in the bucket):
+
+    {"version": 1, "updated": "...", "objects": {"gamelist.json":
+        {"sha1": "...", "size": 956317, "content_type": "application/json",
+         "content_encoding": "gzip", "cache_control": "no-cache"}, ...},
+     "generations": {"current": ["gamelist.1a2b3c4d5e6f.json", ...], "previous": [...]}}
+
+plan_sync() compares the local objects (SyncObject: key, local file, SHA-1 of
+the content and the headers to upload it with) against that manifest, and
+uploads an object only when its content or headers changed. Remote objects
+under a prunable prefix that no longer exist locally are deleted when asked
+to. The content-hashed copies of the gamelist and its index are pruned one
+deploy late: the sync manifest also records, under "generations", the hashed
+keys of the current sync and of the previous different one, and both stay in
+the bucket, so a page that loaded the previous artifact-manifest.json can still
+fetch what it points to. run_sync() uploads concurrently, phase by phase, so
+that files referring to others (the list index, the pointer manifest) go up
+after them. It writes the new sync manifest last: an object that failed to
+upload keeps its previous entry and is retried on the next run.
+
+Two backends implement read/upload/delete: GCSBackend talks to the Cloud
+Storage JSON API, and DirectoryBackend is a stand-in that stores the objects
+(and their headers, in .meta/) in a local directory, with optional simulated
+latency and bandwidth, to try the planner and measure its throughput offline.
+
+Local objects come from pages_objects() (public/: the gamelist, its index and
+detail files, the hashed copies and the pointer manifest, uploaded as their
+.gz variant with Content-Encoding: gzip when there is one, see artifacts.py)
+and roms_objects() (the ROM manifest, see roms.py, whose hashes are reused).
+"""
+
+import glob
+import hashlib
+import json
+import mimetypes
+import os
+import random
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import requests
+
+from .delivery import RETRYABLE_STATUS, TIMEOUT
+
+SYNC_MANIFEST_VERSION = 1
+SYNC_MANIFEST_KEY = '.sync/{target}.json'
+MAX_WORKERS = 8
+MAX_ATTEMPTS = 4
+BASE_DELAY = 1.0
+# Files larger than this go up through a resumable upload, in CHUNK_SIZE pieces
+# (a multiple of the 256 KiB the API requires), instead of one multipart POST
+RESUMABLE_THRESHOLD = 8 * 1024 * 1024
+CHUNK_SIZE = 8 * 1024 * 1024
+
+NO_CACHE = 'no-cache'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ROM_CACHE_CONTROL = 'public, max-age=86400'
+
+# Prunable, but the copies of the previous generation are kept as well
+KEEP_PREVIOUS = 'previous'
+
+# (glob relative to public/, phase, Cache-Control, prunable): phase 0 goes up first
+PAGES_RULES = (
+    ('gamelist/*.json', 0, NO_CACHE, True),
+    ('gamelist.????????????.json', 0, IMMUTABLE, KEEP_PREVIOUS),
+    ('gamelist-index.????????????.json', 0, IMMUTABLE, KEEP_PREVIOUS),
+    ('gamelist-index.json', 1, NO_CACHE, False),
+    ('gamelist.json', 1, NO_CACHE, False),
+    ('artifact-manifest.json', 2, NO_CACHE, False),
+)
+
+SyncObject = namedtuple('SyncObject', [
+    'key', 'path', 'sha1', 'size', 'content_type', 'content_encoding', 'cache_control', 'phase', 'prune_prefix',
+    'keep_previous',
+])
+SyncObject.__doc__ = """One object to keep in the bucket.
+
+path is the file to upload (a .gz variant when content_encoding is 'gzip');
+sha1 and size describe the content it encodes. Remote objects whose key starts
+with prune_prefix (when set) and that are not local anymore may be deleted;
+with keep_previous, those of the previous generation are kept (see plan_sync()).
+"""
+
+SyncPlan = namedtuple('SyncPlan', ['uploads', 'deletes', 'unchanged', 'remote', 'generations'])
+SyncPlan.__doc__ = """uploads: the SyncObjects to upload; deletes: the remote keys to delete; unchanged: how many objects are up to date; remote: the sync manifest it was planned against; generations: the {'current', 'previous'} keep_previous keys to record (None without keep_previous objects)."""
+
+SyncResult = namedtuple('SyncResult', ['uploaded', 'deleted', 'failed', 'bytes', 'seconds'])
+SyncResult.__doc__ = """What run_sync() did: the uploaded keys, deleted keys, {key: error} of the failures, bytes sent and wall time."""
+
+
+class SyncError(Exception):
+    """An object could not be uploaded, deleted or read from the bucket."""
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def content_type(key):
+    if key.endswith('.json'):
+        return 'application/json'
+    guessed, _ = mimetypes.guess_type(key)
+    return guessed or 'application/octet-stream'
+
+
+def pages_objects(public_dir='public', rules=PAGES_RULES):
+    """The SyncObjects of the site's artifacts that exist in public_dir."""
+    objects = []
+    for pattern, phase, cache_control, prunable in rules:
+        # Hashed-copy globs have no '*': their prefix is what comes before the hash
+        prune_prefix = pattern.split('*', 1)[0].split('?', 1)[0] if prunable else None
+        for path in sorted(glob.glob(os.path.join(public_dir, pattern))):
+            if not os.path.isfile(path):
+                continue
+            key = os.path.relpath(path, public_dir).replace(os.sep, '/')
+            upload_path, encoding = path, None
+            gz_path = f"{path}.gz"
+            # Only a variant at least as recent as its source encodes the current content
+            if os.path.isfile(gz_path) and os.stat(gz_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                upload_path, encoding = gz_path, 'gzip'
+            objects.append(SyncObject(key, upload_path, file_sha1(path), os.path.getsize(path), content_type(key),
+                                      encoding, cache_control, phase, prune_prefix, prunable == KEEP_PREVIOUS))
+    return objects
+
+
+def roms_objects(manifest, roms_dir='roms', prefix='roms/'):
+    """The SyncObjects of the ROMs of a ROM manifest (its hashes are trusted, nothing is read)."""
+    return [
+        SyncObject(f"{prefix}{rom['path']}", os.path.join(roms_dir, rom['path']), rom['sha1'], rom['size'],
+                   'application/octet-stream', None, ROM_CACHE_CONTROL, 0, prefix, False)
+        for rom in manifest['roms']
+    ]
+
+
+def manifest_entry(obj):
+    return {
+        'sha1': obj.sha1,
+        'size': obj.size,
+        'content_type': obj.content_type,
+        'content_encoding': obj.content_encoding,
+        'cache_control': obj.cache_control,
+    }
+
+
+def plan_generations(objects, remote_objects, generations):
+    """The {'current', 'previous'} keys of the keep_previous objects, given the recorded generations (or None).
+
+    The previous generation only moves when the current one changes. Before any
+    generation was recorded, every remote copy is treated as the previous one.
+    """
+    current = sorted(obj.key for obj in objects if obj.keep_previous)
+    if not current:
+        return None
+    if generations is None:
+        local_keys = {obj.key for obj in objects}
+        prefixes = {obj.prune_prefix for obj in objects if obj.keep_previous}
+        previous = sorted(
+            key for key in remote_objects
+            if key not in local_keys and any(key.startswith(prefix) for prefix in prefixes)
+        )
+    elif current != generations.get('current'):
+        previous = generations.get('current', [])
+    else:
+        previous = generations.get('previous', [])
+    return {'current': current, 'previous': previous}
+
+
+def plan_sync(objects, remote, delete=False):
+    """Compare the local objects with the remote sync manifest (or None). Returns a SyncPlan."""
+    remote = remote or {'version': SYNC_MANIFEST_VERSION, 'objects': {}}
+    remote_objects = remote.get('objects', {})
+    uploads = [obj for obj in objects if remote_objects.get(obj.key) != manifest_entry(obj)]
+    generations = plan_generations(objects, remote_objects, remote.get('generations'))
+    deletes = []
+    if delete:
+        local_keys = {obj.key for obj in objects}
+        if generations:
+            local_keys.update(generations['previous'])
+        prefixes = {obj.prune_prefix for obj in objects if obj.prune_prefix}
+        deletes = sorted(
+            key for key in remote_objects
+            if key not in local_keys and any(key.startswith(prefix) for prefix in prefixes)
+        )
+    return SyncPlan(uploads, deletes, len(objects) - len(uploads), remote, generations)
+
+
+def run_sync(plan, backend, manifest_key, max_workers=MAX_WORKERS, progress=None):
+    """Execute a plan on a backend, then write the new sync manifest. Returns a SyncResult.
+
+    progress, if given, is called with (SyncObject or deleted key, error or None) after every operation.
+    """
+    start = time.perf_counter()
+    objects = dict(plan.remote.get('objects', {}))
+    uploaded, deleted, failed = [], [], {}
+    sent_bytes = 0
+    lock = threading.Lock()
+
+    def upload(obj):
+        nonlocal sent_bytes
+        try:
+            size = backend.upload(obj.key, obj.path, obj.content_type, obj.content_encoding, obj.cache_control)
+        except (OSError, SyncError) as e:
+            with lock:
+                failed[obj.key] = str(e)
+            error = str(e)
+        else:
+            with lock:
+                uploaded.append(obj.key)
+                objects[obj.key] = manifest_entry(obj)
+                sent_bytes += size
+            error = None
+        if progress:
+            progress(obj, error)
+
+    def remove(key):
+        try:
+            backend.delete(key)
+        except SyncError as e:
+            with lock:
+                failed[key] = str(e)
+            error = str(e)
+        else:
+            with lock:
+                deleted.append(key)
+                objects.pop(key, None)
+            error = None
+        if progress:
+            progress(key, error)
+
+    phases = sorted({obj.phase for obj in plan.uploads})
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for phase in phases:
+            list(pool.map(upload, [obj for obj in plan.uploads if obj.phase == phase]))
+        # Deletions last: nothing uploaded refers to a deleted object anymore
+        list(pool.map(remove, plan.deletes))
+
+    if uploaded or deleted or not plan.remote.get('updated') or plan.generations != plan.remote.get('generations'):
+        manifest = {
+            'version': SYNC_MANIFEST_VERSION,
+            'updated': now_iso(),
+            'objects': dict(sorted(objects.items())),
+        }
+        if plan.generations:
+            manifest['generations'] = plan.generations
+        backend.write_manifest(manifest_key, manifest)
+    return SyncResult(sorted(uploaded), sorted(deleted), failed, sent_bytes, time.perf_counter() - start)
+
+
+class DirectoryBackend:
+    """A bucket stand-in: objects are files under root, their headers are in root/.meta/<key>.json.
+
+    latency (seconds per request) and bandwidth (bytes per second, None for
+    unlimited) simulate a network, to measure the planner's throughput.
+    """
+
+    def __init__(self, root, latency=0.0, bandwidth=None):
+        self.root = root
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def _meta_path(self, key):
+        return os.path.join(self.root, '.meta', *f"{key}.json".split('/'))
+
+    def _wait(self, size=0):
+        with self._lock:
+            self.requests += 1
+        delay = self.latency + (size / self.bandwidth if self.bandwidth else 0)
+        if delay:
+            time.sleep(delay)
+
+    def read_manifest(self, key):
+        self._wait()
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise SyncError(f"Could not read {key}: {e}") from e
+
+    def upload(self, key, path, content_type, content_encoding=None, cache_control=None):
+        """Store a file as key. Returns the number of bytes sent."""
+        size = os.path.getsize(path)
+        self._wait(size)
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, f"{target}.tmp")
+        os.replace(f"{target}.tmp", target)
+        meta_path = self._meta_path(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'content_type': content_type, 'content_encoding': content_encoding,
+                       'cache_control': cache_control}, f)
+        return size
+
+    def delete(self, key):
+        self._wait()
+        for path in (self._path(key), self._meta_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def write_manifest(self, key, manifest):
+        self._wait()
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(f"{target}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(f"{target}.tmp", target)
+
+
+class GCSBackend:
+    """A Cloud Storage bucket, through the JSON API.
+
+    The access token comes from $GCS_ACCESS_TOKEN, or from
+    `gcloud auth print-access-token` (the CI job activates its service account
+    first). Failed requests are retried with an exponential backoff when the
+    status is retryable (429, 5xx...); re-uploading an object is harmless.
+
+    Small files (the site's artifacts) are sent in one multipart POST. Files
+    larger than RESUMABLE_THRESHOLD (ROMs) use a resumable upload session: the
+    file is streamed in CHUNK_SIZE PUTs, and after a failure the upload asks the
+    session how many bytes it has and resumes from there, rather than sending
+    the whole file again.
+    """
+
+    API_URL = 'https://storage.googleapis.com/storage/v1/b/{bucket}/o'
+    UPLOAD_URL = 'https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o'
+
+    def __init__(self, bucket, token=None, session=None, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY):
+        self.bucket = bucket
+        self.token = token or os.getenv('GCS_ACCESS_TOKEN') or self._gcloud_token()
+        self.session = session or requests.Session()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+
+    @staticmethod
+    def _gcloud_token():
+        try:
+            return subprocess.run(['gcloud', 'auth', 'print-access-token'], check=True,
+                                  capture_output=True, text=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise SyncError(f"No GCS access token: set GCS_ACCESS_TOKEN or log in with gcloud ({e})") from e
+
+    def _request(self, method, url, **kwargs):
+        headers = dict(kwargs.pop('headers', {}), Authorization=f"Bearer {self.token}")
+        for attempt in range(self.max_attempts):
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=TIMEOUT, **kwargs)
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    return response
+                error = f"HTTP {response.status_code}"
+            if attempt + 1 < self.max_attempts:
+                time.sleep(self.base_delay * 2 ** attempt * random.uniform(0.5, 1.0))
+        raise SyncError(f"{method} {url} failed after {self.max_attempts} attempts: {error}")
+
+    def _object_url(self, key):
+        return f"{self.API_URL.format(bucket=self.bucket)}/{quote(key, safe='')}"
+
+    def read_manifest(self, key):
+        response = self._request('GET', self._object_url(key), params={'alt': 'media'})
+        if response.status_code == 404:
+            return None
+        if not response.ok:
+            raise SyncError(f"Could not read gs://{self.bucket}/{key}: HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise SyncError(f"gs://{self.bucket}/{key} is not JSON: {e}") from e
+
+    @staticmethod
+    def _metadata(key, content_type, content_encoding=None, cache_control=None):
+        metadata = {'name': key, 'contentType': content_type}
+        if content_encoding:
+            metadata['contentEncoding'] = content_encoding
+        if cache_control:
+            metadata['cacheControl'] = cache_control
+        return metadata
+
+    def _put(self, key, data, content_type, content_encoding=None, cache_control=None):
+        metadata = self._metadata(key, content_type, content_encoding, cache_control)
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n{json.dumps(metadata)}\r\n"
+            f"--{boundary}\r\nContent-Type: {content_type}\r\n\r\n"
+        ).encode('utf-8') + data + f"\r\n--{boundary}--\r\n".encode('utf-8')
+        response = self._request('POST', self.UPLOAD_URL.format(bucket=self.bucket), params={'uploadType': 'multipart'},
+                                 data=body, headers={'Content-Type': f"multipart/related; boundary={boundary}"})
+        if not response.ok:
+            raise SyncError(f"Could not upload gs://{self.bucket}/{key}: HTTP {response.status_code} {response.text[:200]}")
+        return len(data)
+
+    @staticmethod
+    def _committed(response):
+        """Bytes a resumable session holds, from the Range header of its 308 response ("bytes=0-N")."""
+        committed = response.headers.get('Range', '')
+        try:
+            return int(committed.rsplit('-', 1)[1]) + 1
+        except (IndexError, ValueError):
+            return 0
+
+    def _resume_offset(self, session_url, key, size):
+        """Ask a resumable session how many bytes it has; None once the upload is complete."""
+        response = self._request('PUT', session_url, headers={'Content-Range': f"bytes */{size}"}, allow_redirects=False)
+        if response.status_code in (200, 201):
+            return None
+        if response.status_code != 308:
+            raise SyncError(f"Could not resume the upload of gs://{self.bucket}/{key}: HTTP {response.status_code}")
+        return self._committed(response)
+
+    def _upload_resumable(self, key, path, size, content_type, content_encoding=None, cache_control=None):
+        metadata = self._metadata(key, content_type, content_encoding, cache_control)
+        response = self._request('POST', self.UPLOAD_URL.format(bucket=self.bucket), params={'uploadType': 'resumable'},
+                                 json=metadata, headers={'X-Upload-Content-Type': content_type,
+                                                         'X-Upload-Content-Length': str(size)})
+        session_url = response.headers.get('Location')
+        if not response.ok or not session_url:
+            raise SyncError(f"Could not start the upload of gs://{self.bucket}/{key}: "
+                            f"HTTP {response.status_code} {response.text[:200]}")
+        offset = 0
+        failures = 0
+        with open(path, 'rb') as f:
+            while True:
+                if offset < size:
+                    f.seek(offset)
+                    chunk = f.read(CHUNK_SIZE)
+                    content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+                else:
+                    # Every byte is committed but the session has not answered 200 yet: finalize it
+                    chunk = b''
+                    content_range = f"bytes */{size}"
+                headers = {'Authorization': f"Bearer {self.token}", 'Content-Range': content_range}
+                try:
+                    response = self.session.put(session_url, data=chunk, headers=headers, timeout=TIMEOUT,
+                                                allow_redirects=False)
+                except requests.exceptions.RequestException as e:
+                    error = str(e)
+                else:
+                    if response.status_code in (200, 201):
+                        return size
+                    if response.status_code == 308:
+                        committed = self._committed(response)
+                        if committed > offset:
+                            offset = committed
+                            failures = 0
+                            continue
+                        # A session that does not move forward counts as a failed attempt
+                        error = f"HTTP 308 without progress past byte {offset}"
+                    elif response.status_code not in RETRYABLE_STATUS:
+                        raise SyncError(f"Could not upload gs://{self.bucket}/{key}: "
+                                        f"HTTP {response.status_code} {response.text[:200]}")
+                    else:
+                        error = f"HTTP {response.status_code}"
+                failures += 1
+                if failures >= self.max_attempts:
+                    raise SyncError(f"Upload of gs://{self.bucket}/{key} failed at byte {offset} "
+                                    f"after {self.max_attempts} attempts: {error}")
+                time.sleep(self.base_delay * 2 ** (failures - 1) * random.uniform(0.5, 1.0))
+                offset = self._resume_offset(session_url, key, size)
+                if offset is None:
+                    return size
+
+    def upload(self, key, path, content_type, content_encoding=None, cache_control=None):
+        """Upload a file as key. Returns the number of bytes sent."""
+        size = os.path.getsize(path)
+        if size > RESUMABLE_THRESHOLD:
+            return self._upload_resumable(key, path, size, content_type, content_encoding, cache_control)
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self._put(key, data, content_type, content_encoding, cache_control)
+
+    def delete(self, key):
+        response = self._request('DELETE', self._object_url(key))
+        if not response.ok and response.status_code != 404:
+            raise SyncError(f"Could not delete gs://{self.bucket}/{key}: HTTP {response.status_code}")
+
+    def write_manifest(self, key, manifest):
+        data = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+        self._put(key, data, 'application/json', cache_control=NO_CACHE)
@@ -0,0 +1,327 @@
+"""
+Local stand-in for the services the newsletter talks to, for tests without network.
+
+StubServer is a threaded HTTP server mimicking:
+
+- ConvertKit:     POST/GET /v3/broadcasts        (point --mail-api-url at <url>/v3)
+- Discord:        POST /discord/<name>           (204 No Content, like a webhook without ?wait=true)
+- Google Chat:    POST /googlechat/<name>        (200 with the created message)
+- listGameScores: POST /listGameScores           (scores from a fixture, or generated per game; ETags and 304)
+
+Every service can be given Faults: a latency (plus random jitter), a rate of
+injected errors, failing the first N requests, a 429 every N requests (with
+Retry-After, and Discord's X-RateLimit-Reset-After header and retry_after body
+field), and process_on_error, which makes an injected error happen *after* the
+request was processed (a broadcast created but answered with a 502), to
+exercise the ambiguous-failure paths of the delivery queue.
+
+Every request is recorded (service, method, path, JSON body with api_secret
+redacted, status, injected fault, latency) in server.records, optionally appended to
+a JSONL file as well. The server can also be driven over HTTP:
+
+- GET  /_stub/requests    the recorded requests
+- POST /_stub/faults      {service: {field: value}} updates the faults ("*" for every service)
+- POST /_stub/reset       clears the records, the broadcasts and the fault counters
+
+Randomness (jitter, error rates, generated scores) comes from a seeded RNG, so a
+run with the same seed and the same request order injects the same faults.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SERVICES = ('convertkit', 'discord', 'googlechat', 'leaderboard')
+GENERATED_PLAYERS = 12
+
+Faults = namedtuple('Faults', ['latency', 'jitter', 'error_rate', 'error_status', 'fail_first',
+                               'rate_limit_every', 'retry_after', 'process_on_error'])
+Faults.__new__.__defaults__ = (0.0, 0.0, 0.0, 503, 0, 0, 1.0, False)
+Faults.__doc__ = """Faults injected into the responses of one service.
+
+latency and jitter are in seconds (each response waits latency + uniform(0, jitter)).
+error_rate is the probability of answering error_status; the first fail_first
+requests always do. rate_limit_every=N answers 429 to every Nth request, asking to
+retry after retry_after seconds. With process_on_error, an injected error (not a
+429) is returned after the request was processed.
+"""
+
+
+def _redact(body):
+    if isinstance(body, dict) and 'api_secret' in body:
+        return dict(body, api_secret='***')
+    return body
+
+
+class StubServer:
+    """The stub services on 127.0.0.1; use as a context manager, or start() and stop()."""
+
+    def __init__(self, port=0, host='127.0.0.1', faults=None, scores=None, record_path=None, seed=0):
+        self.host = host
+        self.port = port
+        self.scores = scores or {}
+        self.record_path = record_path
+        self.seed = seed
+        self.faults = {service: Faults() for service in SERVICES}
+        self.configure(faults or {})
+        self.lock = threading.Lock()
+        self.reset()
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def configure(self, faults):
+        """Update the faults from {service or '*': Faults or {field: value}}; unknown fields raise ValueError."""
+        for service, values in faults.items():
+            if isinstance(values, Faults):
+                values = values._asdict()
+            unknown = set(values).difference(Faults._fields)
+            if unknown:
+                raise ValueError(f"Unknown fault fields: {', '.join(sorted(unknown))}")
+            targets = SERVICES if service == '*' else [service]
+            for target in targets:
+                if target not in self.faults:
+                    raise ValueError(f"Unknown service '{target}' (expected one of {', '.join(SERVICES)})")
+                self.faults[target] = self.faults[target]._replace(**values)
+
+    def reset(self):
+        with self.lock:
+            self.records = []
+            self.broadcasts = []
+            self.messages = {}
+            self.counters = {service: 0 for service in SERVICES}
+            self.rng = random.Random(self.seed)
+
+    def start(self):
+        handler = type('StubHandler', (_StubHandler,), {'stub': self})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='stub-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def webhook_url(self, wtype, name):
+        """The stub URL standing in for a webhook of a type ('discord' or 'googlechat')."""
+        return f"{self.url}/{wtype}/{name}"
+
+    def requests_for(self, service=None, path=None):
+        """The recorded requests, optionally only those of a service and/or a path."""
+        with self.lock:
+            return [record for record in self.records
+                    if (service is None or record['service'] == service) and (path is None or record['path'] == path)]
+
+    def decide(self, service):
+        """Pick the fault of the next request to a service: None, 'rate_limit' or 'error'; and its delay."""
+        faults = self.faults[service]
+        with self.lock:
+            self.counters[service] += 1
+            count = self.counters[service]
+            delay = faults.latency + (self.rng.uniform(0, faults.jitter) if faults.jitter else 0.0)
+            if faults.rate_limit_every and count % faults.rate_limit_every == 0:
+                return 'rate_limit', delay
+            if count <= faults.fail_first or (faults.error_rate and self.rng.random() < faults.error_rate):
+                return 'error', delay
+        return None, delay
+
+    def record(self, entry):
+        with self.lock:
+            entry['seq'] = len(self.records) + 1
+            self.records.append(entry)
+            if self.record_path:
+                with open(self.record_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def game_scores(self, game_id, time_range):
+        """The scores listGameScores returns for a game: from the fixture, or generated from the game ID."""
+        value = self.scores.get(game_id)
+        if isinstance(value, dict):
+            value = value.get(time_range)
+        if value is not None:
+            return value
+        rng = random.Random(f"{self.seed}:{game_id}")
+        return [
+            {'userId': f"user{i}", 'player': f"Joueur {i}", 'score': rng.randrange(1000, 100000, 10)}
+            for i in range(1, GENERATED_PLAYERS + 1)
+        ]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    stub = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+        return status
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return raw.decode('utf-8', 'replace')
+
+    def handle_request(self, method):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        path = url.path
+        body = self.read_body() if method == 'POST' else None
+
+        if path.startswith('/_stub/'):
+            self.handle_admin(method, path, body)
+            return
+
+        if path.rstrip('/').endswith('/v3/broadcasts'):
+            service = 'convertkit'
+        elif path.startswith('/discord/'):
+            service = 'discord'
+        elif path.startswith('/googlechat/'):
+            service = 'googlechat'
+        elif path.rstrip('/') == '/listGameScores':
+            service = 'leaderboard'
+        else:
+            self.send_json(404, {'error': f"No stub service at {path}"})
+            return
+
+        fault, delay = self.stub.decide(service)
+        if delay:
+            time.sleep(delay)
+        faults = self.stub.faults[service]
+        if fault == 'rate_limit':
+            response = self.rate_limited(service, faults.retry_after)
+        elif fault == 'error' and not faults.process_on_error:
+            response = (faults.error_status, {'error': 'Injected error'}, None)
+        else:
+            response = getattr(self, f"serve_{service}")(method, url, body)
+            if fault == 'error':
+                # Processed, but answered with an error: the client cannot tell it went through
+                response = (faults.error_status, {'error': 'Injected error after processing'}, None)
+        status = self.send_json(*response)
+
+        self.stub.record({
+            'time': time.time(),
+            'service': service,
+            'method': method,
+            'path': path,
+            'idempotency_key': self.headers.get('Idempotency-Key'),
+            'body': _redact(body),
+            'status': status,
+            'fault': fault,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+        })
+
+    def rate_limited(self, service, retry_after):
+        headers = {'Retry-After': f"{retry_after:g}"}
+        if service == 'discord':
+            headers['X-RateLimit-Reset-After'] = f"{retry_after:g}"
+            body = {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': False}
+        elif service == 'googlechat':
+            body = {'error': {'code': 429, 'message': 'Resource has been exhausted', 'status': 'RESOURCE_EXHAUSTED'}}
+        else:
+            body = {'error': 'Too Many Requests'}
+        return 429, body, headers
+
+    def serve_convertkit(self, method, url, body):
+        if method == 'GET':
+            secret = parse_qs(url.query).get('api_secret', [None])[0]
+            if not secret:
+                return 401, {'error': 'Authorization Failed', 'message': 'API Secret not valid'}, None
+            with self.stub.lock:
+                broadcasts = [dict(broadcast) for broadcast in self.stub.broadcasts]
+            return 200, {'broadcasts': broadcasts}, None
+        if not isinstance(body, dict) or not body.get('api_secret'):
+            return 401, {'error': 'Authorization Failed', 'message': 'API Secret not valid'}, None
+        with self.stub.lock:
+            broadcast = {
+                'id': len(self.stub.broadcasts) + 1,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+                'subject': body.get('subject'),
+                'description': body.get('description'),
+                'send_at': body.get('send_at'),
+            }
+            self.stub.broadcasts.append(broadcast)
+        return 201, {'broadcast': broadcast}, None
+
+    def store_message(self, path, text):
+        with self.stub.lock:
+            messages = self.stub.messages.setdefault(path, [])
+            messages.append(text)
+            return len(messages)
+
+    def serve_discord(self, method, url, body):
+        if method != 'POST' or not isinstance(body, dict) or not body.get('content'):
+            return 400, {'message': 'Cannot send an empty message', 'code': 50006}, None
+        self.store_message(url.path, body['content'])
+        return 204, None, None
+
+    def serve_googlechat(self, method, url, body):
+        if method != 'POST' or not isinstance(body, dict) or not body.get('text'):
+            return 400, {'error': {'code': 400, 'status': 'INVALID_ARGUMENT'}}, None
+        count = self.store_message(url.path, body['text'])
+        return 200, {'name': f"spaces{url.path[len('/googlechat'):]}/messages/{count}", 'text': body['text']}, None
+
+    def serve_leaderboard(self, method, url, body):
+        data = body.get('data') if isinstance(body, dict) else None
+        if method != 'POST' or not isinstance(data, dict) or not data.get('gameId'):
+            return 400, {'error': {'status': 'INVALID_ARGUMENT', 'message': 'gameId is required'}}, None
+        scores = self.stub.game_scores(data['gameId'], data.get('timeRange', 'all'))
+        payload = {'result': {'success': True, 'scores': scores}}
+        etag = '"' + hashlib.sha1(json.dumps(scores, sort_keys=True).encode('utf-8')).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return 304, None, {'ETag': etag}
+        return 200, payload, {'ETag': etag}
+
+    def handle_admin(self, method, path, body):
+        if path == '/_stub/requests' and method == 'GET':
+            self.send_json(200, {'requests': self.stub.requests_for()})
+        elif path == '/_stub/faults' and method == 'POST':
+            try:
+                self.stub.configure(body or {})
+            except (AttributeError, TypeError, ValueError) as e:
+                self.send_json(400, {'error': str(e)})
+                return
+            self.send_json(200, {service: faults._asdict() for service, faults in self.stub.faults.items()})
+        elif path == '/_stub/reset' and method == 'POST':
+            self.stub.reset()
+            self.send_json(200, {'reset': True})
+        else:
+            self.send_json(404, {'error': f"No stub admin endpoint {method} {path}"})
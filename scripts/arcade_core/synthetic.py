@@ -0,0 +1,272 @@
+"""
+Synthetic catalogs: repository-shaped trees of fake games for benchmarking the build.
+
+generate_catalog() writes, under a root directory, everything the build tools
+read, at the paths they read it from:
+
+- public/games/<id>/metadata.yaml in the styles of the real catalog (commented
+  controls, quoted titles, hide/added/enable_score...), with a share of broken
+  ones (invalid YAML, unknown tags, empty files, lists, invalid enable_score)
+  and of games without metadata.yaml or cover.png;
+- public/games/<id>/cover.png, random images of various sizes; a share of them
+  are incompressible and over the 100KB limit of the PNG shrinkers, and a copy
+  of those is kept in .bench/large-covers/ so restore_covers() can undo a shrink;
+- roms-manifest.json (see roms.py), with ROMs in every system of the core map,
+  a few duplicated game IDs and BIOS files;
+- public/plinko/predict/predictions.yaml, one week per seed (YYYYWW) from
+  PREDICTION_YEARS, with titles and game IDs that do not always match a game;
+- the placeholder cover, and a "scripts" symbolic link to this repository's
+  scripts/ so the shell wrappers run unchanged with the catalog as the
+  working directory.
+
+The catalog is generated from a seed, so two catalogs of the same size and seed
+are identical. catalog.json records what was generated; catalog_matches()
+tells if an existing catalog can be reused.
+"""
+
+import hashlib
+import json
+import os
+import random
+import shutil
+
+from PIL import Image, ImageDraw
+
+from .roms import MANIFEST_VERSION, write_manifest
+
+CATALOG_VERSION = 1
+CATALOG_FILE = 'catalog.json'
+LARGE_COVERS_DIR = '.bench/large-covers'
+PREDICTION_YEARS = (2015, 2045)
+
+SYSTEMS = ['arcade', 'fbneo', 'mame', 'ATARI2600', 'GAMEBOY', 'GBA', 'GENESIS', 'GG', 'JAGUAR',
+           'N64', 'NES', 'PCENGINE', 'PSX', 'S32X', 'SMS', 'SNES', 'VB', 'WS', 'UNKNOWNSYS']
+EXTENSIONS = {'arcade': 'zip', 'fbneo': 'zip', 'mame': 'zip', 'PSX': 'bin', 'N64': 'z64'}
+DEVELOPERS = ['Capcom', 'Konami', 'Namco', 'Sega', 'Taito', 'Irem', 'SNK', 'Data East', 'Toaplan', 'Cave',
+              'Nintendo', 'Hudson Soft', 'Technos', 'Atari', 'Activision', 'Minato Giken', 'Psikyo']
+GENRES = ['Shooter', 'Platformer', 'Beat em up', 'Puzzle', 'Racing', 'Sports', 'Fighting', 'Maze',
+          'Run and gun', 'Action', 'Adventure']
+SYLLABLES = ['ka', 'zu', 'ro', 'mi', 'ta', 'sho', 'bi', 'gun', 'star', 'dra', 'gon', 'ni', 'pa', 'mor',
+             'kid', 'jet', 'max', 'lo', 'ri', 'van', 'tor', 'ex', 'ion', 'blast', 'ra', 'ken']
+WORDS = ['Super', 'Star', 'Force', 'Dragon', 'Ninja', 'Blaster', 'Quest', 'Fighter', 'Legend', 'Metal',
+         'Storm', 'Rocket', 'Warrior', 'Planet', 'Knight', 'Thunder', 'Galaxy', 'Turbo', 'Shadow', 'Zero']
+CONTROLS = ['🕹️ Déplacer', '1️⃣  Tirer', '2️⃣  Bombe', '2️⃣  Sauter', '3️⃣  Spécial', '🅰️ Frapper']
+
+# Shares of the catalog
+BROKEN_SHARE = 0.03
+NO_METADATA_SHARE = 0.01
+NO_COVER_SHARE = 0.01
+LARGE_COVER_SHARE = 0.01
+DUPLICATE_SHARE = 0.002
+BIOS_FILES = 3
+BROKEN_KINDS = ['syntax', 'tag', 'empty', 'list', 'enable_score']
+
+
+def _game_ids(rng, count):
+    ids = []
+    seen = set()
+    while len(ids) < count:
+        game_id = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        if game_id in seen:
+            game_id = f"{game_id}{rng.randint(2, 99)}"
+        if game_id not in seen:
+            seen.add(game_id)
+            ids.append(game_id)
+    return ids
+
+
+def _title(rng, game_id):
+    if rng.random() < 0.2:
+        return game_id
+    words = rng.sample(WORDS, rng.randint(1, 3))
+    title = ' '.join(words)
+    if rng.random() < 0.3:
+        title += f" {rng.choice(['II', 'III', '2', '64', 'Plus'])}"
+    if rng.random() < 0.15:
+        title += f": The {rng.choice(WORDS)} of {rng.choice(WORDS)}"
+    return title
+
+
+def _yaml_string(text):
+    """A title as the catalog writes them: quoted when YAML would not read it back as a plain string."""
+    if ':' in text or text.isdigit() or text.lower() in ('yes', 'no', 'true', 'false', 'null'):
+        return "'" + text.replace("'", "''") + "'"
+    return text
+
+
+def metadata_text(rng, game_id, title, broken=None):
+    """The metadata.yaml of a game, or a broken one of the given kind."""
+    if broken == 'syntax':
+        return f"title: [{title}\ndeveloper: {rng.choice(DEVELOPERS)}\n"
+    if broken == 'tag':
+        return f"title: !custom {title}\nyear: {rng.randint(1977, 2005)}\n"
+    if broken == 'empty':
+        return ''
+    if broken == 'list':
+        return f"- {title}\n- {rng.choice(DEVELOPERS)}\n"
+    lines = [
+        f"title: {_yaml_string(title)}",
+        f"developer: {rng.choice(DEVELOPERS)}",
+        f"year: {rng.randint(1977, 2005)}",
+        f"genre: {rng.choice(GENRES)}",
+    ]
+    controls = rng.sample(CONTROLS, rng.randint(2, 4))
+    if rng.random() < 0.5:
+        lines += ['controls:'] + [f"  - {control}" for control in controls]
+        lines.append('to_start: Insert Coin -> Start')
+    else:
+        lines += ['#controls:'] + [f"#  - {control}" for control in controls]
+        lines += ['', '#to_start: Insert Coin -> Start', '']
+    if rng.random() < 0.3:
+        lines.append('announcement_message: ')
+    if rng.random() < 0.05:
+        lines.append(f"problem: {rng.choice(['Pas de son', 'Lent', 'Sauvegarde impossible'])}")
+    if broken == 'enable_score':
+        lines.append('enable_score: maybe')
+    elif rng.random() < 0.3:
+        lines.append(f"enable_score: {rng.choice(['true', 'false'])}")
+    lines.append(f"hide: {rng.choice(['yes', 'yes', 'yes', 'no'])}")
+    year = rng.randint(2023, 2026)
+    lines.append(f"added: {year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+    # Like the real files, the last line often has no newline
+    return '\n'.join(lines) + ('\n' if rng.random() < 0.5 else '')
+
+
+def cover_image(rng, large=False):
+    """A random cover: smooth gradients and blocks, or incompressible noise for a large one."""
+    if large:
+        width, height = rng.randint(240, 320), rng.randint(240, 320)
+        return Image.frombytes('RGB', (width, height), rng.randbytes(width * height * 3))
+    width, height = rng.randint(160, 400), rng.randint(120, 300)
+    img = Image.frombytes('RGB', (8, 6), rng.randbytes(8 * 6 * 3)).resize((width, height), Image.BILINEAR)
+    draw = ImageDraw.Draw(img)
+    for _ in range(6):
+        x, y = rng.randrange(width), rng.randrange(height)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.rectangle([x, y, x + rng.randrange(width // 3), y + rng.randrange(height // 3)], fill=color)
+    return img
+
+
+def _seeds(first_year, last_year):
+    for year in range(first_year, last_year + 1):
+        for week in range(1, 53):
+            yield f"{year}{week:02d}"
+
+
+def predictions_text(rng, games):
+    """predictions.yaml with one week per seed of PREDICTION_YEARS; games is a list of (game_id, title)."""
+    lines = ['# Synthetic predictions', '']
+    for seed in _seeds(*PREDICTION_YEARS):
+        game_id, title = rng.choice(games)
+        if rng.random() < 0.05:
+            # Renamed since the prediction was made: only the game ID still matches
+            title = f"{title} (old title)"
+        lines.append(f"{seed}: ")
+        lines.append(f"  title: \"{title}\"")
+        if rng.random() < 0.9:
+            lines.append(f"  game_id: \"{game_id}\"")
+    return '\n'.join(lines) + '\n'
+
+
+def catalog_matches(root, games, seed):
+    """True if root holds a complete catalog generated with these settings."""
+    try:
+        with open(os.path.join(root, CATALOG_FILE), 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return info.get('version') == CATALOG_VERSION and info.get('games') == games and info.get('seed') == seed
+
+
+def generate_catalog(root, games, seed=0, scripts_dir=None, progress=None):
+    """Write a synthetic catalog of games games under root, replacing any previous one.
+
+    scripts_dir is linked as root/scripts. progress(done, total) is called
+    every 1000 games. Returns the catalog.json dict. Raises ValueError if
+    root is a non-empty directory that is not a synthetic catalog.
+    """
+    rng = random.Random(seed)
+    if os.path.isdir(root) and os.listdir(root):
+        if not os.path.isfile(os.path.join(root, CATALOG_FILE)):
+            raise ValueError(f"{root} is not empty and is not a synthetic catalog")
+        shutil.rmtree(root)
+    games_dir = os.path.join(root, 'public', 'games')
+    large_dir = os.path.join(root, LARGE_COVERS_DIR)
+    os.makedirs(games_dir)
+    os.makedirs(large_dir)
+    if scripts_dir:
+        os.symlink(os.path.abspath(scripts_dir), os.path.join(root, 'scripts'))
+
+    ids = _game_ids(rng, games)
+    counts = {'broken': 0, 'no_metadata': 0, 'no_cover': 0, 'large_covers': 0}
+    roms = []
+    titles = []
+    for i, game_id in enumerate(ids):
+        title = _title(rng, game_id)
+        titles.append((game_id, title))
+        game_dir = os.path.join(games_dir, game_id)
+        os.makedirs(game_dir)
+
+        draw = rng.random()
+        if draw < NO_METADATA_SHARE:
+            counts['no_metadata'] += 1
+        else:
+            broken = rng.choice(BROKEN_KINDS) if draw < NO_METADATA_SHARE + BROKEN_SHARE else None
+            counts['broken'] += broken is not None
+            with open(os.path.join(game_dir, 'metadata.yaml'), 'w', encoding='utf-8') as f:
+                f.write(metadata_text(rng, game_id, title, broken))
+
+        draw = rng.random()
+        if draw < NO_COVER_SHARE:
+            counts['no_cover'] += 1
+        else:
+            large = draw < NO_COVER_SHARE + LARGE_COVER_SHARE
+            cover = os.path.join(game_dir, 'cover.png')
+            cover_image(rng, large).save(cover, 'PNG', compress_level=1)
+            if large:
+                counts['large_covers'] += 1
+                shutil.copyfile(cover, os.path.join(large_dir, f"{game_id}.png"))
+
+        system = rng.choice(SYSTEMS)
+        systems = [system]
+        if rng.random() < DUPLICATE_SHARE:
+            systems.append(rng.choice([other for other in SYSTEMS if other != system]))
+        for system in systems:
+            path = f"{system}/{game_id}.{EXTENSIONS.get(system, 'bin')}"
+            roms.append({'path': path, 'system': system, 'size': rng.randint(4096, 8 << 20),
+                         'sha1': hashlib.sha1(path.encode('utf-8')).hexdigest()})
+        if progress and (i + 1) % 1000 == 0:
+            progress(i + 1, games)
+
+    for i in range(BIOS_FILES):
+        path = f"bios/bios{i}.zip"
+        roms.append({'path': path, 'system': 'bios', 'size': 131072, 'sha1': hashlib.sha1(path.encode()).hexdigest()})
+    roms.sort(key=lambda rom: rom['path'])
+    write_manifest({'version': MANIFEST_VERSION, 'generated': f"synthetic seed {seed}", 'roms': roms},
+                   os.path.join(root, 'roms-manifest.json'))
+
+    predictions_dir = os.path.join(root, 'public', 'plinko', 'predict')
+    os.makedirs(predictions_dir)
+    with open(os.path.join(predictions_dir, 'predictions.yaml'), 'w', encoding='utf-8') as f:
+        f.write(predictions_text(rng, titles))
+
+    placeholder_dir = os.path.join(root, 'public', 'assets', 'images')
+    os.makedirs(placeholder_dir)
+    Image.new('RGB', (300, 225), (40, 40, 40)).save(os.path.join(placeholder_dir, 'placeholder_thumb.png'))
+
+    info = dict({'version': CATALOG_VERSION, 'games': games, 'seed': seed, 'roms': len(roms),
+                 'weeks': len(list(_seeds(*PREDICTION_YEARS)))}, **counts)
+    with open(os.path.join(root, CATALOG_FILE), 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+def restore_covers(root):
+    """Put back the original large covers (undoing a PNG shrink). Returns the number restored."""
+    large_dir = os.path.join(root, LARGE_COVERS_DIR)
+    restored = 0
+    for entry in os.scandir(large_dir):
+        game_id = entry.name[:-len('.png')]
+        shutil.copyfile(entry.path, os.path.join(root, 'public', 'games', game_id, 'cover.png'))
+        restored += 1
+    return restored
@@ -0,0 +1,169 @@
+"""
+Build telemetry: timing spans of the build stages and the slowest items of each.
+
+Every build tool (build_gamelist.py, generate_thumbnails.py,
+shrink_large_pngs_parallel.py, compress_artifacts.py) records a Telemetry:
+nested spans around its stages, the time spent on every game or image of a
+stage (only the OUTLIERS slowest are kept, with the count and total), and a few
+counters such as the number of games. Telemetry.save() merges it, under the
+tool's name, into the build report (build-report.json, see REPORT_PATH):
+
+    {"version": 1, "processes": {"gamelist": {
+        "started": 1760000000.0, "seconds": 4.2, "pid": 1234,
+        "spans": [{"name": "metadata parse", "start": 0.31, "seconds": 3.1, "depth": 0, "args": {}}, ...],
+        "items": {"game": {"count": 1062, "seconds": 2.9, "slowest": [{"name": "NES/1941.nes", "seconds": 0.02}]}},
+        "counters": {"games": 1061}}}}
+
+Span starts are seconds since the process started; "started" is the wall clock
+time of that start, which is what lines processes up in the Chrome trace
+(chrome_trace(), open it in chrome://tracing or https://ui.perfetto.dev).
+Tools running at the same time (build_parallel.sh) update the report under a
+file lock, so none of them loses the others' data.
+"""
+
+import fcntl
+import heapq
+import json
+import os
+import time
+from contextlib import contextmanager
+
+REPORT_PATH = 'build-report.json'
+TRACE_PATH = 'build-trace.json'
+REPORT_VERSION = 1
+OUTLIERS = 10
+
+
+class Telemetry:
+    """Spans, item timings and counters of one build tool, saved to the build report."""
+
+    def __init__(self, process, report_path=None):
+        self.process = process
+        self.report_path = report_path
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self.spans = []
+        self.items = {}
+        self.counters = {}
+
+    def _now(self):
+        return time.perf_counter() - self._origin
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the body as a stage; spans opened inside it are nested under it."""
+        span = {'name': name, 'start': round(self._now(), 6), 'seconds': 0.0, 'depth': self._depth, 'args': args}
+        self.spans.append(span)
+        self._depth += 1
+        try:
+            yield span
+        finally:
+            self._depth -= 1
+            span['seconds'] = round(self._now() - span['start'], 6)
+
+    def item(self, stage, name, seconds):
+        """Record the time one game or image took in a stage."""
+        stats = self.items.setdefault(stage, {'count': 0, 'seconds': 0.0, 'slowest': []})
+        stats['count'] += 1
+        stats['seconds'] += seconds
+        if len(stats['slowest']) < OUTLIERS:
+            heapq.heappush(stats['slowest'], (seconds, name))
+        elif seconds > stats['slowest'][0][0]:
+            heapq.heapreplace(stats['slowest'], (seconds, name))
+
+    def count(self, **counters):
+        """Set counters of the run (games, images, bytes...)."""
+        self.counters.update(counters)
+
+    def to_dict(self):
+        items = {
+            stage: {
+                'count': stats['count'],
+                'seconds': round(stats['seconds'], 6),
+                'slowest': [{'name': name, 'seconds': round(seconds, 6)}
+                            for seconds, name in sorted(stats['slowest'], reverse=True)],
+            }
+            for stage, stats in self.items.items()
+        }
+        return {
+            'started': round(self.started, 6),
+            'seconds': round(self._now(), 6),
+            'pid': os.getpid(),
+            'spans': self.spans,
+            'items': items,
+            'counters': self.counters,
+        }
+
+    def save(self, report_path=None):
+        """Merge this tool's data into the build report; a no-op without a report path. Returns the path."""
+        path = report_path or self.report_path
+        if not path:
+            return None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{path}.lock", 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            report = load_report(path) or {'version': REPORT_VERSION, 'processes': {}}
+            report['processes'][self.process] = self.to_dict()
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        return path
+
+
+def load_report(path=REPORT_PATH):
+    """The build report at path, or None if it is missing, unreadable or of another version."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(report, dict) or report.get('version') != REPORT_VERSION:
+        return None
+    return report
+
+
+def report_duration(report):
+    """Wall clock seconds from the first tool's start to the last tool's end."""
+    processes = report['processes'].values()
+    if not processes:
+        return 0.0
+    return max(p['started'] + p['seconds'] for p in processes) - min(p['started'] for p in processes)
+
+
+def chrome_trace(report):
+    """The report as a Chrome trace-event list: one trace process per tool, one complete event per span."""
+    processes = sorted(report['processes'].items(), key=lambda item: item[1]['started'])
+    if not processes:
+        return []
+    origin = processes[0][1]['started']
+    events = []
+    for pid, (name, process) in enumerate(processes, start=1):
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': name}})
+        offset = process['started'] - origin
+        events.append({
+            'name': name, 'cat': 'process', 'ph': 'X', 'pid': pid, 'tid': 0,
+            'ts': round(offset * 1e6), 'dur': round(process['seconds'] * 1e6), 'args': process['counters'],
+        })
+        for span in process['spans']:
+            events.append({
+                'name': span['name'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': 0,
+                'ts': round((offset + span['start']) * 1e6), 'dur': round(span['seconds'] * 1e6),
+                'args': span['args'],
+            })
+    return events
+
+
+def write_trace(report, path=TRACE_PATH):
+    """Write the Chrome trace of a report atomically. Returns the path."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': chrome_trace(report), 'displayTimeUnit': 'ms'}, f)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,71 @@
+"""
+Precompiled text templates for the newsletter.
+
+A Template uses the str.format() syntax ({name}, {score:,}, {{ and }} for
+literal braces) and is parsed once, when it is created: rendering only joins
+the precompiled literal chunks with the formatted field values, without
+scanning the source again. The newsletter declares its templates at module
+level, so each is compiled once per process however many weeks are rendered.
+
+Only named fields are supported ({0}, {}, {a.b} and {a[b]} are rejected when
+compiling), and render() raises KeyError naming any missing field.
+"""
+
+import string
+
+MEDALS = {1: '🥇', 2: '🥈'}
+DEFAULT_MEDAL = '🥉'
+
+
+class Template:
+    """A str.format()-style template compiled once into literal chunks and fields."""
+
+    def __init__(self, source):
+        self.source = source
+        self.parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if field is not None:
+                if not field.isidentifier():
+                    raise ValueError(f"Template fields must be plain names, got {{{field}}}")
+                if spec and '{' in spec:
+                    raise ValueError(f"Nested fields are not supported in {{{field}:{spec}}}")
+            self.parts.append((literal, field, spec or '', conversion))
+        self.fields = frozenset(field for _, field, _, _ in self.parts if field is not None)
+
+    def render(self, fields=(), **values):
+        """The template with every field replaced by its value, formatted with its format spec.
+
+        Values come from the fields mapping, then the keyword arguments (which take precedence).
+        """
+        values = dict(fields, **values)
+        missing = self.fields.difference(values)
+        if missing:
+            raise KeyError(f"Missing template fields: {', '.join(sorted(missing))}")
+        out = []
+        for literal, field, spec, conversion in self.parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = values[field]
+            if conversion == 'r':
+                value = repr(value)
+            elif conversion == 's':
+                value = str(value)
+            elif conversion == 'a':
+                value = ascii(value)
+            out.append(format(value, spec))
+        return ''.join(out)
+
+    def render_each(self, items):
+        """The template rendered once per mapping of items, concatenated."""
+        return ''.join(self.render(item) for item in items)
+
+
+def medal(rank):
+    """The medal emoji of a podium rank (🥉 for anything below second)."""
+    return MEDALS.get(rank, DEFAULT_MEDAL)
+
+
+def medal_scores(scores):
+    """Top scores ({rank, player, score}) as dicts ready for a score-line template: medal, player and score."""
+    return [{'medal': medal(score['rank']), 'player': score['player'], 'score': score['score']} for score in scores]
@@ -0,0 +1,157 @@
+"""
+Title -> game ID resolution.
+
+The title index maps game titles to game IDs through four tiers, tried in order:
+
+- exact:      the title as written in metadata.yaml
+- casefold:   str.casefold() of the title
+- normalized: casefolded, accents stripped, "." and "'" removed and other
+              punctuation turned into spaces ("H.E.R.O." -> "hero")
+- partial:    token match on the normalized title; the query's tokens are all
+              in the game's title, or the game's tokens are all in the query
+
+The index is built by build_gamelist.py next to gamelist.json (public/title-index.json)
+so scripts that only need to resolve a title do not rebuild it. resolve() reports
+the tier that matched, and flags ambiguous matches instead of silently picking
+the first game: an ambiguous partial match resolves to no game at all.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import namedtuple
+
+TITLE_INDEX_PATH = 'public/title-index.json'
+TITLE_INDEX_VERSION = 1
+
+_DROPPED_PUNCTUATION = re.compile(r"[.'’]")
+_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+TitleMatch = namedtuple('TitleMatch', ['game_id', 'tier', 'candidates', 'ambiguous'])
+TitleMatch.__doc__ = """Result of TitleIndex.resolve().
+
+game_id is None when nothing matched or the partial match was ambiguous.
+tier is 'exact', 'casefold', 'normalized', 'partial' or None. candidates lists
+every game ID that matched in that tier, and ambiguous is True when there is
+more than one.
+"""
+
+
+def normalize_title(title):
+    """Casefold a title, strip accents and reduce punctuation to single spaces."""
+    text = unicodedata.normalize('NFKD', str(title).casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = _DROPPED_PUNCTUATION.sub('', text)
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def _add(mapping, key, game_id):
+    game_ids = mapping.setdefault(key, [])
+    if game_id not in game_ids:
+        game_ids.append(game_id)
+
+
+def build_title_index(games):
+    """Build the title index dict for a list of gamelist entries.
+
+    Every key maps to the list of distinct game IDs sharing it, in gamelist order.
+    """
+    exact = {}
+    casefold = {}
+    normalized = {}
+    tokens = {}
+    token_counts = {}
+    for game in games:
+        game_id = game.get('id')
+        title = game.get('title') or ''
+        if not game_id or not title:
+            continue
+        _add(exact, title, game_id)
+        _add(casefold, title.casefold(), game_id)
+        norm = normalize_title(title)
+        if norm:
+            _add(normalized, norm, game_id)
+        game_tokens = set(norm.split())
+        token_counts.setdefault(game_id, len(game_tokens))
+        for token in sorted(game_tokens):
+            _add(tokens, token, game_id)
+    return {
+        'version': TITLE_INDEX_VERSION,
+        'exact': exact,
+        'casefold': casefold,
+        'normalized': normalized,
+        'tokens': tokens,
+        'token_counts': token_counts,
+    }
+
+
+def write_title_index(games, path=TITLE_INDEX_PATH):
+    """Write the title index of a list of gamelist entries to path, atomically."""
+    data = build_title_index(games)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return data
+
+
+class TitleIndex:
+    """Resolve titles to game IDs using a title index dict."""
+
+    def __init__(self, data):
+        self.exact = data['exact']
+        self.casefold = data['casefold']
+        self.normalized = data['normalized']
+        self.tokens = data['tokens']
+        self.token_counts = data['token_counts']
+
+    @classmethod
+    def from_games(cls, games):
+        return cls(build_title_index(games))
+
+    @staticmethod
+    def _match(game_ids, tier):
+        return TitleMatch(game_ids[0], tier, list(game_ids), len(game_ids) > 1)
+
+    def resolve(self, title):
+        """Resolve a title to a game ID. Returns a TitleMatch."""
+        if not title:
+            return TitleMatch(None, None, [], False)
+
+        game_ids = self.exact.get(title)
+        if game_ids:
+            return self._match(game_ids, 'exact')
+        game_ids = self.casefold.get(title.casefold())
+        if game_ids:
+            return self._match(game_ids, 'casefold')
+        norm = normalize_title(title)
+        game_ids = self.normalized.get(norm)
+        if game_ids:
+            return self._match(game_ids, 'normalized')
+
+        candidates = self.partial_candidates(norm.split())
+        if len(candidates) == 1:
+            return TitleMatch(candidates[0], 'partial', candidates, False)
+        if candidates:
+            return TitleMatch(None, 'partial', candidates, True)
+        return TitleMatch(None, None, [], False)
+
+    def partial_candidates(self, query_tokens):
+        """Game IDs whose title contains every query token, or whose tokens are all in the query."""
+        query_tokens = set(query_tokens)
+        if not query_tokens:
+            return []
+        hits = {}
+        order = []
+        for token in sorted(query_tokens):
+            for game_id in self.tokens.get(token, ()):
+                if game_id not in hits:
+                    hits[game_id] = 0
+                    order.append(game_id)
+                hits[game_id] += 1
+        return [
+            game_id for game_id in order
+            if hits[game_id] == len(query_tokens) or hits[game_id] == self.token_counts.get(game_id)
+        ]
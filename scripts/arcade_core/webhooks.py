@@ -0,0 +1,46 @@
+"""
+Webhook messages for Discord and Google Chat.
+
+Messages are rendered once per webhook type (bold is **text** on Discord and
+*text* on Google Chat) and wrapped in the payload each type expects. The
+targets are posted concurrently through one pooled keep-alive session
+(make_session()) by the DeliveryQueue of delivery.py, which adds per-request
+timeouts, retries and a per-label report.
+"""
+
+from collections import namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_WORKERS = 8
+
+# Key of the message text in the JSON payload, and the bold marker, per webhook type
+WEBHOOK_FORMATS = {
+    'discord': ('content', '**'),
+    'googlechat': ('text', '*'),
+}
+
+WebhookTarget = namedtuple('WebhookTarget', ['label', 'type', 'env', 'url', 'payload'])
+
+
+def render_webhook_messages(message_template):
+    """Render a message template once per webhook type: {type: text}, with {b} replaced by the type's bold marker."""
+    return {wtype: message_template.replace('{b}', bold) for wtype, (_, bold) in WEBHOOK_FORMATS.items()}
+
+
+def webhook_payload(wtype, text):
+    """Return the JSON payload carrying an already rendered text for a webhook type, or None for unknown types."""
+    if wtype not in WEBHOOK_FORMATS:
+        return None
+    key, _ = WEBHOOK_FORMATS[wtype]
+    return {key: text}
+
+
+def make_session(pool_size=MAX_WORKERS):
+    """A requests.Session whose connection pool can serve pool_size concurrent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
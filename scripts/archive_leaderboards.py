@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Leaderboard Archiver for BonjourArcade
+
+Walks every past week of predictions.yaml, fetches the scores of each week's
+game concurrently through the cached leaderboard client, and appends a compact
+snapshot of the weeks whose top scores changed to the append-only archive
+(.cache/leaderboard-archive/archive.jsonl, see arcade_core/leaderboard_archive.py).
+It then writes public/leaderboards/history.json, the per-week top scores and
+hall of fame the site and the newsletter read instead of the live API.
+
+Weeks that are not archived yet, and the last --refresh-weeks past weeks (whose
+scores still move), are fetched; older archived weeks are left alone unless
+--all is given.
+
+Usage:
+    python3 scripts/archive_leaderboards.py [--refresh-weeks N] [--all] [--top N] [--offline]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core import get_catalog, get_predictions
+from arcade_core.leaderboard import CACHE_DIR, DEFAULT_TTL, LeaderboardClient
+from arcade_core.leaderboard_archive import (
+    ARCHIVE_PATH,
+    HISTORY_PATH,
+    TOP_COUNT,
+    LeaderboardArchive,
+    build_history,
+    make_snapshot,
+    write_history,
+)
+
+REFRESH_WEEKS = 4
+
+
+def past_weeks(schedule, catalog):
+    """(week, game_id) for every past week, oldest first; weeks whose game cannot be resolved are skipped with a warning."""
+    weeks = []
+    for week in schedule.weeks:
+        if week['status'] != 'past':
+            continue
+        game_id = week['game_id']
+        if not game_id and week['title']:
+            match = catalog.resolve_title(week['title']) if catalog.exists() else None
+            game_id = match.game_id if match else None
+        if not game_id:
+            print(f"⚠️  Warning: No game ID for week {week['seed']} ({week['title']}), skipping")
+            continue
+        weeks.append((week, game_id))
+    return weeks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive the leaderboards of past games of the week')
+    parser.add_argument('--archive', default=os.getenv('LEADERBOARD_ARCHIVE', ARCHIVE_PATH),
+                        help=f'Append-only snapshot archive (default: $LEADERBOARD_ARCHIVE or {ARCHIVE_PATH})')
+    parser.add_argument('--history-output', default=HISTORY_PATH,
+                        help=f'Static history JSON for the site (default: {HISTORY_PATH})')
+    parser.add_argument('--refresh-weeks', type=int, default=REFRESH_WEEKS,
+                        help=f'Re-fetch the last N past weeks even if archived (default: {REFRESH_WEEKS})')
+    parser.add_argument('--all', action='store_true', help='Re-fetch every past week')
+    parser.add_argument('--top', type=int, default=TOP_COUNT, help=f'Players kept per snapshot (default: {TOP_COUNT})')
+    parser.add_argument('--cache-dir', default=os.getenv('LEADERBOARD_CACHE_DIR', CACHE_DIR),
+                        help=f'Leaderboard cache directory (default: $LEADERBOARD_CACHE_DIR or {CACHE_DIR})')
+    parser.add_argument('--ttl', type=float, default=float(os.getenv('LEADERBOARD_CACHE_TTL', DEFAULT_TTL)),
+                        help=f'Seconds a cached leaderboard stays fresh (default: {DEFAULT_TTL})')
+    parser.add_argument('--offline', action='store_true', help='Only use the leaderboard cache, never the network')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    predictions = get_predictions()
+    schedule = predictions.schedule
+    if schedule is None:
+        print("❌ Error: predictions.yaml not found")
+        sys.exit(1)
+
+    weeks = past_weeks(schedule, get_catalog())
+    archive = LeaderboardArchive(args.archive)
+    print(f"📚 {len(weeks)} past weeks, {len(archive.latest)} archived ({archive.count} snapshots)")
+
+    refresh = weeks if args.all else [
+        (week, game_id) for i, (week, game_id) in enumerate(weeks)
+        if i >= len(weeks) - args.refresh_weeks or archive.get(week['seed'], game_id) is None
+    ]
+    errors = {}
+    if refresh:
+        print(f"🏆 Fetching {len(refresh)} leaderboards...")
+        client = LeaderboardClient(cache_dir=args.cache_dir, ttl=args.ttl, offline=True if args.offline else None)
+        results, errors = client.fetch_many([game_id for _, game_id in refresh])
+        for game_id, error in errors.items():
+            print(f"⚠️  Warning: {error}")
+        snapshots = [
+            make_snapshot(week, game_id, results[game_id], args.top)
+            for week, game_id in refresh if game_id in results
+        ]
+        written = archive.append(snapshots)
+        print(f"✅ {written} new snapshot{'s' if written != 1 else ''} appended to {args.archive} "
+              f"({len(snapshots) - written} unchanged)")
+
+    history = build_history(archive, schedule)
+    write_history(history, args.history_output)
+    print(f"✅ Wrote {args.history_output}: {len(history['weeks'])} weeks, {len(history['hall_of_fame'])} players in the hall of fame "
+          f"({time.time() - start_time:.2f}s)")
+    if errors:
+        print(f"⚠️  {len(errors)} leaderboard{'s' if len(errors) != 1 else ''} could not be fetched; they will be retried next run")
+
+
+if __name__ == '__main__':
+    main()
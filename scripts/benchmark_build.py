@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Build Benchmark for BonjourArcade
+
+Times the build pipelines on synthetic catalogs of 1k, 10k and 100k games (see
+arcade_core/synthetic.py; catalogs are generated once and reused from
+.cache/benchmark/). Every engine of every pipeline runs as CI and dev.sh run
+it, with the catalog as the working directory:
+
+- png-shrink: shrink_large_pngs.py (sequential), shrink_large_pngs_parallel.py
+  from scratch (parallel) and again with its manifest (incremental);
+- thumbnails: generate_thumbnails.sh with --force --jobs 1 (sequential),
+  --force (parallel) and without --force (incremental);
+- gamelist: generate_gamelist_sequential.sh and generate_gamelist_parallel.sh
+  with --full, then an incremental build;
+- compress: compress_artifacts.py with --force (full), then without (incremental).
+
+Stage timings come from the build report each tool writes (BUILD_REPORT, see
+arcade_core/telemetry.py). Every run is appended to the history file
+(.cache/benchmark/history.json) and compared with the median of the last
+--window runs of the same machine, catalog and engine; a run or stage slower
+than the baseline by more than --tolerance (and --min-delta seconds) is a
+regression. With --repeat N, each engine runs N times and its fastest run
+counts, which keeps the noise of a busy machine out of the comparison. With
+--check, regressions and failed runs make the script exit 1.
+Add an engine to ENGINES to benchmark it along the others.
+
+Usage:
+    python3 scripts/benchmark_build.py [--size 1k --size 10k] [--pipeline NAME ...] [--repeat N] [--check] [--no-record]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.synthetic import catalog_matches, generate_catalog, restore_covers
+from arcade_core.telemetry import load_report
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKDIR = '.cache/benchmark'
+HISTORY_PATH = os.path.join(WORKDIR, 'history.json')
+HISTORY_VERSION = 1
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+DEFAULT_SIZES = ['1k', '10k']
+TOLERANCE = 0.25
+MIN_DELTA = 0.25
+WINDOW = 5
+
+MANIFEST = ['--manifest', 'roms-manifest.json']
+
+
+def reset_shrink(root):
+    """Undo the previous shrink and forget which covers were already optimized."""
+    restore_covers(root)
+    manifest = os.path.join(root, '.cache', 'png-shrink', 'manifest.json')
+    if os.path.exists(manifest):
+        os.remove(manifest)
+
+
+# (pipeline, engine, command, untimed preparation), run in this order
+ENGINES = [
+    ('png-shrink', 'sequential', ['python3', 'scripts/shrink_large_pngs.py'], reset_shrink),
+    ('png-shrink', 'parallel', ['python3', 'scripts/shrink_large_pngs_parallel.py'], reset_shrink),
+    ('png-shrink', 'incremental', ['python3', 'scripts/shrink_large_pngs_parallel.py'], None),
+    ('thumbnails', 'sequential', ['bash', 'scripts/generate_thumbnails.sh', '--force', '--jobs', '1'], None),
+    ('thumbnails', 'parallel', ['bash', 'scripts/generate_thumbnails.sh', '--force'], None),
+    ('thumbnails', 'incremental', ['bash', 'scripts/generate_thumbnails.sh'], None),
+    ('gamelist', 'sequential', ['bash', 'scripts/generate_gamelist_sequential.sh', '--full'] + MANIFEST, None),
+    ('gamelist', 'parallel', ['bash', 'scripts/generate_gamelist_parallel.sh', '--full'] + MANIFEST, None),
+    ('gamelist', 'incremental', ['bash', 'scripts/generate_gamelist_sequential.sh'] + MANIFEST, None),
+    ('compress', 'full', ['python3', 'scripts/compress_artifacts.py', '--force'], None),
+    ('compress', 'incremental', ['python3', 'scripts/compress_artifacts.py'], None),
+]
+PIPELINES = sorted({pipeline for pipeline, _, _, _ in ENGINES})
+
+
+def host_info():
+    return {
+        'node': platform.node(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count() or 1,
+        'python': platform.python_version(),
+    }
+
+
+def host_key(host):
+    """Runs are only compared with runs of the same machine and Python minor version."""
+    return (host['node'], host['machine'], host['cpus'], host['python'].rsplit('.', 1)[0])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR, check=True,
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_catalog(games, seed, workdir, regenerate=False):
+    """The directory of the catalog of that size, generated unless a matching one exists."""
+    root = os.path.join(workdir, f"catalog-{games}-{seed}")
+    if regenerate or not catalog_matches(root, games, seed):
+        print(f"🧪 Generating a synthetic catalog of {games} games in {root}...")
+        start = time.perf_counter()
+        info = generate_catalog(root, games, seed=seed, scripts_dir=SCRIPTS_DIR)
+        print(f"   {info['broken']} broken metadata.yaml, {info['large_covers']} covers over 100KB, "
+              f"{info['weeks']} predicted weeks ({time.perf_counter() - start:.1f}s)")
+    else:
+        print(f"♻️  Reusing the synthetic catalog in {root}")
+        reset_shrink(root)
+    return root
+
+
+def run_engine(root, pipeline, engine, command, prepare):
+    """Run one engine in the catalog. Returns its result dict (seconds, ok, stages from the build report)."""
+    if prepare:
+        prepare(root)
+    logs_dir = os.path.join(root, '.bench', 'logs')
+    os.makedirs(logs_dir, exist_ok=True)
+    report_path = os.path.abspath(os.path.join(root, '.bench', f"report-{pipeline}-{engine}.json"))
+    if os.path.exists(report_path):
+        os.remove(report_path)
+    env = dict(os.environ, BUILD_REPORT=report_path)
+    env.pop('BUILD_TRACE', None)
+    with open(os.path.join(logs_dir, f"{pipeline}-{engine}.log"), 'w', encoding='utf-8') as log:
+        start = time.perf_counter()
+        returncode = subprocess.run(command, cwd=root, env=env, stdout=log, stderr=subprocess.STDOUT).returncode
+        seconds = time.perf_counter() - start
+    stages = {}
+    report = load_report(report_path)
+    for process in (report or {}).get('processes', {}).values():
+        for span in process['spans']:
+            if span['depth'] == 0:
+                stages[span['name']] = stages.get(span['name'], 0.0) + span['seconds']
+    return {'pipeline': pipeline, 'engine': engine, 'seconds': round(seconds, 4), 'ok': returncode == 0,
+            'stages': {name: round(value, 4) for name, value in stages.items()}}
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        return {'version': HISTORY_VERSION, 'runs': []}
+    if not isinstance(history, dict) or history.get('version') != HISTORY_VERSION:
+        return {'version': HISTORY_VERSION, 'runs': []}
+    return history
+
+
+def save_history(history, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def baselines(history, run, window):
+    """{(pipeline, engine): {'seconds': median, 'stages': {name: median}}} of the last comparable runs."""
+    previous = [
+        past for past in history['runs']
+        if host_key(past['host']) == host_key(run['host'])
+        and past['games'] == run['games'] and past['seed'] == run['seed']
+    ][-window:]
+    samples = {}
+    for past in previous:
+        for result in past['results']:
+            if not result['ok']:
+                continue
+            sample = samples.setdefault((result['pipeline'], result['engine']), {'seconds': [], 'stages': {}})
+            sample['seconds'].append(result['seconds'])
+            for name, seconds in result['stages'].items():
+                sample['stages'].setdefault(name, []).append(seconds)
+    return {
+        key: {'seconds': statistics.median(sample['seconds']),
+              'stages': {name: statistics.median(values) for name, values in sample['stages'].items()}}
+        for key, sample in samples.items()
+    }
+
+
+def is_regression(seconds, baseline, tolerance, min_delta):
+    return seconds > baseline * (1 + tolerance) and seconds - baseline > min_delta
+
+
+def print_results(run, base, tolerance, min_delta):
+    """Print the results of a run against their baselines. Returns the list of regressions/failures."""
+    problems = []
+    games = run['games']
+    print(f"   {'pipeline':<11} {'engine':<12} {'seconds':>9} {'ms/game':>8} {'baseline':>9} {'change':>7}  stages")
+    for result in run['results']:
+        name = f"{result['pipeline']}/{result['engine']}"
+        baseline = base.get((result['pipeline'], result['engine']))
+        stages = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in result['stages'].items())
+        if not result['ok']:
+            problems.append(f"{name} failed (see {result['log']})")
+            print(f"   {result['pipeline']:<11} {result['engine']:<12} {'failed':>9}")
+            continue
+        if baseline:
+            change = f"{100 * (result['seconds'] / baseline['seconds'] - 1):+6.0f}%" if baseline['seconds'] else '     -'
+            baseline_text = f"{baseline['seconds']:8.2f}s"
+        else:
+            change, baseline_text = '     -', '        -'
+        print(f"   {result['pipeline']:<11} {result['engine']:<12} {result['seconds']:8.2f}s "
+              f"{result['seconds'] / games * 1000:8.2f} {baseline_text} {change}  {stages}".rstrip())
+        if not baseline:
+            continue
+        if is_regression(result['seconds'], baseline['seconds'], tolerance, min_delta):
+            problems.append(f"{name}: {result['seconds']:.2f}s, baseline {baseline['seconds']:.2f}s")
+        for stage, seconds in result['stages'].items():
+            stage_baseline = baseline['stages'].get(stage)
+            if stage_baseline is not None and is_regression(seconds, stage_baseline, tolerance, min_delta):
+                problems.append(f"{name} stage \"{stage}\": {seconds:.2f}s, baseline {stage_baseline:.2f}s")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the build pipelines on synthetic catalogs')
+    parser.add_argument('--size', action='append', choices=sorted(SIZES, key=SIZES.get),
+                        help=f"Catalog size, repeatable (default: {' '.join(DEFAULT_SIZES)}; 100k takes a while)")
+    parser.add_argument('--pipeline', action='append', choices=PIPELINES, help='Only run this pipeline (repeatable)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic catalogs (default: 0)')
+    parser.add_argument('--workdir', default=WORKDIR, help=f'Directory of the catalogs (default: {WORKDIR})')
+    parser.add_argument('--regenerate', action='store_true', help='Generate the catalogs again even if they exist')
+    parser.add_argument('--history', default=HISTORY_PATH, help=f'History file (default: {HISTORY_PATH})')
+    parser.add_argument('--no-record', action='store_true', help='Do not append this run to the history')
+    parser.add_argument('--window', type=int, default=WINDOW,
+                        help=f'Number of past runs the baseline is the median of (default: {WINDOW})')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f'Slowdown over the baseline that is a regression (default: {TOLERANCE:.0%})')
+    parser.add_argument('--min-delta', type=float, default=MIN_DELTA,
+                        help=f'Seconds a slowdown must also exceed to be a regression (default: {MIN_DELTA})')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs of each engine; the fastest counts (default: 1)')
+    parser.add_argument('--check', action='store_true', help='Exit 1 on a regression or a failed run')
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    host = host_info()
+    commit = git_commit()
+    problems = []
+    for size in args.size or DEFAULT_SIZES:
+        games = SIZES[size]
+        try:
+            root = prepare_catalog(games, args.seed, args.workdir, regenerate=args.regenerate)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        run = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': commit,
+            'host': host,
+            'games': games,
+            'seed': args.seed,
+            'results': [],
+        }
+        print(f"⏱️  Benchmarking {size} games...")
+        for pipeline, engine, command, prepare in ENGINES:
+            if args.pipeline and pipeline not in args.pipeline:
+                continue
+            runs = [run_engine(root, pipeline, engine, command, prepare) for _ in range(max(1, args.repeat))]
+            result = min(runs, key=lambda result: (not result['ok'], result['seconds']))
+            result['log'] = os.path.join(root, '.bench', 'logs', f"{pipeline}-{engine}.log")
+            run['results'].append(result)
+            print(f"   {pipeline}/{engine}: {result['seconds']:.2f}s{'' if result['ok'] else ' (failed)'}")
+
+        base = baselines(history, run, args.window)
+        print(f"📊 {size} games ({commit or 'no commit'}), compared with the median of the last {args.window} runs:")
+        problems += [f"{size}: {problem}" for problem in print_results(run, base, args.tolerance, args.min_delta)]
+        history['runs'].append(run)
+
+    if not args.no_record:
+        save_history(history, args.history)
+        print(f"📝 Recorded the results in {args.history}")
+    for problem in problems:
+        print(f"❌ Regression: {problem}")
+    if problems and args.check:
+        sys.exit(1)
+    if not problems:
+        print("✅ No regression")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+"""
+Gamelist Builder for BonjourArcade
+
+This script builds public/gamelist.json, public/title-index.json,
+public/gamelist-index.json with the per-game public/gamelist/<id>.json detail
+files (see arcade_core/gamelist_index.py), and public/api/current-game in a
+single Python process. It replaces the yq/jq pipeline that used to run once per ROM in
+generate_gamelist_sequential.sh and generate_gamelist_parallel.sh; both scripts
+are now thin wrappers around this one.
+
+Each metadata.yaml is parsed once with the same YAML 1.2 rules that `yq` uses,
+predictions.yaml is compiled once into public/plinko/predict/predictions.json
+(see arcade_core/predictions.py) and kept in memory, and the output is written
+directly. The generated JSON keeps the exact format of the old shell
+pipeline (jq formatting, `//` defaulting rules and all).
+
+Compiled entries are cached per game in .cache/gamelist/ (keyed on a hash of
+the metadata.yaml bytes, cover/save presence and this script's source), so a
+rebuild only recompiles the games that changed. Prediction overrides and the
+"new" flag depend on the date and are re-applied on every build. Use --full
+to ignore the cache.
+
+With --report (or BUILD_REPORT), the time of every stage (predictions resolve,
+manifest scan, metadata parse, JSON emit) and the slowest games are merged into
+the build report under "gamelist" (see arcade_core/telemetry.py).
+
+Environment variables (same as the shell scripts):
+- LOCAL_TESTING=true      Use local ROM paths (/roms/...) instead of Google Cloud Storage URLs
+- ROMS_MANIFEST_URL       Download the list of ROM entries instead of scanning roms/
+- ROMS_MANIFEST_PATH      Read the list of ROM entries from a local file instead of scanning roms/
+- GAMELIST_CACHE_DIR      Directory of the incremental build cache (default: .cache/gamelist)
+- BUILD_REPORT            Build report to record the stage timings in (e.g. build-report.json)
+
+A manifest is either one "<system>/<file>" entry per line or the JSON manifest
+written by scripts/generate_rom_manifest.py; with the latter, ROMs with the same
+content and ROMs that moved to another directory are reported.
+
+Usage:
+    python3 scripts/build_gamelist.py [--output public/gamelist.json] [--index-output PATH] [--details-dir DIR]
+                                      [--manifest PATH] [--local] [--full] [--report build-report.json]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+import urllib.request
+from datetime import date, datetime
+from datetime import time as dtime
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.predictions import (
+    PREDICTIONS_JSON,
+    PREDICTIONS_YAML,
+    PredictionSchedule,
+    compile_schedule,
+    get_current_week_seed,
+    load_schedule,
+    write_schedule,
+)
+from arcade_core.covers import cover_variants, existing_variants, png_size
+from arcade_core.gamelist_index import DETAILS_DIR, INDEX_PATH, page_sizes, write_details, write_index
+from arcade_core.roms import find_duplicates, parse_manifest, scan_roms
+from arcade_core.telemetry import Telemetry
+from arcade_core.titles import TITLE_INDEX_PATH, write_title_index
+
+try:
+    from yaml import CSafeLoader as _BaseLoader
+except ImportError:
+    from yaml import SafeLoader as _BaseLoader
+
+# --- Configuration ---
+GAMES_DIR = 'public/games'
+ROMS_DIR = 'roms'
+OUTPUT_FILE = 'public/gamelist.json'
+CURRENT_GAME_FILE = 'public/api/current-game'
+DEFAULT_COVER = 'assets/images/placeholder_thumb.png'
+LAUNCHER_PAGE = '/play'
+ROM_BASE_URL = 'https://storage.googleapis.com/bonjourarcade/roms'
+CACHE_DIR = '.cache/gamelist'
+DAYS_NEW = 7
+
+# --- Core Mapping (Directory name -> EJS_core name) ---
+CORE_MAP = {
+    'arcade': 'arcade', 'fbneo': 'arcade',
+    'mame': 'mame2003_plus', 'mame2003': 'mame2003_plus',
+    'ATARI2600': 'atari2600',
+    'GAMEBOY': 'gb',
+    'GBA': 'gba',
+    'GENESIS': 'segaMD', 'MEGADRIVE': 'segaMD',
+    'GG': 'segaGG',
+    'JAGUAR': 'jaguar',
+    'N64': 'n64',
+    'NES': 'nes',
+    'PCENGINE': 'pce',
+    'PSX': 'psx',
+    'S32X': 'sega32x',
+    'SMS': 'segaMS',
+    'SNES': 'snes',
+    'VB': 'vb',
+    'WS': 'ws',
+}
+
+
+class MetadataLoader(_BaseLoader):
+    """YAML loader that resolves scalars like `yq` does (YAML 1.2 core schema).
+
+    `hide: yes` stays the string "yes" and `added: 2025-07-29` stays a string,
+    exactly as the old `yq '.'` step returned them.
+    """
+
+
+def _configure_metadata_loader():
+    import re
+    resolvers = [
+        ('tag:yaml.org,2002:bool',
+         re.compile(r'^(?:|true|True|TRUE|false|False|FALSE)$'), 'tTfF'),
+        ('tag:yaml.org,2002:int',
+         re.compile(r'^(?:|0o[0-7]+|[-+]?(?:[0-9]+)|0x[0-9a-fA-F]+)$'), '-+0123456789'),
+        ('tag:yaml.org,2002:float',
+         re.compile(r'^(?:[-+]?(?:\.[0-9]+|[0-9]+(\.[0-9]*)?)(?:[eE][-+]?[0-9]+)?'
+                    r'|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN))$'), '-+0123456789.'),
+        ('tag:yaml.org,2002:null',
+         re.compile(r'^(?:~||null|Null|NULL)$'), ['~', 'n', 'N', '']),
+        ('tag:yaml.org,2002:merge', re.compile(r'^(?:<<)$'), '<'),
+    ]
+    MetadataLoader.yaml_implicit_resolvers = {}
+    for tag, regexp, start_chars in resolvers:
+        for start_char in start_chars:
+            MetadataLoader.yaml_implicit_resolvers.setdefault(start_char, []).append((tag, regexp))
+
+    def parse_unknown_tags(loader, tag_suffix, node):
+        if isinstance(node, yaml.nodes.ScalarNode):
+            return loader.construct_scalar(node)
+        if isinstance(node, yaml.nodes.SequenceNode):
+            return loader.construct_sequence(node, deep=True)
+        return loader.construct_mapping(node, deep=True)
+
+    MetadataLoader.yaml_constructors = dict(MetadataLoader.yaml_constructors)
+    MetadataLoader.yaml_constructors.pop('tag:yaml.org,2002:binary', None)
+    MetadataLoader.yaml_constructors.pop('tag:yaml.org,2002:set', None)
+    MetadataLoader.add_multi_constructor('', parse_unknown_tags)
+
+
+_configure_metadata_loader()
+
+
+def parse_metadata(data):
+    """Parse the bytes of a metadata.yaml file. Returns a dict, or None if the file is unusable."""
+    try:
+        docs = list(yaml.load_all(data, Loader=MetadataLoader))
+    except (yaml.YAMLError, UnicodeDecodeError):
+        return None
+    if len(docs) != 1 or not isinstance(docs[0], dict):
+        return None
+    return docs[0]
+
+
+def _jq_value(value):
+    """Normalize a parsed value the way a trip through JSON and jq would."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return value if abs(value) < 10 ** 17 else float(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return math.copysign(1.7976931348623157e+308, value)
+        if value.is_integer() and abs(value) < 1e17:
+            return int(value)
+        return value
+    if isinstance(value, (datetime, date, dtime)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k) if not isinstance(k, str) else k: _jq_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jq_value(v) for v in value]
+    return str(value)
+
+
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_PRETTY_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def _jq_dumps(value, pretty=False):
+    """Serialize like jq: UTF-8 output, jq number formatting and escaping."""
+    text = (_PRETTY_ENCODER if pretty else _COMPACT_ENCODER).encode(value)
+    return text.replace('\x7f', '\\u007f')
+
+
+def _jq_text(value, default=''):
+    """Render a metadata field like `$(jq -r '.field // default')` did in the shell scripts."""
+    if value is None or value is False:
+        return default
+    value = _jq_value(value)
+    if isinstance(value, str):
+        text = value
+    else:
+        text = _jq_dumps(value, pretty=True)
+    # Command substitution strips trailing newlines
+    return text.rstrip('\n')
+
+
+def report_rom_manifest(manifest):
+    """Warn about the duplicate and moved ROMs recorded in a JSON ROM manifest."""
+    for digest, paths in sorted(find_duplicates(manifest['roms']).items(), key=lambda item: item[1]):
+        print(f"⚠️  Warning: duplicate ROM content ({digest[:12]}): {', '.join(paths)}")
+    for rom in manifest['roms']:
+        if rom.get('moved_from'):
+            print(f"🚚 ROM moved: {rom['moved_from']} -> {rom['path']}")
+
+
+def _manifest_entries(text):
+    """ROM entries of a downloaded or local manifest: JSON (see arcade_core/roms.py) or one entry per line."""
+    manifest = parse_manifest(text)
+    if manifest is not None:
+        report_rom_manifest(manifest)
+        lines = [rom['path'] for rom in manifest['roms']]
+    else:
+        lines = text.splitlines()
+    return [line for line in lines if '/bios/' not in line]
+
+
+def collect_rom_entries(manifest_url=None, manifest_path=None, roms_dir=ROMS_DIR):
+    """Return the sorted list of ROM entries (e.g. "NES/SuperMarioBros.nes")."""
+    if manifest_url:
+        print(f"🌐 Fetching manifest from URL: {manifest_url}")
+        with urllib.request.urlopen(manifest_url, timeout=60) as response:
+            lines = _manifest_entries(response.read().decode('utf-8'))
+    elif manifest_path and os.path.isfile(manifest_path):
+        print(f"📄 Using local manifest file: {manifest_path}")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            lines = _manifest_entries(f.read())
+    else:
+        print(f"🗂️  Scanning roms directory: {roms_dir}")
+        lines = [rom_entry for rom_entry, _ in scan_roms(roms_dir)]
+    return sorted(line for line in lines if line)
+
+
+def current_game_id(predictions):
+    """Return the current week's game ID from the predictions schedule, or None if it cannot be determined."""
+    week = predictions.get(get_current_week_seed())
+    if week and week['game_id']:
+        return week['game_id']
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _added_epoch(added):
+    """Parse an `added` date to a local-time epoch, or None if it is not a date."""
+    for fmt in ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            return time.mktime(datetime.strptime(added, fmt).timetuple())
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_rom_entry(rom_entry):
+    """Split a ROM entry into (system directory, file name, game ID)."""
+    if '/' in rom_entry:
+        rom_subdir = rom_entry.split('/')[0]
+        rom_filename = rom_entry.split('/')[-1]
+    else:
+        # Entries at the manifest root have no system directory
+        rom_subdir = '.'
+        rom_filename = rom_entry
+    game_id = rom_filename.rsplit('.', 1)[0] if '.' in rom_filename else rom_filename
+    return rom_subdir, rom_filename, game_id
+
+
+def _read_bytes(path):
+    """Return the contents of path, or None if it is not a regular file."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+def scan_game_inputs(rom_entry, games_dir=GAMES_DIR):
+    """Read everything a game's entry depends on from disk.
+
+    Returns a dict with the raw metadata.yaml bytes (or None), whether
+    cover.png and save.state exist, the cover's width and the cover variants
+    found next to it. This is what the build cache is keyed on.
+    """
+    game_id = _parse_rom_entry(rom_entry)[2]
+    game_dir = f"{games_dir}/{game_id}/"
+    cover_size = png_size(f"{game_dir}cover.png")
+    return {
+        'metadata': _read_bytes(f"{game_dir}metadata.yaml"),
+        'cover': cover_size is not None or os.path.isfile(f"{game_dir}cover.png"),
+        'cover_width': cover_size[0] if cover_size else None,
+        'cover_variants': existing_variants(game_dir, cover_size[0] if cover_size else None),
+        'save_state': os.path.isfile(f"{game_dir}save.state"),
+    }
+
+
+def compile_game_entry(rom_entry, inputs, use_local_paths=False):
+    """Compile the gamelist entry for one ROM entry from its on-disk inputs.
+
+    The result only depends on the ROM entry and the files of its game
+    directory, so it can be cached. The parts that depend on the current date
+    (predictions and the "new" window) are applied by finalize_game_entry().
+
+    Returns a record dict: {'entry', 'title', 'warnings'}. 'entry' is None when
+    the ROM must be skipped. Missing covers are reported as warnings starting
+    with "WARNING: cover.png".
+    """
+    warnings = []
+    rom_subdir, rom_filename, game_id = _parse_rom_entry(rom_entry)
+
+    # Skip BIOS files
+    if rom_subdir == 'bios':
+        return {'entry': None, 'title': '', 'warnings': warnings}
+
+    if use_local_paths:
+        rom_path = f"/roms/{rom_subdir}/{rom_filename}"
+    else:
+        rom_path = f"{ROM_BASE_URL}/{rom_subdir}/{rom_filename}"
+
+    core = CORE_MAP.get(rom_subdir, '')
+    page_url = f"{LAUNCHER_PAGE}?game={game_id}"
+
+    # --- Determine Title and other metadata ---
+    title = game_id
+    developer = year = genre = recommended = added = ''
+    hide = 'yes'
+    enable_score = 'true'
+    to_start = problem = new_flag = announcement_message = ''
+    controls = None
+
+    if inputs['metadata'] is not None:
+        meta = parse_metadata(inputs['metadata'])
+        if meta is not None:
+            title = _jq_text(meta.get('title'))
+            developer = _jq_text(meta.get('developer'))
+            year = _jq_text(meta.get('year'))
+            genre = _jq_text(meta.get('genre'))
+            recommended = _jq_text(meta.get('recommended'))
+            added = _jq_text(meta.get('added'))
+            hide = _jq_text(meta.get('hide'))
+            enable_score = _jq_text(meta.get('enable_score'), default='true')
+            to_start = _jq_text(meta.get('to_start'))
+            problem = _jq_text(meta.get('problem'))
+            controls = meta.get('controls')
+            controls = _jq_value(controls) if controls is not False else None
+            new_flag = _jq_text(meta.get('new'))
+            announcement_message = _jq_text(meta.get('announcement_message'))
+        else:
+            warnings.append(f"WARNING: invalid metadata.yaml for game: {game_id}")
+
+    # --- Determine Cover Art ---
+    cover_art = f"/{DEFAULT_COVER}"
+    cover_variants_map = {}
+    if inputs['cover']:
+        cover_art = f"/games/{game_id}/cover.png"
+        # WebP/AVIF variants generated by generate_thumbnails.py
+        cover_variants_map = cover_variants(game_id, inputs['cover_variants'])
+    else:
+        warnings.append(f"WARNING: cover.png not found for game: {game_id}")
+
+    # --- Use save state if exists ---
+    save_state = ''
+    if inputs['save_state']:
+        save_state = f"/games/{game_id}/save.state"
+
+    # enable_score was passed to jq with --argjson, so it must be valid JSON
+    try:
+        enable_score_json = _jq_value(json.loads(enable_score))
+    except ValueError:
+        warnings.append(f"WARNING: invalid enable_score for game: {game_id}, skipping")
+        return {'entry': None, 'title': title, 'warnings': warnings}
+
+    entry = {
+        'id': game_id,
+        'title': title or game_id,
+        'problem': problem,
+        'developer': developer,
+        'year': year,
+        'genre': genre,
+        'recommended': recommended,
+        'added': added,
+        'hide': hide,
+        'coverArt': cover_art,
+        'coverVariants': cover_variants_map,
+        'pageUrl': page_url,
+        'core': core or 'null',
+        'romPath': rom_path,
+        'saveState': save_state,
+        'enable_score': enable_score_json,
+        'controls': controls,
+        'to_start': to_start,
+        'new_flag': new_flag,
+        'announcement_message': announcement_message,
+    }
+    return {'entry': entry, 'title': title, 'warnings': warnings}
+
+
+def finalize_game_entry(record, predictions, now):
+    """Apply the date-dependent parts of an entry: prediction overrides and the "new" flag."""
+    entry = dict(record['entry'])
+
+    # Check if game is in predictions (by title, then game ID) and should override hide setting
+    prediction_result = predictions.status(record['title'], entry['id'])
+    if prediction_result.startswith('SHOW_GAME'):
+        entry['hide'] = 'no'
+        if '|' in prediction_result:
+            prediction_date = prediction_result.split('|')[1]
+            if prediction_date:
+                entry['added'] = prediction_date
+
+    # Check if the game should be marked as new by date
+    added = entry['added']
+    is_new_by_date = False
+    if added and added != 'DATE_PLACEHOLDER':
+        added_epoch = _added_epoch(added)
+        if added_epoch is not None and int(now) - int(added_epoch) < DAYS_NEW * 86400:
+            is_new_by_date = True
+    entry['new_flag'] = 'true' if entry['new_flag'] == 'true' or is_new_by_date else ''
+    return entry
+
+
+def build_game_entry(rom_entry, predictions, now=None, use_local_paths=False, games_dir=GAMES_DIR):
+    """Build the final gamelist entry for one ROM entry, without any caching.
+
+    Returns (entry, warnings). entry is None when the ROM must be skipped.
+    """
+    if now is None:
+        now = time.time()
+    record = compile_game_entry(rom_entry, scan_game_inputs(rom_entry, games_dir), use_local_paths)
+    if record['entry'] is None:
+        return None, record['warnings']
+    return finalize_game_entry(record, predictions, now), record['warnings']
+
+
+class BuildCache:
+    """Persistent cache of compiled gamelist entries, one record per ROM entry.
+
+    Records are keyed on a hash of everything compile_game_entry() reads: the
+    ROM entry, the path mode, the metadata.yaml bytes, whether cover.png and
+    save.state exist, the cover's width, the variant files found next to it, and the source of the builder and of
+    the arcade_core modules it calls (so editing this script or arcade_core/ invalidates the cache). Predictions and the "new" window are applied on
+    every build by finalize_game_entry(), so they are not part of the key.
+    """
+
+    FILENAME = 'gamelist-entries.json'
+
+    def __init__(self, cache_dir, full=False):
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.version = self._builder_version()
+        self.records = {}
+        self.hits = 0
+        self.misses = 0
+        if not full:
+            self._load()
+
+    @staticmethod
+    def _builder_version():
+        h = hashlib.sha1()
+        scripts_dir = os.path.dirname(os.path.abspath(__file__))
+        core_dir = os.path.join(scripts_dir, 'arcade_core')
+        sources = [os.path.abspath(__file__)] + sorted(
+            os.path.join(core_dir, name) for name in os.listdir(core_dir) if name.endswith('.py'))
+        for path in sources:
+            h.update(f"{os.path.relpath(path, scripts_dir)}\0".encode('utf-8'))
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == self.version:
+            self.records = data.get('entries', {})
+
+    @staticmethod
+    def key(rom_entry, inputs, use_local_paths):
+        h = hashlib.sha1()
+        h.update(f"{rom_entry}\0{use_local_paths}\0{inputs['cover']}\0{inputs['save_state']}\0".encode('utf-8'))
+        variants = ','.join(f"{width}.{fmt}" for width, fmt in inputs['cover_variants'])
+        h.update(f"{inputs['cover_width']}\0{variants}\0".encode('utf-8'))
+        if inputs['metadata'] is None:
+            h.update(b'no-metadata')
+        else:
+            h.update(b'metadata\0')
+            h.update(inputs['metadata'])
+        return h.hexdigest()
+
+    def get(self, rom_entry, key):
+        cached = self.records.get(rom_entry)
+        if cached is not None and cached.get('key') == key:
+            self.hits += 1
+            return cached['record']
+        self.misses += 1
+        return None
+
+    def save(self, records):
+        """Persist the records of this build, dropping ROMs that are gone."""
+        data = {'version': self.version, 'entries': records}
+        write_file_atomic(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+
+def write_file_atomic(path, text):
+    """Write text to path through a temporary file so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def build_gamelist(rom_entries, predictions, use_local_paths=False, games_dir=GAMES_DIR, cache=None, telemetry=None):
+    """Build the list of game entries. Returns (games, warnings).
+
+    With a BuildCache, only entries whose inputs changed are recompiled; the
+    others are taken from the cache and spliced back in ROM-manifest order.
+    With a Telemetry, the time of every game is recorded as a "game" item, and
+    the time of the recompiled ones as a "compile" item.
+    """
+    now = time.time()
+    games = []
+    warnings = []
+    records = {}
+    for rom_entry in rom_entries:
+        started = time.perf_counter()
+        inputs = scan_game_inputs(rom_entry, games_dir)
+        record = None
+        if cache is not None:
+            key = cache.key(rom_entry, inputs, use_local_paths)
+            record = cache.get(rom_entry, key)
+        if record is None:
+            compile_started = time.perf_counter()
+            record = compile_game_entry(rom_entry, inputs, use_local_paths)
+            if telemetry is not None:
+                telemetry.item('compile', rom_entry, time.perf_counter() - compile_started)
+        if cache is not None:
+            records[rom_entry] = {'key': key, 'record': record}
+        warnings.extend(record['warnings'])
+        if record['entry'] is not None:
+            games.append(finalize_game_entry(record, predictions, now))
+        if telemetry is not None:
+            telemetry.item('game', rom_entry, time.perf_counter() - started)
+    if cache is not None:
+        cache.save(records)
+    return games, warnings
+
+
+def render_gamelist(games):
+    """Render gamelist.json exactly like `jq -n '{games: ...}'` did.
+
+    Entries are flat objects, so they are laid out by hand and only nested
+    values go through the (slow) indenting JSON encoder.
+    """
+    if not games:
+        return '{\n  "games": []\n}\n'
+    rendered = []
+    for game in games:
+        fields = []
+        for key, value in game.items():
+            if isinstance(value, (dict, list)) and value:
+                text = _jq_dumps(value, pretty=True).replace('\n', '\n      ')
+            else:
+                text = _jq_dumps(value)
+            fields.append(f'      {_jq_dumps(key)}: {text}')
+        rendered.append('    {\n' + ',\n'.join(fields) + '\n    }')
+    return '{\n  "games": [\n' + ',\n'.join(rendered) + '\n  ]\n}\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build public/gamelist.json and public/api/current-game')
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help=f'Path of the generated gamelist (default: {OUTPUT_FILE})')
+    parser.add_argument('--current-game-output', default=CURRENT_GAME_FILE,
+                        help=f'Path of the current-game API endpoint (default: {CURRENT_GAME_FILE})')
+    parser.add_argument('--title-index-output', default=TITLE_INDEX_PATH,
+                        help=f'Path of the title -> game ID index (default: {TITLE_INDEX_PATH})')
+    parser.add_argument('--index-output', default=INDEX_PATH,
+                        help=f'Path of the compact list index (default: {INDEX_PATH})')
+    parser.add_argument('--details-dir', default=DETAILS_DIR,
+                        help=f'Directory of the per-game detail files (default: {DETAILS_DIR})')
+    parser.add_argument('--manifest', default=os.getenv('ROMS_MANIFEST_PATH'),
+                        help='Local ROM manifest to use instead of scanning roms/ (default: $ROMS_MANIFEST_PATH)')
+    parser.add_argument('--manifest-url', default=os.getenv('ROMS_MANIFEST_URL'),
+                        help='ROM manifest URL to download instead of scanning roms/ (default: $ROMS_MANIFEST_URL)')
+    parser.add_argument('--local', action='store_true', default=os.getenv('LOCAL_TESTING') == 'true',
+                        help='Use local ROM paths (/roms/...) instead of Google Cloud Storage URLs')
+    parser.add_argument('--cache-dir', default=os.getenv('GAMELIST_CACHE_DIR', CACHE_DIR),
+                        help=f'Directory of the incremental build cache (default: $GAMELIST_CACHE_DIR or {CACHE_DIR})')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore the build cache and recompile every entry')
+    parser.add_argument('--report', default=os.getenv('BUILD_REPORT'),
+                        help='Build report to merge the stage timings into (default: $BUILD_REPORT, none if unset)')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    telemetry = Telemetry('gamelist', args.report)
+    if args.local:
+        print("🔧 Local testing mode enabled - using local ROM paths")
+    else:
+        print("🌐 Production mode - using GitLab URLs")
+
+    print("🔍 Getting current week's game from predictions.yaml...")
+    with telemetry.span('predictions resolve'):
+        if os.path.exists(PREDICTIONS_YAML):
+            try:
+                weeks = write_schedule(PREDICTIONS_YAML, PREDICTIONS_JSON)
+                print(f"📅 Compiled {weeks} predicted weeks into {PREDICTIONS_JSON}")
+            except (OSError, yaml.YAMLError) as e:
+                print(f"⚠️  Warning: Could not compile {PREDICTIONS_YAML}: {e}", file=sys.stderr)
+        predictions = load_schedule(PREDICTIONS_YAML, PREDICTIONS_JSON) or PredictionSchedule(compile_schedule({}))
+
+    print("📋 Collecting ROM entries...")
+    with telemetry.span('manifest scan'):
+        try:
+            rom_entries = collect_rom_entries(args.manifest_url, args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"❌ Failed to read ROM manifest: {e}")
+            sys.exit(1)
+    print(f"📊 Found {len(rom_entries)} ROM files to process")
+
+    cache = BuildCache(args.cache_dir, full=args.full)
+    if args.full:
+        print("🧹 Full build requested - ignoring the build cache")
+    with telemetry.span('metadata parse') as span:
+        games, warnings = build_gamelist(rom_entries, predictions, use_local_paths=args.local, cache=cache,
+                                         telemetry=telemetry)
+        span['args'].update(cached=cache.hits, compiled=cache.misses)
+    print(f"♻️  Reused {cache.hits} cached entries, recompiled {cache.misses}")
+    print(f"✅ JSON array created successfully with {len(games)} games")
+
+    missing_covers = [w for w in warnings if w.startswith('WARNING: cover.png')]
+    for warning in warnings:
+        if warning not in missing_covers:
+            print(f"⚠️  {warning}")
+
+    print("🔍 Checking for missing cover images...")
+    if missing_covers:
+        print("⚠️  Missing cover.png files:")
+        for warning in missing_covers:
+            print(warning)
+    else:
+        print("✅ All games have cover.png files")
+
+    print("🔗 Combining results...")
+    print("📝 Creating final gamelist.json...")
+    current_game = current_game_id(predictions)
+    with telemetry.span('JSON emit'):
+        with telemetry.span('gamelist.json'):
+            gamelist_text = render_gamelist(games)
+            write_file_atomic(args.output, gamelist_text)
+        with telemetry.span('title index'):
+            write_title_index(games, args.title_index_output)
+        print(f"🔤 Wrote title index to {args.title_index_output}")
+
+        print("🗂️  Writing the list index and per-game detail files...")
+        with telemetry.span('list index and details') as span:
+            write_index(games, args.index_output)
+            written, unchanged, removed = write_details(games, args.details_dir)
+            span['args'].update(written=written, unchanged=unchanged, removed=removed)
+        print(f"✅ Wrote {args.index_output} and {args.details_dir}/ "
+              f"({written} written, {unchanged} unchanged, {removed} removed)")
+    print("📉 Download size per page (gamelist.json -> index/detail files, gzipped in parentheses):")
+    with telemetry.span('page size report'):
+        for page, before, after in page_sizes(games, gamelist_text, current_game):
+            saved = 100 * (1 - after[0] / before[0]) if before[0] else 0
+            print(f"   {page}: {before[0]:,} ({before[1]:,}) -> {after[0]:,} ({after[1]:,}) bytes, {saved:.0f}% less")
+
+    print("📝 Creating current-game API endpoint...")
+    if current_game:
+        write_file_atomic(args.current_game_output, f"{current_game}\n")
+        print(f"✅ Created {args.current_game_output} with ID: {current_game}")
+    else:
+        write_file_atomic(args.current_game_output, "no-game\n")
+        print("⚠️  No current game found, created placeholder")
+
+    elapsed = time.time() - start_time
+    print(f"✅ Gamelist generation completed successfully!")
+    print(f"📊 Processed {len(rom_entries)} ROM files in {elapsed:.2f}s")
+    telemetry.count(roms=len(rom_entries), games=len(games), warnings=len(warnings),
+                    cache_hits=cache.hits, cache_misses=cache.misses)
+    if telemetry.save():
+        print(f"⏱️  Recorded the stage timings in {args.report}")
+
+
+if __name__ == '__main__':
+    main()
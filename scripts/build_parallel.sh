@@ -3,6 +3,7 @@
 # Script to generate gamelist.json and thumbnails in parallel
 # This script should be run from the project root.
 # Uses parallel gamelist generation for improved performance (2.9x faster).
+# Extra arguments (e.g. --full) are passed on to scripts/build_gamelist.py.
 
 set -e  # Exit on any error
 
@@ -15,6 +16,16 @@ PURPLE='\033[0;35m'
 CYAN='\033[0;36m'
 NC='\033[0m' # No Color
 
+# Stage timings of every build tool are merged into the build report. Unless the
+# caller set BUILD_REPORT (and prints the report itself), start a fresh
+# build-report.json and print it at the end; BUILD_TRACE=build-trace.json also
+# writes a Chrome trace (see scripts/build_report.py).
+if [ -z "$BUILD_REPORT" ]; then
+    export BUILD_REPORT=build-report.json
+    PRINT_BUILD_REPORT=true
+    rm -f "$BUILD_REPORT"
+fi
+
 # Check if we're being called from another script
 if [ -n "$CALLED_FROM_SCRIPT" ]; then
     echo -e "${CYAN}🚀 Starting parallel build process (called from script)...${NC}"
@@ -42,7 +53,8 @@ trap cleanup SIGINT SIGTERM
 # Start gamelist generation in background (using parallel version)
 echo -e "${BLUE}🔄 Starting parallel gamelist generation...${NC}"
 GAMELIST_START_TIME=$(date +%s)
-bash scripts/generate_gamelist_parallel.sh > /tmp/gamelist_output.log 2>&1 &
+# Unbuffered, so that the progress bar sees each stage as it is printed
+PYTHONUNBUFFERED=1 bash scripts/generate_gamelist_parallel.sh "$@" > /tmp/gamelist_output.log 2>&1 &
 GAMELIST_PID=$!
 
 # Start thumbnail generation in background
@@ -56,6 +68,17 @@ echo -e "${CYAN}   • Gamelist generation PID: $GAMELIST_PID${NC}"
 echo -e "${CYAN}   • Thumbnail generation PID: $THUMBNAILS_PID${NC}"
 echo ""
 
+# Lines build_gamelist.py prints as it reaches each stage, in order; the progress
+# bar shows the last one found in its output
+GAMELIST_STAGE_MARKERS=(
+    "Starting parallel gamelist generation"
+    "Getting current week's game from predictions.yaml"
+    "Collecting ROM entries"
+    "Reused .* cached entries"
+    "Combining results"
+    "Creating current-game API endpoint"
+)
+
 # Function to show real-time progress bar
 show_progress() {
     local gamelist_pid=$1
@@ -63,7 +86,7 @@ show_progress() {
     
     local progress_stage=0
     local progress_bar_width=50
-    local total_stages=6  # Total number of stages we can detect
+    local total_stages=${#GAMELIST_STAGE_MARKERS[@]}
     
     # Wait a moment for processes to start and generate initial output
     sleep 2
@@ -75,24 +98,13 @@ show_progress() {
             # Detect progress stages based on output
             local current_stage=0
             
-            if grep -q "Starting parallel gamelist generation" /tmp/gamelist_output.log; then
-                current_stage=1
-            fi
-            if grep -q "Getting current week's game from predictions.yaml" /tmp/gamelist_output.log; then
-                current_stage=2
-            fi
-            if grep -q "Scanning ROM files\|Collecting ROM entries" /tmp/gamelist_output.log; then
-                current_stage=3
-            fi
-            if grep -q "Starting.*worker processes" /tmp/gamelist_output.log; then
-                current_stage=4
-            fi
-            if grep -q "Waiting for workers to complete" /tmp/gamelist_output.log; then
-                current_stage=5
-            fi
-            if grep -q "Combining results" /tmp/gamelist_output.log; then
-                current_stage=6
-            fi
+            local stage=1
+            for marker in "${GAMELIST_STAGE_MARKERS[@]}"; do
+                if grep -q "$marker" /tmp/gamelist_output.log; then
+                    current_stage=$stage
+                fi
+                stage=$((stage + 1))
+            done
             
             # Update progress if we found a new stage
             if [ $current_stage -gt $progress_stage ]; then
@@ -185,11 +197,27 @@ fi
 
 # Check exit codes
 if [ $GAMELIST_EXIT_CODE -eq 0 ] && [ $THUMBNAILS_EXIT_CODE -eq 0 ]; then
+    # gamelist.json only lists the cover variants that existed when it was built:
+    # refresh it now that the thumbnails are done. Entries whose variants did not
+    # change come from the build cache; the report keeps the first run's timings.
+    echo ""
+    echo -e "${BLUE}🔄 Refreshing gamelist.json with the generated cover variants...${NC}"
+    if ! BUILD_REPORT= bash scripts/generate_gamelist_parallel.sh "$@" > /tmp/gamelist_refresh.log 2>&1; then
+        cat /tmp/gamelist_refresh.log
+        rm -f /tmp/gamelist_refresh.log
+        echo -e "${RED}❌ Gamelist refresh failed!${NC}"
+        exit 1
+    fi
+    rm -f /tmp/gamelist_refresh.log
     echo ""
     echo -e "${GREEN}✅ Parallel build completed successfully!${NC}"
     echo -e "${GREEN}📊 Results:${NC}"
     echo -e "   • ${BLUE}Gamelist generation: ✅ Success${NC}"
     echo -e "   • ${PURPLE}Thumbnail generation: ✅ Success${NC}"
+    if [ "$PRINT_BUILD_REPORT" = "true" ]; then
+        echo ""
+        python3 scripts/build_report.py --report "$BUILD_REPORT"
+    fi
     exit 0
 else
     echo ""
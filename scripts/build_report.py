@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Build Report for BonjourArcade
+
+Prints the build report written by the build tools (see
+arcade_core/telemetry.py): the duration of every tool and of its stages, the
+slowest games and images, and the tools' counters. build_sequential.sh and
+build_parallel.sh run it at the end of a build; with --trace it also writes a
+Chrome trace-event file to open in chrome://tracing or https://ui.perfetto.dev.
+
+Usage:
+    python3 scripts/build_report.py [--report build-report.json] [--trace build-trace.json] [--outliers N]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.telemetry import REPORT_PATH, TRACE_PATH, load_report, report_duration, write_trace
+
+
+def print_report(report, outliers):
+    """Print every tool's stages as an indented tree, then its slowest items."""
+    processes = sorted(report['processes'].items(), key=lambda item: item[1]['started'])
+    for name, process in processes:
+        counters = ', '.join(f"{key}={value}" for key, value in process['counters'].items())
+        print(f"   {name:<36} {process['seconds']:>8.2f}s  {counters}".rstrip())
+        for span in process['spans']:
+            label = '  ' * (span['depth'] + 1) + span['name']
+            share = 100 * span['seconds'] / process['seconds'] if process['seconds'] else 0
+            args = ', '.join(f"{key}={value}" for key, value in span['args'].items())
+            print(f"   {label:<36} {span['seconds']:>8.2f}s {share:>4.0f}%  {args}".rstrip())
+        for stage, stats in process['items'].items():
+            if not stats['count']:
+                continue
+            average = stats['seconds'] / stats['count'] * 1000
+            slowest = ', '.join(f"{item['name']} ({item['seconds'] * 1000:.0f} ms)"
+                                for item in stats['slowest'][:outliers])
+            print(f"   🐢 {stage}: {stats['count']} in {stats['seconds']:.2f}s, {average:.1f} ms average; "
+                  f"slowest: {slowest}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the build report and write its Chrome trace')
+    parser.add_argument('--report', default=os.getenv('BUILD_REPORT', REPORT_PATH),
+                        help=f'Build report to read (default: $BUILD_REPORT or {REPORT_PATH})')
+    parser.add_argument('--trace', nargs='?', const=TRACE_PATH, default=os.getenv('BUILD_TRACE'),
+                        help=f'Also write a Chrome trace-event file (default path: {TRACE_PATH}, or $BUILD_TRACE)')
+    parser.add_argument('--outliers', type=int, default=5, help='Number of slowest items to print per stage (default: 5)')
+    args = parser.parse_args()
+
+    report = load_report(args.report)
+    if report is None:
+        print(f"❌ Error: no build report at {args.report}, run the build with BUILD_REPORT={args.report}")
+        sys.exit(1)
+
+    print(f"⏱️  Build report {args.report}: {report_duration(report):.2f}s wall clock")
+    print_report(report, args.outliers)
+    if args.trace:
+        print(f"✅ Wrote the Chrome trace to {write_trace(report, args.trace)}")
+
+
+if __name__ == '__main__':
+    main()
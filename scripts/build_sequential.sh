@@ -1,8 +1,9 @@
 #!/bin/bash
 
-# Script to generate gamelist.json and thumbnails sequentially
+# Script to generate thumbnails and gamelist.json sequentially
 # This script is designed for GitLab CI where parallel processing can cause issues
 # and we want clear progress reporting.
+# Extra arguments (e.g. --full) are passed on to scripts/build_gamelist.py.
 
 set -e  # Exit on any error
 
@@ -15,26 +16,21 @@ PURPLE='\033[0;35m'
 CYAN='\033[0;36m'
 NC='\033[0m' # No Color
 
-echo -e "${CYAN}🚀 Starting sequential build process for GitLab CI...${NC}"
-echo -e "${CYAN}📋 Generating gamelist.json first, then thumbnails...${NC}"
-
-# Step 1: Generate gamelist.json (sequential with progress)
-echo -e "${BLUE}🔄 Step 1: Generating gamelist.json...${NC}"
-GAMELIST_START_TIME=$(date +%s)
-bash scripts/generate_gamelist_sequential.sh
-GAMELIST_EXIT_CODE=$?
-GAMELIST_END_TIME=$(date +%s)
-GAMELIST_DURATION=$((GAMELIST_END_TIME - GAMELIST_START_TIME))
-
-if [ $GAMELIST_EXIT_CODE -ne 0 ]; then
-    echo -e "${RED}❌ Gamelist generation failed with exit code: $GAMELIST_EXIT_CODE${NC}"
-    exit 1
+# Stage timings of every build tool are merged into the build report. Unless the
+# caller set BUILD_REPORT (and prints the report itself), start a fresh
+# build-report.json and print it at the end; BUILD_TRACE=build-trace.json also
+# writes a Chrome trace (see scripts/build_report.py).
+if [ -z "$BUILD_REPORT" ]; then
+    export BUILD_REPORT=build-report.json
+    PRINT_BUILD_REPORT=true
+    rm -f "$BUILD_REPORT"
 fi
 
-echo -e "${GREEN}✅ Gamelist generation completed in ${GAMELIST_DURATION}s${NC}"
+echo -e "${CYAN}🚀 Starting sequential build process for GitLab CI...${NC}"
+echo -e "${CYAN}📋 Generating thumbnails first, then gamelist.json...${NC}"
 
-# Step 2: Generate thumbnails
-echo -e "${PURPLE}🖼️  Step 2: Generating thumbnails...${NC}"
+# Step 1: Generate thumbnails (gamelist.json lists the cover variants they create)
+echo -e "${PURPLE}🖼️  Step 1: Generating thumbnails...${NC}"
 THUMBNAILS_START_TIME=$(date +%s)
 bash scripts/generate_thumbnails.sh
 THUMBNAILS_EXIT_CODE=$?
@@ -48,11 +44,31 @@ fi
 
 echo -e "${GREEN}✅ Thumbnail generation completed in ${THUMBNAILS_DURATION}s${NC}"
 
+# Step 2: Generate gamelist.json (sequential with progress)
+echo -e "${BLUE}🔄 Step 2: Generating gamelist.json...${NC}"
+GAMELIST_START_TIME=$(date +%s)
+bash scripts/generate_gamelist_sequential.sh "$@"
+GAMELIST_EXIT_CODE=$?
+GAMELIST_END_TIME=$(date +%s)
+GAMELIST_DURATION=$((GAMELIST_END_TIME - GAMELIST_START_TIME))
+
+if [ $GAMELIST_EXIT_CODE -ne 0 ]; then
+    echo -e "${RED}❌ Gamelist generation failed with exit code: $GAMELIST_EXIT_CODE${NC}"
+    exit 1
+fi
+
+echo -e "${GREEN}✅ Gamelist generation completed in ${GAMELIST_DURATION}s${NC}"
+
 # Final success message
 echo ""
 echo -e "${GREEN}✅ Sequential build completed successfully!${NC}"
 echo -e "${GREEN}📊 Results:${NC}"
-echo -e "   • ${BLUE}Gamelist generation: ✅ Success (${GAMELIST_DURATION}s)${NC}"
 echo -e "   • ${PURPLE}Thumbnail generation: ✅ Success (${THUMBNAILS_DURATION}s)${NC}"
+echo -e "   • ${BLUE}Gamelist generation: ✅ Success (${GAMELIST_DURATION}s)${NC}"
 echo -e "   • ${CYAN}Total time: $((GAMELIST_DURATION + THUMBNAILS_DURATION))s${NC}"
 
+if [ "$PRINT_BUILD_REPORT" = "true" ]; then
+    echo ""
+    python3 scripts/build_report.py --report "$BUILD_REPORT"
+fi
+
@@ -2,138 +2,119 @@
 """
 Helper script to check if a game is in predictions.yaml and determine its status.
 This script is used by the generate_gamelist scripts to override hide settings for prediction games.
+
+The schedule comes from arcade_core's shared Predictions object: the compiled
+predictions.json (or predictions.yaml when it is newer), loaded once per process
+and indexed by title and by game_id, so any number of games can be checked
+without re-reading the file.
+
+Usage:
+    # Single game (title or game_id)
+    python3 check_predictions_status.py "Pitfall II"
+
+    # Batch: one title or game_id per line on stdin, or a JSON list
+    printf 'Pitfall II\\nhero\\n' | python3 check_predictions_status.py --batch
+    echo '["pitfall2", "Metal Slug 3"]' | python3 check_predictions_status.py --batch --json
+
+Output:
+    SHOW_GAME|<YYYY-MM-DD>   the game's week is the current week or in the past
+    HIDE_GAME                the game's week is in the future
+    NOT_IN_PREDICTIONS       the game is not in predictions.yaml
+In batch mode each line is "<query>\\t<status>"; with --json a list of objects
+is printed instead.
 """
 
-import sys
+import argparse
+import json
 import os
-import yaml
-from datetime import datetime, timedelta
+import sys
 
-def get_current_week_seed():
-    """Get the current week's seed in YYYYWW format."""
-    now = datetime.now()
-    week = now.isocalendar()[1]
-    return f"{now.year}{week:02d}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def seed_to_date(seed):
-    """Convert a seed (YYYYWW format) to the corresponding Monday date."""
-    try:
-        year = int(str(seed)[:4])
-        week = int(str(seed)[4:])
-        
-        # Get the first day of the year
-        jan1 = datetime(year, 1, 1)
-        
-        # Find the first Monday of the year
-        while jan1.weekday() != 0:  # 0 = Monday
-            jan1 += timedelta(days=1)
-        
-        # Add weeks to get to the target week
-        target_date = jan1 + timedelta(weeks=week-1)
-        
-        return target_date.strftime("%Y-%m-%d")
-        
-    except Exception as e:
-        print(f"Error: Could not convert seed {seed} to date: {e}", file=sys.stderr)
-        return None
+from arcade_core import get_predictions
+# The week helpers live in arcade_core.predictions; they are re-exported here for existing callers
+from arcade_core.predictions import (
+    PREDICTIONS_JSON,
+    PREDICTIONS_YAML,
+    check_week_status,
+    get_current_week_seed,
+    seed_to_date,
+)
 
 def is_game_in_predictions(game_title):
-    """Check if a game title exists in predictions.yaml and return its status."""
-    try:
-        # Read the predictions.yaml file
-        predictions_path = 'public/plinko/predict/predictions.yaml'
-        if not os.path.exists(predictions_path):
-            return None
-            
-        with open(predictions_path, 'r') as f:
-            predictions = yaml.safe_load(f)
-        
-        if not predictions:
-            return None
-        
-        # Look for the game title in predictions
-        for seed, title in predictions.items():
-            if title == game_title:
-                return {
-                    'seed': seed,
-                    'title': title,
-                    'is_current_week': False,
-                    'is_past_week': False
-                }
-        
-        return None
-        
-    except Exception as e:
-        print(f"Error: Could not read predictions.yaml: {e}", file=sys.stderr)
+    """Check if a game title (or game_id) exists in predictions.yaml and return its status."""
+    week = get_predictions().find(game_title)
+    if week is None:
         return None
+    return {
+        'seed': week['seed'],
+        'title': week['title'],
+        'game_id': week['game_id'],
+        'week_status': week['status'],
+        'is_current_week': week['status'] == 'current',
+        'is_past_week': week['status'] == 'past',
+    }
 
-def check_week_status(seed):
-    """Check if a seed represents a current or past week."""
-    try:
-        # Parse the seed (YYYYWW format)
-        year = int(str(seed)[:4])
-        week = int(str(seed)[4:])
-        
-        # Get current week
-        now = datetime.now()
-        current_year = now.year
-        current_week = now.isocalendar()[1]
-        
-        # Convert to comparable values
-        seed_value = year * 100 + week
-        current_value = current_year * 100 + current_week
-        
-        if seed_value == current_value:
-            return 'current'
-        elif seed_value < current_value:
-            return 'past'
-        else:
-            return 'future'
-            
-    except Exception as e:
-        print(f"Error: Could not parse seed {seed}: {e}", file=sys.stderr)
-        return 'unknown'
+def read_batch_queries(stream):
+    """Read batch queries: a JSON list of strings, or one title/game_id per line."""
+    data = stream.read()
+    if data.lstrip().startswith('['):
+        queries = json.loads(data)
+        if not isinstance(queries, list):
+            raise ValueError("JSON input must be a list of titles or game_ids")
+        return [str(query) for query in queries]
+    return [line for line in data.splitlines() if line.strip()]
+
+def check_batch(queries, predictions):
+    """Return the status of every query as a list of dicts."""
+    results = []
+    for query in queries:
+        status = predictions.status(query)
+        week = predictions.find(query)
+        state, _, prediction_date = status.partition('|')
+        results.append({
+            'query': query,
+            'status': state,
+            'date': prediction_date or None,
+            'seed': week['seed'] if week else None,
+        })
+    return results
 
 def main():
     """Main function to check game prediction status."""
-    if len(sys.argv) != 2:
+    parser = argparse.ArgumentParser(description='Check if games are in predictions.yaml and whether they should be shown')
+    parser.add_argument('game_title', nargs='?', help='Game title or game_id to check')
+    parser.add_argument('--batch', action='store_true',
+                        help='Read titles/game_ids from stdin (one per line, or a JSON list)')
+    parser.add_argument('--json', action='store_true', help='Print batch results as JSON')
+    parser.add_argument('--predictions', default=PREDICTIONS_YAML, help='Path to predictions.yaml')
+    parser.add_argument('--compiled', default=PREDICTIONS_JSON,
+                        help='Path to the compiled predictions.json (used unless predictions.yaml is newer)')
+    args = parser.parse_args()
+
+    if args.batch == bool(args.game_title):
         print("Usage: python3 check_predictions_status.py <game_title>", file=sys.stderr)
+        print("       python3 check_predictions_status.py --batch [--json] < titles.txt", file=sys.stderr)
         sys.exit(1)
-    
-    game_title = sys.argv[1]
-    
+
     try:
-        # Check if game is in predictions
-        prediction_info = is_game_in_predictions(game_title)
-        
-        if prediction_info is None:
-            # Game not in predictions
-            print("NOT_IN_PREDICTIONS")
+        predictions = get_predictions(args.predictions, args.compiled)
+
+        if args.batch:
+            results = check_batch(read_batch_queries(sys.stdin), predictions)
+            if args.json:
+                print(json.dumps(results, indent=2, ensure_ascii=False))
+            else:
+                for result in results:
+                    status = result['status']
+                    if result['date']:
+                        status = f"{status}|{result['date']}"
+                    print(f"{result['query']}\t{status}")
             sys.exit(0)
-        
-        # Check week status
-        week_status = check_week_status(prediction_info['seed'])
-        prediction_info['week_status'] = week_status
-        
-        if week_status == 'current':
-            prediction_info['is_current_week'] = True
-            prediction_info['is_past_week'] = False
-        elif week_status == 'past':
-            prediction_info['is_current_week'] = False
-            prediction_info['is_past_week'] = True
-        else:
-            prediction_info['is_current_week'] = False
-            prediction_info['is_past_week'] = False
-        
-        # Get the date corresponding to the prediction week
-        prediction_date = seed_to_date(prediction_info['seed'])
-        
+
         # Output result as JSON-like format for shell script parsing
-        if prediction_info['is_current_week'] or prediction_info['is_past_week']:
-            print(f"SHOW_GAME|{prediction_date}")
-        else:
-            print("HIDE_GAME")
-            
+        print(predictions.status(args.game_title))
+
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Artifact Compressor for BonjourArcade
+
+Post-build stage, run after build_gamelist.py (and the other generators): writes
+the gzip and brotli variants of every generated JSON and text artifact of
+public/, the content-hashed copies of the heavy gamelist files, and the pointer
+manifest public/artifact-manifest.json (see arcade_core/artifacts.py), then
+prints the compression ratio and time of each kind of artifact.
+
+brotli variants need the brotli module (pip install brotli); without it only
+the gzip variants are written.
+
+With --report (or BUILD_REPORT), the stage timings and the slowest files are
+merged into the build report under "compress" (see arcade_core/telemetry.py).
+
+Usage:
+    python3 scripts/compress_artifacts.py [--public-dir public] [--force] [--jobs N] [--report build-report.json]
+"""
+
+import argparse
+import os
+import sys
+import time
+from fnmatch import fnmatch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.artifacts import (
+    ARTIFACTS,
+    HASHED_ARTIFACTS,
+    PUBLIC_DIR,
+    brotli,
+    collect_artifacts,
+    compress_all,
+    write_hashed_copy,
+    write_manifest,
+)
+from arcade_core.telemetry import Telemetry
+
+
+def _ratio(compressed, size):
+    return f"{100 * compressed / size:5.1f}%" if size else "    -"
+
+
+def print_report(results, public_dir):
+    """Print the sizes, ratios and time of the variants, one line per artifact pattern."""
+    groups = {}
+    for result in results:
+        name = os.path.relpath(result.path, public_dir)
+        group = next((pattern for pattern in ARTIFACTS if fnmatch(name, pattern)), name)
+        groups.setdefault(group, []).append(result)
+
+    print(f"   {'artifact':<32} {'files':>5} {'bytes':>11} {'gzip':>17} {'brotli':>17} {'time':>8}")
+    totals = [0, 0, 0, 0, 0.0]
+    for group, members in groups.items():
+        size = sum(result.size for result in members)
+        # A file without a variant is served as is
+        gzip_size = sum(result.gzip_size or result.size for result in members)
+        brotli_size = sum(result.brotli_size or result.size for result in members)
+        seconds = sum(result.seconds for result in members)
+        for i, value in enumerate((len(members), size, gzip_size, brotli_size, seconds)):
+            totals[i] += value
+        print(f"   {group:<32} {len(members):>5} {size:>11,} {gzip_size:>10,} {_ratio(gzip_size, size)} "
+              f"{brotli_size:>10,} {_ratio(brotli_size, size)} {seconds:>7.2f}s")
+    count, size, gzip_size, brotli_size, seconds = totals
+    print(f"   {'total':<32} {count:>5} {size:>11,} {gzip_size:>10,} {_ratio(gzip_size, size)} "
+          f"{brotli_size:>10,} {_ratio(brotli_size, size)} {seconds:>7.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write gzip/brotli variants and content-hashed copies of the generated artifacts')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR, help=f'Directory of the built site (default: {PUBLIC_DIR})')
+    parser.add_argument('--force', action='store_true', help='Recompress every artifact, even when its variants are up to date')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of files compressed concurrently (default: number of CPUs)')
+    parser.add_argument('--report', default=os.getenv('BUILD_REPORT'),
+                        help='Build report to merge the stage timings into (default: $BUILD_REPORT, none if unset)')
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    telemetry = Telemetry('compress', args.report)
+    if brotli is None:
+        print("⚠️  Warning: brotli module not installed, writing gzip variants only (pip install brotli)")
+
+    paths = collect_artifacts(args.public_dir)
+    if not paths:
+        print(f"❌ Error: no artifacts found in {args.public_dir}/, run build_gamelist.py first")
+        sys.exit(1)
+
+    print(f"🗜️  Compressing {len(paths)} artifacts...")
+    with telemetry.span('compress', jobs=args.jobs):
+        results = compress_all(paths, force=args.force, max_workers=args.jobs)
+    reused = sum(1 for result in results if result.reused)
+    for result in results:
+        if not result.reused:
+            telemetry.item('artifact', os.path.relpath(result.path, args.public_dir), result.seconds)
+    print_report(results, args.public_dir)
+    print(f"♻️  Reused the variants of {reused} unchanged artifacts, compressed {len(results) - reused}")
+
+    print("🔖 Writing content-hashed copies...")
+    files = {}
+    with telemetry.span('hashed copies'):
+        for name in HASHED_ARTIFACTS:
+            path = os.path.join(args.public_dir, name)
+            if not os.path.isfile(path):
+                print(f"⚠️  Warning: {path} not found, no hashed copy")
+                continue
+            files[name] = write_hashed_copy(path)
+            print(f"   {name} -> {files[name]['path']}")
+        manifest_path = write_manifest(files, args.public_dir)
+    print(f"✅ Wrote {manifest_path}")
+    print(f"✅ Compression completed in {time.perf_counter() - start_time:.2f}s")
+    telemetry.count(artifacts=len(results), compressed=len(results) - reused, reused=reused)
+    if telemetry.save():
+        print(f"⏱️  Recorded the stage timings in {args.report}")
+
+
+if __name__ == '__main__':
+    main()
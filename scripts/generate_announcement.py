@@ -11,36 +11,110 @@ Requirements:
 - Or Anthropic API key (set ANTHROPIC_API_KEY environment variable)
 - requests library: pip install requests
 
+Answers are cached on disk (.cache/announcements), keyed by a hash of the
+request, so re-running with the same prompt (or retrying an announcement that is
+too long) does not call the AI service again.
+
+With --batch, every scheduled game of the current and upcoming weeks (or of
+--weeks) that has no announcement_message gets one, without any prompt: the
+requests are sent concurrently (--concurrency) and the metadata.yaml files are
+written in one pass once every announcement is generated.
+
 Usage:
     python generate_announcement.py [--week-seed YYYYWW] [--ai-service openai|claude] [--update-metadata] [--dry-run]
+    python generate_announcement.py --batch [--weeks 202540..202552] [--concurrency N] [--update-metadata] [--dry-run]
 
 Options:
     --week-seed         Specific week seed (YYYYWW format) to use instead of current week
     --ai-service        AI service to use: 'openai' or 'claude' (default: openai)
     --update-metadata   Automatically update the metadata.yaml file with the generated announcement
     --dry-run           Show what would be generated without actually updating files
+    --batch             Generate the missing announcements of every selected week, non-interactively
+    --weeks             Weeks for --batch (default: current and upcoming weeks)
+    --concurrency       Concurrent AI requests with --batch (default: 4)
+    --sentence-retries  Times a too long announcement is asked again before truncating it (default: 1)
+    --cache-dir         Cache of AI answers (default: .cache/announcements)
+    --no-cache          Always call the AI service
 """
 
-import json
 import requests
 import argparse
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
 import yaml
 import re
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core import get_catalog, get_game_metadata, get_predictions
+from arcade_core.metadata_edit import edit_metadata, set_field
+from arcade_core.predictions import PREDICTIONS_YAML
+from arcade_core.prompt_cache import CACHE_DIR, PromptCache
 
 # Configuration
 DEFAULT_AI_SERVICE = 'openai'
 MAX_SENTENCES = 3  # Maximum sentences for announcement messages
+SENTENCE_RETRIES = 1  # Times an announcement that is too long is asked again before truncating it
+MAX_CONCURRENCY = 4  # Concurrent AI requests in batch mode
+REQUEST_TIMEOUT = 30
 OPENAI_API_URL = 'https://api.openai.com/v1/chat/completions'
 ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages'
 
+
+def split_sentences(announcement):
+    """Split an announcement into its sentences, without breaking acronyms (H.E.R.O.) and abbreviations (Dr.)."""
+    # First, normalize the text to handle common abbreviation patterns
+    normalized_text = announcement
+    
+    # Handle common abbreviation patterns (H.E.R.O., U.S.A., etc.)
+    # Replace periods in acronyms with a temporary marker
+    normalized_text = re.sub(r'\b([A-Z]\.){2,}', lambda m: m.group(0).replace('.', '§'), normalized_text)
+    
+    # Handle other common abbreviations (Mr., Dr., etc.)
+    normalized_text = re.sub(r'\b([A-Z][a-z]\.)', lambda m: m.group(0).replace('.', '§'), normalized_text)
+    
+    # Now split by periods to get sentences
+    raw_parts = normalized_text.split('.')
+    sentences = []
+    
+    for part in raw_parts:
+        part = part.strip()
+        if not part:
+            continue
+        
+        # Restore periods in abbreviations
+        part = part.replace('§', '.')
+        
+        # Check if this looks like a complete sentence
+        if len(part) > 10 and not part.isupper():  # Must be substantial and not just an acronym
+            sentences.append(part)
+        elif len(part) <= 10 and part.isupper():
+            # This is likely an acronym, skip it as a separate sentence
+            continue
+        elif len(part) > 10:
+            # This might be a sentence, include it
+            sentences.append(part)
+    
+    return sentences
+
+
 class AnnouncementGenerator:
-    def __init__(self, ai_service='openai', dry_run=False):
+    def __init__(self, ai_service='openai', dry_run=False, cache_dir=CACHE_DIR, use_cache=True,
+                 sentence_retries=SENTENCE_RETRIES, concurrency=MAX_CONCURRENCY):
         self.ai_service = ai_service.lower()
         self.dry_run = dry_run
+        # Answers are cached on disk by request hash: re-runs only pay for new prompts
+        self.cache = PromptCache(cache_dir, enabled=use_cache)
+        self.sentence_retries = max(0, sentence_retries)
+        self.concurrency = max(1, concurrency)
+        # One pooled keep-alive session for every concurrent request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount('https://', adapter)
         
         # In dry-run mode, we don't need API keys
         if self.dry_run:
@@ -68,34 +142,28 @@ class AnnouncementGenerator:
         return f"{now.year}{week:02d}"
 
     def get_game_from_seed(self, seed):
-        """Get the game title that would be selected for a given seed using the predictions.yaml file."""
+        """Get the game title that would be selected for a given seed using the predictions schedule."""
         try:
-            predictions_path = 'public/plinko/predict/predictions.yaml'
-            if not os.path.exists(predictions_path):
-                print(f"❌ Error: predictions.yaml not found at {predictions_path}")
+            predictions = get_predictions()
+            if predictions.schedule is None:
+                print(f"❌ Error: predictions.yaml not found at {PREDICTIONS_YAML}")
                 sys.exit(1)
-                
-            with open(predictions_path, 'r') as f:
-                predictions = yaml.safe_load(f)
-            
-            if not predictions:
+
+            if not predictions.available():
                 print(f"❌ Error: predictions.yaml is empty or invalid")
                 sys.exit(1)
-            
+
             # Look up the game title for this seed
-            try:
-                seed_int = int(seed)
-                game_title = predictions.get(seed_int)
-            except ValueError:
-                game_title = predictions.get(seed)
-            
+            week = predictions.game_for_seed(seed)
+            game_title = week['title'] if week else None
+
             if not game_title:
                 print(f"❌ Error: No prediction found for seed {seed}")
                 sys.exit(1)
-            
+
             print(f"🎯 For seed {seed}, predicted game: {game_title}")
             return game_title
-            
+
         except Exception as e:
             print(f"❌ Error: Could not determine game for seed {seed}: {e}")
             sys.exit(1)
@@ -103,53 +171,36 @@ class AnnouncementGenerator:
     def find_game_id_by_title(self, game_title):
         """Find a game ID in the gamelist that matches the given title."""
         try:
-            gamelist_path = 'public/gamelist.json'
-            if not os.path.exists(gamelist_path):
-                print(f"❌ Error: gamelist.json not found at {gamelist_path}")
+            catalog = get_catalog()
+            if not catalog.exists():
+                print(f"❌ Error: gamelist.json not found at {catalog.path}")
                 sys.exit(1)
-                
-            with open(gamelist_path, 'r') as f:
-                gamelist = json.load(f)
-            
-            # Search through all games for a title match
-            all_games = []
-            if gamelist.get('gameOfTheWeek') and gamelist['gameOfTheWeek'].get('id'):
-                all_games.append(gamelist['gameOfTheWeek'])
-            if gamelist.get('previousGames'):
-                all_games.extend(gamelist['previousGames'])
-            
-            # Try exact match first
-            for game in all_games:
-                if game.get('title') == game_title:
-                    return game.get('id')
-            
-            # Try case-insensitive match
-            for game in all_games:
-                if game.get('title', '').lower() == game_title.lower():
-                    return game.get('id')
-            
-            # Try partial match
-            for game in all_games:
-                game_title_lower = game.get('title', '').lower()
-                search_title_lower = game_title.lower()
-                if search_title_lower in game_title_lower or game_title_lower in search_title_lower:
-                    print(f"🔍 Found partial match: '{game.get('title')}' for '{game_title}'")
-                    return game.get('id')
-            
+
+            # Exact title first, then casefolded, normalized and partial (token) matches
+            match = catalog.resolve_title(game_title)
+            if match.ambiguous and match.game_id is None:
+                print(f"❌ Error: Ambiguous partial match for '{game_title}': {', '.join(match.candidates)}")
+                sys.exit(1)
+            if match.game_id is not None:
+                if match.ambiguous:
+                    print(f"⚠️  Warning: Several games are titled '{game_title}' ({', '.join(match.candidates)}), using {match.game_id}")
+                if match.tier != 'exact':
+                    print(f"🔍 Found {match.tier} match: '{catalog.get(match.game_id).get('title')}' for '{game_title}'")
+                return match.game_id
+
             print(f"❌ Error: No game found with title: {game_title}")
             sys.exit(1)
-            
+
         except Exception as e:
             print(f"❌ Error: Error searching for game title: {e}")
             sys.exit(1)
 
     def read_game_metadata(self, game_id):
         """Read metadata from public/games/{gameid}/metadata.yaml."""
-        meta_path = f'public/games/{game_id}/metadata.yaml'
+        metadata = get_game_metadata()
+        meta_path = metadata.path(game_id)
         try:
-            with open(meta_path, 'r') as f:
-                meta = yaml.safe_load(f)
-            return meta
+            return metadata.get(game_id)
         except FileNotFoundError:
             print(f"❌ Error: Could not find metadata file for game {game_id}: {meta_path}")
             sys.exit(1)
@@ -195,35 +246,44 @@ Génère maintenant l'annonce pour {game_title} :"""
 
         return prompt
 
-    def call_openai_api(self, prompt):
+    def build_request(self, prompt):
+        """The JSON body sent to the selected AI service for a prompt (also what the response cache is keyed on)."""
+        if self.ai_service == 'openai':
+            return {
+                'model': 'gpt-4o-mini',  # Use GPT-4o-mini for cost efficiency
+                'messages': [
+                    {'role': 'system', 'content': 'Tu es un expert en jeux vidéo rétro qui écrit des annonces en français.'},
+                    {'role': 'user', 'content': prompt}
+                ],
+                'max_tokens': 300,  # Increased to allow longer announcements
+                'temperature': 0.8
+            }
+        return {
+            'model': 'claude-3-haiku-20240307',  # Use Haiku for cost efficiency
+            'max_tokens': 300,  # Increased to allow longer announcements
+            'messages': [
+                {'role': 'user', 'content': prompt}
+            ]
+        }
+
+    def clean_response(self, announcement):
+        """Clean up the response (remove quotes, extra formatting)."""
+        announcement = re.sub(r'^["\']|["\']$', '', announcement.strip())
+        return re.sub(r'\n+', ' ', announcement)
+
+    def call_openai_api(self, data):
         """Call OpenAI API to generate the announcement."""
         headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
         
-        data = {
-            'model': 'gpt-4o-mini',  # Use GPT-4o-mini for cost efficiency
-            'messages': [
-                {'role': 'system', 'content': 'Tu es un expert en jeux vidéo rétro qui écrit des annonces en français.'},
-                {'role': 'user', 'content': prompt}
-            ],
-            'max_tokens': 300,  # Increased to allow longer announcements
-            'temperature': 0.8
-        }
-        
         try:
-            response = requests.post(OPENAI_API_URL, headers=headers, json=data, timeout=30)
+            response = self.session.post(OPENAI_API_URL, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             result = response.json()
-            announcement = result['choices'][0]['message']['content'].strip()
-            
-            # Clean up the response (remove quotes, extra formatting)
-            announcement = re.sub(r'^["\']|["\']$', '', announcement)
-            announcement = re.sub(r'\n+', ' ', announcement)
-            
-            return announcement
+            return self.clean_response(result['choices'][0]['message']['content'])
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error calling OpenAI API: {e}")
@@ -234,7 +294,7 @@ Génère maintenant l'annonce pour {game_title} :"""
             print(f"❌ Error processing OpenAI response: {e}")
             return None
 
-    def call_claude_api(self, prompt):
+    def call_claude_api(self, data):
         """Call Anthropic Claude API to generate the announcement."""
         headers = {
             'x-api-key': self.api_key,
@@ -242,26 +302,12 @@ Génère maintenant l'annonce pour {game_title} :"""
             'anthropic-version': '2023-06-01'
         }
         
-        data = {
-            'model': 'claude-3-haiku-20240307',  # Use Haiku for cost efficiency
-            'max_tokens': 300,  # Increased to allow longer announcements
-            'messages': [
-                {'role': 'user', 'content': prompt}
-            ]
-        }
-        
         try:
-            response = requests.post(ANTHROPIC_API_URL, headers=headers, json=data, timeout=30)
+            response = self.session.post(ANTHROPIC_API_URL, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             result = response.json()
-            announcement = result['content'][0]['text'].strip()
-            
-            # Clean up the response
-            announcement = re.sub(r'^["\']|["\']$', '', announcement)
-            announcement = re.sub(r'\n+', ' ', announcement)
-            
-            return announcement
+            return self.clean_response(result['content'][0]['text'])
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error calling Claude API: {e}")
@@ -273,58 +319,183 @@ Génère maintenant l'annonce pour {game_title} :"""
             return None
 
     def generate_announcement(self, prompt):
-        """Generate announcement using the selected AI service."""
+        """Generate announcement using the selected AI service, answering from the response cache when the prompt was already sent."""
+        data = self.build_request(prompt)
+        key = self.cache.key(self.ai_service, data)
+        announcement = self.cache.get(key)
+        if announcement is not None:
+            return announcement
         if self.ai_service == 'openai':
-            return self.call_openai_api(prompt)
+            announcement = self.call_openai_api(data)
         elif self.ai_service == 'claude':
-            return self.call_claude_api(prompt)
+            announcement = self.call_claude_api(data)
         else:
             print(f"❌ Error: Unsupported AI service: {self.ai_service}")
             return None
+        if announcement:
+            self.cache.put(key, announcement, self.ai_service)
+        return announcement
+
+    def write_announcement(self, game_title, meta):
+        """Generate an announcement of at most MAX_SENTENCES sentences.
+
+        An answer that is too long is asked again once per sentence retry, with a
+        reminder of the limit, then truncated. Every answer goes through the
+        response cache, so a re-run only pays for prompts never answered before.
+        Returns (announcement, sentence_count), or (None, 0) on failure.
+        """
+        prompt = self.generate_ai_prompt(game_title, meta)
+        attempt_prompt = prompt
+        for attempt in range(self.sentence_retries + 1):
+            announcement = self.generate_announcement(attempt_prompt)
+            if not announcement:
+                return None, 0
+            sentences = split_sentences(announcement)
+            if len(sentences) <= MAX_SENTENCES:
+                return announcement, len(sentences)
+            attempt_prompt = (f"{prompt}\n\nIMPORTANT : ta réponse précédente comptait {len(sentences)} phrases. "
+                              f"Écris l'annonce en {MAX_SENTENCES} phrases maximum.")
+        print(f"⚠️  Warning: Generated announcement for {game_title} has {len(sentences)} sentences (max {MAX_SENTENCES})")
+        print("Truncating to fit...")
+        # Keep only the first MAX_SENTENCES sentences
+        announcement = '. '.join(sentences[:MAX_SENTENCES]) + '.'
+        print(f"✅ Truncated to {MAX_SENTENCES} sentences")
+        return announcement, len(sentences)
 
     def update_metadata_file(self, game_id, announcement):
         """Update the metadata.yaml file with the new announcement, preserving comments and exact values."""
-        meta_path = f'public/games/{game_id}/metadata.yaml'
-        
+        return self.update_metadata_files({game_id: announcement}) == 1
+
+    def update_metadata_files(self, announcements):
+        """Write every generated announcement ({game_id: text}) to its metadata.yaml, in one pass. Returns the number written.
+
+        Only the announcement_message line is rewritten (see arcade_core/metadata_edit.py):
+        comments, key order and the other values are kept as they are.
+        """
+        changes = edit_metadata({
+            game_id: [set_field('announcement_message', announcement)]
+            for game_id, announcement in announcements.items()
+        })
+        written = 0
+        for change in changes:
+            if change.error:
+                print(f"❌ Error updating {change.path}: {change.error}")
+                continue
+            written += 1
+            if change.changed:
+                print(f"✅ Updated {change.path} with new announcement message (preserved comments and formatting)")
+            else:
+                print(f"ℹ️  {change.path} already has this announcement message")
+        return written
+
+    def find_missing_announcements(self, seeds):
+        """The scheduled games of these seeds whose metadata has no announcement_message.
+
+        Returns [(seed, game_id, game_title, meta)], one per game (its first week);
+        weeks whose game or metadata cannot be found are skipped with a warning.
+        """
+        schedule = get_predictions().schedule
+        catalog = get_catalog()
+        metadata = get_game_metadata()
+        missing = []
+        seen = set()
+        for seed in seeds:
+            week = schedule.get(seed) if schedule is not None else None
+            if not week or not week['title']:
+                print(f"⚠️  Warning: No prediction found for seed {seed}, skipping")
+                continue
+            game_id = week['game_id']
+            if not game_id and catalog.exists():
+                match = catalog.resolve_title(week['title'])
+                game_id = match.game_id
+            if not game_id:
+                print(f"⚠️  Warning: No game found with title: {week['title']} (seed {seed}), skipping")
+                continue
+            if game_id in seen:
+                continue
+            seen.add(game_id)
+            try:
+                meta = metadata.get(game_id)
+            except (FileNotFoundError, yaml.YAMLError) as e:
+                print(f"⚠️  Warning: Could not read metadata of {game_id} (seed {seed}): {e}, skipping")
+                continue
+            if str(meta.get('announcement_message') or '').strip():
+                continue
+            missing.append((seed, game_id, week['title'], meta))
+        return missing
+
+    def run_batch(self, weeks=None, update_metadata=False):
+        """Generate the announcements of every scheduled game that lacks one, without any prompt.
+
+        weeks selects the seeds ("202540..202552", see PredictionSchedule.select());
+        by default, the current and upcoming weeks. The AI requests are sent
+        concurrently (at most self.concurrency at once) and answered from the
+        response cache when possible; the metadata files are only written once
+        every announcement has been generated.
+        """
+        print('🤖 Starting batch announcement generation...')
+        schedule = get_predictions().schedule
+        if schedule is None:
+            print(f"❌ Error: predictions.yaml not found at {PREDICTIONS_YAML}")
+            sys.exit(1)
         try:
-            # Read the file line by line to preserve comments and formatting
-            with open(meta_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Find and update the announcement_message line
-            updated = False
-            for i, line in enumerate(lines):
-                if line.strip().startswith('announcement_message:'):
-                    # Preserve the exact indentation
-                    indent = len(line) - len(line.lstrip())
-                    lines[i] = ' ' * indent + f'announcement_message: "{announcement}"\n'
-                    updated = True
-                    break
-            
-            # If no existing announcement_message line found, add it at the end
-            if not updated:
-                # Find the last non-empty line to add the announcement
-                last_line_index = len(lines) - 1
-                while last_line_index >= 0 and not lines[last_line_index].strip():
-                    last_line_index -= 1
-                
-                # Add a newline if the last line doesn't end with one
-                if last_line_index >= 0 and not lines[last_line_index].endswith('\n'):
-                    lines[last_line_index] += '\n'
-                
-                # Add the announcement message
-                lines.append(f'announcement_message: "{announcement}"\n')
-            
-            # Write back to file, preserving all original content
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            
-            print(f"✅ Updated {meta_path} with new announcement message (preserved comments and formatting)")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error updating metadata file: {e}")
-            return False
+            seeds = schedule.select(weeks) if weeks else [
+                str(week['seed']) for week in schedule.weeks if week['status'] in ('current', 'future')
+            ]
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        if not seeds:
+            print("ℹ️  No scheduled week selected")
+            return
+
+        missing = self.find_missing_announcements(seeds)
+        print(f"🎯 {len(seeds)} week{'s' if len(seeds) != 1 else ''} ({seeds[0]}..{seeds[-1]}), "
+              f"{len(missing)} game{'s' if len(missing) != 1 else ''} without an announcement")
+        if not missing:
+            return
+
+        if self.dry_run:
+            print("\n=== DRY RUN MODE ===")
+            for seed, game_id, game_title, meta in missing:
+                key = self.cache.key(self.ai_service, self.build_request(self.generate_ai_prompt(game_title, meta)))
+                cached = ' (cached)' if self.cache.contains(key) else ''
+                print(f"  {seed} {game_id}: {game_title}{cached}")
+            print("Would generate announcements using:", self.ai_service.upper())
+            return
+
+        start_time = time.time()
+        print(f"🤖 Calling {self.ai_service.upper()} API ({self.concurrency} concurrent requests at most)...")
+
+        def generate(item):
+            seed, game_id, game_title, meta = item
+            announcement, sentence_count = self.write_announcement(game_title, meta)
+            return seed, game_id, announcement, sentence_count
+
+        announcements = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(missing))) as pool:
+            for seed, game_id, announcement, sentence_count in pool.map(generate, missing):
+                if not announcement:
+                    failed.append(game_id)
+                    print(f"❌ {seed} {game_id}: failed to generate an announcement")
+                    continue
+                announcements[game_id] = announcement
+                print(f"✅ {seed} {game_id} ({sentence_count} sentences, {len(announcement)} characters):")
+                print(f"📝 {announcement}")
+
+        print(f"📊 {len(announcements)}/{len(missing)} announcements generated in {time.time() - start_time:.2f}s "
+              f"({self.cache.hits} cached, {self.cache.misses} requested)")
+
+        if update_metadata:
+            print("💾 Updating metadata files...")
+            written = self.update_metadata_files(announcements)
+            print(f"🎉 {written} metadata file{'s' if written != 1 else ''} updated")
+        elif announcements:
+            print("\n💡 To automatically update the metadata files, run with --update-metadata")
+            print("💡 The announcements are cached: re-running with --update-metadata will not call the API again")
+        if failed:
+            sys.exit(1)
 
     def run(self, week_seed=None, update_metadata=False):
         """Run the announcement generation process."""
@@ -373,58 +544,12 @@ Génère maintenant l'annonce pour {game_title} :"""
         
         # Call AI API
         print(f"🤖 Calling {self.ai_service.upper()} API...")
-        announcement = self.generate_announcement(prompt)
+        announcement, sentence_count = self.write_announcement(game_title, meta)
         
         if not announcement:
             print("❌ Failed to generate announcement")
             sys.exit(1)
         
-        # Validate sentence count with smarter parsing
-        # Use a more sophisticated approach to count actual sentences
-        import re
-        
-        # First, normalize the text to handle common abbreviation patterns
-        normalized_text = announcement
-        
-        # Handle common abbreviation patterns (H.E.R.O., U.S.A., etc.)
-        # Replace periods in acronyms with a temporary marker
-        normalized_text = re.sub(r'\b([A-Z]\.){2,}', lambda m: m.group(0).replace('.', '§'), normalized_text)
-        
-        # Handle other common abbreviations (Mr., Dr., etc.)
-        normalized_text = re.sub(r'\b([A-Z][a-z]\.)', lambda m: m.group(0).replace('.', '§'), normalized_text)
-        
-        # Now split by periods to get sentences
-        raw_parts = normalized_text.split('.')
-        sentences = []
-        
-        for part in raw_parts:
-            part = part.strip()
-            if not part:
-                continue
-            
-            # Restore periods in abbreviations
-            part = part.replace('§', '.')
-            
-            # Check if this looks like a complete sentence
-            if len(part) > 10 and not part.isupper():  # Must be substantial and not just an acronym
-                sentences.append(part)
-            elif len(part) <= 10 and part.isupper():
-                # This is likely an acronym, skip it as a separate sentence
-                continue
-            elif len(part) > 10:
-                # This might be a sentence, include it
-                sentences.append(part)
-        
-        sentence_count = len(sentences)
-        
-        if sentence_count > MAX_SENTENCES:
-            print(f"⚠️  Warning: Generated announcement has {sentence_count} sentences (max {MAX_SENTENCES})")
-            print("Truncating to fit...")
-            # Keep only the first MAX_SENTENCES sentences
-            truncated_sentences = sentences[:MAX_SENTENCES]
-            announcement = '. '.join(truncated_sentences) + '.'
-            print(f"✅ Truncated to {MAX_SENTENCES} sentences")
-        
         print(f"✅ Generated announcement ({sentence_count} sentences, {len(announcement)} characters):")
         print(f"📝 {announcement}")
         
@@ -450,6 +575,18 @@ def main():
                        help='Automatically update the metadata.yaml file with the generated announcement')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be generated without actually calling AI or updating files')
+    parser.add_argument('--batch', action='store_true',
+                       help='Generate, without prompting, the announcements of every scheduled game that lacks one')
+    parser.add_argument('--weeks', default=None, type=str,
+                       help='Weeks for --batch ("202540..202552", "202540,202542"; default: current and upcoming weeks)')
+    parser.add_argument('--concurrency', default=MAX_CONCURRENCY, type=int,
+                       help=f'Concurrent AI requests with --batch (default: {MAX_CONCURRENCY})')
+    parser.add_argument('--sentence-retries', default=SENTENCE_RETRIES, type=int,
+                       help=f'Times a too long announcement is asked again before truncating it (default: {SENTENCE_RETRIES})')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                       help=f'Cache of AI answers, keyed by prompt hash (default: {CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always call the AI service, and do not cache its answers')
     
     args = parser.parse_args()
     
@@ -466,9 +603,20 @@ def main():
     
     generator = AnnouncementGenerator(
         ai_service=args.ai_service,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        sentence_retries=args.sentence_retries,
+        concurrency=args.concurrency
     )
     
+    if args.batch:
+        generator.run_batch(
+            weeks=args.weeks,
+            update_metadata=args.update_metadata
+        )
+        return
+    
     generator.run(
         week_seed=args.week_seed,
         update_metadata=args.update_metadata
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+ROM Manifest Generator for BonjourArcade
+
+Walks roms/ and writes the ROM manifest (see arcade_core/roms.py): the path,
+system, size and SHA-1 of every ROM. Only the ROMs whose size or mtime changed
+since the last run are read again (hashes are cached in
+.cache/rom-manifest/hashes.json); they are hashed concurrently through memory
+maps. ROMs with the same content and ROMs that moved to another system
+directory are reported.
+
+The manifest can be given to build_gamelist.py with --manifest or
+ROMS_MANIFEST_PATH, or uploaded next to the ROMs for ROMS_MANIFEST_URL.
+
+Usage:
+    python3 scripts/generate_rom_manifest.py [--roms-dir roms] [--output roms-manifest.json] [--full] [--jobs N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.roms import (
+    HASH_CACHE_PATH,
+    MANIFEST_PATH,
+    MAX_WORKERS,
+    ROMS_DIR,
+    HashCache,
+    build_manifest,
+    find_duplicates,
+    write_manifest,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the manifest of the ROMs (path, system, size, hash)')
+    parser.add_argument('--roms-dir', default=ROMS_DIR, help=f'ROM directory to scan (default: {ROMS_DIR})')
+    parser.add_argument('--output', default=MANIFEST_PATH, help=f'Path of the manifest (default: {MANIFEST_PATH})')
+    parser.add_argument('--cache', default=HASH_CACHE_PATH, help=f'Hash cache (default: {HASH_CACHE_PATH})')
+    parser.add_argument('--full', action='store_true', help='Hash every ROM again, ignoring the cached hashes')
+    parser.add_argument('--jobs', type=int, default=MAX_WORKERS,
+                        help=f'Number of ROMs hashed concurrently (default: {MAX_WORKERS})')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.roms_dir):
+        print(f"❌ Error: {args.roms_dir} directory not found")
+        sys.exit(1)
+
+    start_time = time.perf_counter()
+    print(f"🗂️  Scanning {args.roms_dir}...")
+    manifest, stats = build_manifest(args.roms_dir, HashCache(args.cache), full=args.full, max_workers=args.jobs)
+    elapsed = time.perf_counter() - start_time
+    roms = manifest['roms']
+    megabytes = stats.hashed_bytes / 1e6
+    print(f"#️⃣  Hashed {stats.hashed} ROMs ({megabytes:.1f} MB, {megabytes / elapsed if elapsed else 0:.0f} MB/s), "
+          f"reused {stats.reused} cached hashes")
+
+    for old, new in stats.moves:
+        print(f"🚚 Moved: {old} -> {new}")
+    duplicates = find_duplicates(roms)
+    for digest, paths in sorted(duplicates.items(), key=lambda item: item[1]):
+        print(f"⚠️  Warning: same content ({digest[:12]}) in {', '.join(paths)}")
+
+    write_manifest(manifest, args.output)
+    systems = {rom['system'] for rom in roms}
+    print(f"✅ Wrote {args.output}: {len(roms)} ROMs in {len(systems)} systems, "
+          f"{len(stats.moves)} moved, {len(duplicates)} duplicated contents ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
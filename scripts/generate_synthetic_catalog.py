@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Synthetic Catalog Generator for BonjourArcade
+
+Writes a repository-shaped catalog of fake games (see arcade_core/synthetic.py):
+metadata.yaml files with a share of broken ones, random cover.png images, a ROM
+manifest and a predictions.yaml spanning decades of weeks. Run the build tools
+with the catalog as the working directory, e.g.:
+
+    cd .cache/benchmark/catalog-10000-0 && bash scripts/generate_gamelist_sequential.sh --manifest roms-manifest.json
+
+benchmark_build.py generates (and reuses) these catalogs by itself.
+
+Usage:
+    python3 scripts/generate_synthetic_catalog.py --games N [--seed 0] [--output DIR]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.synthetic import generate_catalog
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic catalog of games for benchmarking the build')
+    parser.add_argument('--games', type=int, required=True, help='Number of games')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--output', help='Catalog directory (default: .cache/benchmark/catalog-<games>-<seed>)')
+    args = parser.parse_args()
+
+    output = args.output or os.path.join('.cache', 'benchmark', f"catalog-{args.games}-{args.seed}")
+    start_time = time.perf_counter()
+    print(f"🧪 Generating {args.games} synthetic games in {output}...")
+
+    def progress(done, total):
+        print(f"   {done}/{total} games")
+
+    try:
+        info = generate_catalog(output, args.games, seed=args.seed, scripts_dir=SCRIPTS_DIR, progress=progress)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print(f"✅ Generated {info['games']} games ({info['roms']} ROMs, {info['weeks']} predicted weeks, "
+          f"{info['broken']} broken metadata.yaml, {info['no_metadata']} without metadata, "
+          f"{info['no_cover']} without cover, {info['large_covers']} covers over 100KB) "
+          f"in {time.perf_counter() - start_time:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
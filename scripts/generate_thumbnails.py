@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Generator for BonjourArcade
+
+This script generates the cover_thumb.png thumbnails used by the previous games
+grid (main.js swaps cover.png for cover_thumb.png) for every
+public/games/*/cover.png and for the placeholder image. It replaces the serial
+ImageMagick loop of generate_thumbnails.sh, which is now a thin wrapper.
+
+Thumbnails are resized to THUMB_WIDTH pixels wide (keeping the aspect ratio,
+never upscaling, like `magick -resize 150x>`) in a process pool. Large covers
+are first shrunk with Image.draft()/Image.reduce() before the final Lanczos
+resize. Game covers also get WebP and (when Pillow supports it) AVIF variants
+at several widths, public/games/<id>/cover-<width>.<format>; the widths and
+formats are defined in arcade_core/covers.py and listed in gamelist.json as
+`coverVariants`.
+
+A cover is only re-encoded when one of its outputs is missing, or they are
+older than the cover and the cover's content hash differs from the one recorded
+in .cache/thumbnails/manifest.json. The hash check is what lets CI skip unchanged
+covers: a fresh checkout gives every cover a new mtime, but the same content.
+
+With --report (or BUILD_REPORT), the stage timings and the slowest images are
+merged into the build report under "thumbnails" (see arcade_core/telemetry.py).
+
+Usage:
+    python3 scripts/generate_thumbnails.py [--force] [--jobs N] [--timings] [--no-variants] [--report build-report.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.covers import (
+    VARIANT_OPTIONS,
+    VARIANT_WIDTHS,
+    available_formats,
+    png_size,
+    variant_filename,
+    variant_widths,
+)
+from arcade_core.telemetry import Telemetry
+
+THUMB_WIDTH = 150
+GAMES_DIR = 'public/games'
+DEFAULT_COVER = 'public/assets/images/placeholder_thumb.png'
+CACHE_DIR = '.cache/thumbnails'
+MANIFEST_VERSION = 2
+
+
+def thumbnail_path(image_path):
+    """cover.png -> cover_thumb.png, next to the source image."""
+    base, ext = os.path.splitext(image_path)
+    return f"{base}_thumb{ext}"
+
+
+def find_images(games_dir=GAMES_DIR, default_cover=DEFAULT_COVER):
+    """List every game cover, plus the placeholder image."""
+    images = []
+    if os.path.isdir(games_dir):
+        for entry in os.scandir(games_dir):
+            cover = os.path.join(games_dir, entry.name, 'cover.png')
+            if entry.is_dir() and os.path.isfile(cover):
+                images.append(cover)
+    images.sort()
+    if os.path.isfile(default_cover):
+        images.append(default_cover)
+    return images
+
+
+def variant_outputs(source, formats):
+    """The WebP/AVIF variant files of a game cover as (path, width, format); none for other images."""
+    if not formats or os.path.basename(source) != 'cover.png':
+        return []
+    size = png_size(source)
+    if size is None:
+        return []
+    directory = os.path.dirname(source)
+    return [
+        (os.path.join(directory, variant_filename(width, fmt)), width, fmt)
+        for width in variant_widths(size[0])
+        for fmt in formats
+    ]
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def load_manifest(path, config):
+    """Return the recorded source hashes, or {} if the manifest is missing or was made with other settings."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION or data.get('config') != config:
+        return {}
+    return data.get('sources', {})
+
+
+def save_manifest(path, config, sources):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'config': config, 'sources': sources}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def resize_to_width(img, width):
+    """Resize img to width (keeping the aspect ratio); images already that narrow are returned as-is."""
+    if img.width <= width:
+        return img
+    height = max(1, round(img.height * width / img.width))
+    if img.mode in ('1', 'P'):
+        # Palette images can only be resized with NEAREST; resample in full color instead
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    factor = img.width // (width * 2)
+    if factor > 1:
+        img = img.reduce(factor)
+    return img.resize((width, height), Image.LANCZOS)
+
+
+def save_atomic(img, target, image_format, **options):
+    tmp_target = f"{target}.tmp"
+    img.save(tmp_target, format=image_format, **options)
+    os.replace(tmp_target, target)
+
+
+def make_thumbnail(task):
+    """Generate one thumbnail and the cover's variants. Runs in a worker process.
+
+    Returns (source path, error message or None, "WxH", elapsed seconds).
+    """
+    source, width, formats = task
+    start = time.perf_counter()
+    try:
+        with Image.open(source) as img:
+            image_format = img.format or 'PNG'
+            # JPEG-style decoders can downscale while decoding; a no-op for PNG
+            img.draft(img.mode, (width, max(1, round(img.height * width / img.width))))
+            img.load()
+            thumb = resize_to_width(img, width)
+            save_atomic(thumb, thumbnail_path(source), image_format)
+            size = f"{thumb.width}x{thumb.height}"
+
+            if img.mode in ('1', 'P', 'L', 'LA', 'I', 'F'):
+                img = img.convert('RGBA' if img.mode in ('LA', 'P') else 'RGB')
+            for target, variant_width, fmt in variant_outputs(source, formats):
+                save_atomic(resize_to_width(img, variant_width), target, fmt.upper(), **VARIANT_OPTIONS[fmt])
+        return source, None, size, time.perf_counter() - start
+    except Exception as e:
+        return source, str(e), '', time.perf_counter() - start
+
+
+def plan_thumbnails(images, manifest, formats=(), force=False):
+    """Split images into (to generate, up to date). Fills manifest with the hashes it computes."""
+    todo = []
+    fresh = []
+    for source in images:
+        outputs = [thumbnail_path(source)] + [target for target, _, _ in variant_outputs(source, formats)]
+        if force or not all(os.path.isfile(target) for target in outputs):
+            todo.append(source)
+            continue
+        if min(os.path.getmtime(target) for target in outputs) >= os.path.getmtime(source):
+            fresh.append(source)
+            if source not in manifest:
+                manifest[source] = file_hash(source)
+            continue
+        # Outputs are older than the cover: only the content tells if the cover changed
+        digest = file_hash(source)
+        if manifest.get(source) == digest:
+            fresh.append(source)
+        else:
+            todo.append(source)
+    return todo, fresh
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate cover_thumb.png thumbnails for game covers')
+    parser.add_argument('--games-dir', default=GAMES_DIR, help=f'Games directory (default: {GAMES_DIR})')
+    parser.add_argument('--width', type=int, default=THUMB_WIDTH, help=f'Thumbnail width (default: {THUMB_WIDTH})')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--cache-dir', default=os.getenv('THUMBNAIL_CACHE_DIR', CACHE_DIR),
+                        help=f'Directory of the source hash manifest (default: $THUMBNAIL_CACHE_DIR or {CACHE_DIR})')
+    parser.add_argument('--force', action='store_true', help='Regenerate every thumbnail')
+    parser.add_argument('--timings', action='store_true', help='Print the timing of every generated thumbnail')
+    parser.add_argument('--no-variants', action='store_true', help='Only generate cover_thumb.png, no WebP/AVIF variants')
+    parser.add_argument('--report', default=os.getenv('BUILD_REPORT'),
+                        help='Build report to merge the stage timings into (default: $BUILD_REPORT, none if unset)')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    telemetry = Telemetry('thumbnails', args.report)
+    print("Starting thumbnail generation...")
+
+    with telemetry.span('cover scan'):
+        images = find_images(args.games_dir)
+    if not images:
+        print("No cover images found to process.")
+        return
+
+    print(f"Found {len(images)} images to process...")
+    manifest_path = os.path.join(args.cache_dir, 'manifest.json')
+    formats = () if args.no_variants else available_formats()
+    config = {'width': args.width, 'variant_widths': list(VARIANT_WIDTHS), 'formats': list(formats)}
+    if formats:
+        print(f"🎨 Cover variants: {', '.join(formats)} at {', '.join(map(str, VARIANT_WIDTHS))}px")
+    with telemetry.span('plan') as span:
+        manifest = load_manifest(manifest_path, config)
+        todo, fresh = plan_thumbnails(images, manifest, formats, force=args.force)
+        span['args'].update(fresh=len(fresh), todo=len(todo))
+    print(f"♻️  {len(fresh)} thumbnails up to date, {len(todo)} to generate")
+
+    results = []
+    if todo:
+        jobs = max(1, min(args.jobs, len(todo)))
+        print(f"🖼️  Generating {len(todo)} thumbnails with {jobs} process{'es' if jobs > 1 else ''}...")
+        tasks = [(source, args.width, formats) for source in todo]
+        with telemetry.span('encode', jobs=jobs):
+            if jobs == 1:
+                results = [make_thumbnail(task) for task in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    results = list(pool.map(make_thumbnail, tasks, chunksize=8))
+
+    failed = []
+    with telemetry.span('manifest update'):
+        for source, error, size, elapsed in results:
+            telemetry.item('image', source, elapsed)
+            if error:
+                failed.append(source)
+                manifest.pop(source, None)
+                print(f"❌ Error: {source}: {error}")
+                continue
+            manifest[source] = file_hash(source)
+            if args.timings:
+                print(f"  {source} -> {size} in {elapsed * 1000:.1f} ms")
+
+        # Forget covers that no longer exist
+        known = set(images)
+        manifest = {source: digest for source, digest in manifest.items() if source in known}
+        save_manifest(manifest_path, config, manifest)
+
+    generated = [r for r in results if not r[1]]
+    if generated:
+        total = sum(r[3] for r in generated)
+        print(f"⏱️  Encoding time: {total:.2f}s total, {total / len(generated) * 1000:.1f} ms per image")
+        slowest = sorted(generated, key=lambda r: r[3], reverse=True)[:5]
+        print("🐢 Slowest images: " + ", ".join(f"{r[0]} ({r[3] * 1000:.0f} ms)" for r in slowest))
+
+    processed = len(fresh) + len(generated)
+    print(f"Thumbnail generation complete. Processed: {processed}, Failed: {len(failed)} ({time.time() - start_time:.2f}s)")
+    telemetry.count(images=len(images), generated=len(generated), up_to_date=len(fresh), failed=len(failed))
+    if telemetry.save():
+        print(f"⏱️  Recorded the stage timings in {args.report}")
+    if failed:
+        print(f"⚠️  Thumbnail generation completed with {len(failed)} failures.")
+        sys.exit(1)
+    print("✅ Thumbnail generation completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
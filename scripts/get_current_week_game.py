@@ -6,55 +6,32 @@ This script is used by the generate_gamelist.sh scripts to replace the game-of-t
 
 import sys
 import os
-import yaml
-from datetime import datetime
 
-def get_current_week_seed():
-    """Get the current week's seed in YYYYWW format."""
-    now = datetime.now()
-    week = now.isocalendar()[1]
-    return f"{now.year}{week:02d}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core import get_predictions
+from arcade_core.predictions import PREDICTIONS_YAML, get_current_week_seed
 
 def get_game_from_seed(seed):
-    """Get the game info (title and game_id) that would be selected for a given seed using the predictions.yaml file."""
+    """Get the game info (title and game_id) that would be selected for a given seed using the predictions schedule."""
     try:
-        # Read the predictions.yaml file to get the game for this seed
-        predictions_path = 'public/plinko/predict/predictions.yaml'
-        if not os.path.exists(predictions_path):
-            print(f"Error: predictions.yaml not found at {predictions_path}", file=sys.stderr)
+        predictions = get_predictions()
+        if predictions.schedule is None:
+            print(f"Error: predictions.yaml not found at {PREDICTIONS_YAML}", file=sys.stderr)
             return None
-            
-        with open(predictions_path, 'r') as f:
-            predictions = yaml.safe_load(f)
-        
-        if not predictions:
+
+        if not predictions.available():
             print(f"Error: predictions.yaml is empty or invalid", file=sys.stderr)
             return None
-        
+
         # Look up the game info for this seed
-        # YAML parser converts string keys to integers, so we need to convert the seed to int
-        try:
-            seed_int = int(seed)
-            game_info = predictions.get(seed_int)
-        except ValueError:
-            # If seed is not a valid integer, try as string
-            game_info = predictions.get(seed)
-        
-        if not game_info:
+        week = predictions.game_for_seed(seed)
+        if not week:
             print(f"Error: No prediction found for seed {seed}", file=sys.stderr)
             return None
-        
-        # Handle both old format (string) and new format (dict)
-        if isinstance(game_info, str):
-            # Old format - just return the title
-            return {"title": game_info, "game_id": None}
-        elif isinstance(game_info, dict):
-            # New format - return both title and game_id
-            return {"title": game_info.get("title"), "game_id": game_info.get("game_id")}
-        else:
-            print(f"Error: Invalid game info format for seed {seed}", file=sys.stderr)
-            return None
-        
+
+        return {"title": week["title"], "game_id": week["game_id"]}
+
     except Exception as e:
         print(f"Error: Could not determine game for seed {seed}: {e}", file=sys.stderr)
         return None
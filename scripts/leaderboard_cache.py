@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Leaderboard cache tool for BonjourArcade
+
+Prints the top scores of one or more games through the cached leaderboard client
+(arcade_core/leaderboard.py), fetching the games concurrently, and seeds the
+cache from a fixture so newsletter runs without network access are deterministic.
+
+Usage:
+    # Top 3 of some games (fetched at most once per TTL)
+    python3 scripts/leaderboard_cache.py hero pitfall2
+
+    # Seed the cache from a fixture, then read it back without any network access
+    python3 scripts/leaderboard_cache.py --seed scores.json
+    LEADERBOARD_OFFLINE=1 python3 scripts/leaderboard_cache.py hero
+
+A fixture maps game IDs to a list of scores ({"userId", "player", "score"}), or
+to {"<time range>": [scores]}.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.leaderboard import CACHE_DIR, DEFAULT_TTL, LeaderboardClient, top_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show and seed the cached game leaderboards')
+    parser.add_argument('game_ids', nargs='*', help='Game IDs to show the top scores of')
+    parser.add_argument('--seed', metavar='FIXTURE', help='Load a JSON fixture of scores into the cache')
+    parser.add_argument('--top', type=int, default=3, help='Number of players to show (default: 3)')
+    parser.add_argument('--time-range', default='all', help="listGameScores time range (default: 'all')")
+    parser.add_argument('--cache-dir', default=os.getenv('LEADERBOARD_CACHE_DIR', CACHE_DIR),
+                        help=f'Cache directory (default: $LEADERBOARD_CACHE_DIR or {CACHE_DIR})')
+    parser.add_argument('--ttl', type=float, default=float(os.getenv('LEADERBOARD_CACHE_TTL', DEFAULT_TTL)),
+                        help=f'Seconds a cached leaderboard stays fresh (default: $LEADERBOARD_CACHE_TTL or {DEFAULT_TTL})')
+    parser.add_argument('--offline', action='store_true', help='Only use the cache, never the network')
+    parser.add_argument('--json', action='store_true', help='Print the top scores as JSON')
+    args = parser.parse_args()
+
+    if not args.seed and not args.game_ids:
+        parser.error('give game IDs and/or --seed FIXTURE')
+
+    client = LeaderboardClient(cache_dir=args.cache_dir, ttl=args.ttl, offline=True if args.offline else None)
+
+    if args.seed:
+        try:
+            count = client.seed_cache(args.seed)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: Could not seed the cache from {args.seed}: {e}")
+            sys.exit(1)
+        print(f"✅ Seeded {count} leaderboard{'s' if count != 1 else ''} into {args.cache_dir}")
+
+    if not args.game_ids:
+        return
+
+    results, errors = client.fetch_many(args.game_ids, args.time_range)
+    tops = {game_id: top_scores(scores, args.top) for game_id, scores in results.items()}
+    if args.json:
+        print(json.dumps({'top_scores': tops, 'errors': errors}, indent=2, ensure_ascii=False))
+    else:
+        for game_id in args.game_ids:
+            if game_id in errors:
+                print(f"⚠️  Warning: {errors[game_id]}")
+                continue
+            print(f"🏆 {game_id}:")
+            if not tops[game_id]:
+                print("  ℹ️  No scores")
+            for score in tops[game_id]:
+                print(f"  {score['rank']}. {score['player']}: {score['score']:,}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
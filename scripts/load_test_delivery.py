@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Delivery Load Test for BonjourArcade
+
+Benchmarks and regression-tests the newsletter delivery paths against the local
+stub server (arcade_core/stub_server.py), without network access. Each scenario
+injects different faults and runs, through the real DeliveryQueue and
+LeaderboardClient:
+
+- --webhooks webhook deliveries (half Discord, half Google Chat) and one
+  ConvertKit broadcast guarded by its already_delivered() check;
+- a concurrent fetch of --games leaderboards.
+
+It reports the wall time, throughput, latency percentiles and attempts of each
+scenario, and checks the invariants the delivery queue promises: every delivery
+reported as sent was processed by the stub, the broadcast (not safe to repeat)
+exactly once and never after a reported failure, and every fetched leaderboard
+matches the stub. Webhooks repeated after an ambiguous failure are counted as
+duplicates. It exits 1 if any invariant is broken.
+
+Usage:
+    python3 scripts/load_test_delivery.py [--scenario NAME ...] [--webhooks N] [--games N] [--workers N] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.delivery import DeliveryQueue, Outbox
+from arcade_core.leaderboard import LeaderboardClient
+from arcade_core.stub_server import StubServer
+from arcade_core.webhooks import make_session, webhook_payload
+
+# Faults of each scenario, as given to StubServer.configure()
+SCENARIOS = {
+    'clean': {},
+    'latency': {'*': {'latency': 0.05, 'jitter': 0.05}},
+    'flaky': {'*': {'error_rate': 0.3, 'error_status': 503}},
+    'rate-limited': {'discord': {'rate_limit_every': 3, 'retry_after': 0.05},
+                     'googlechat': {'rate_limit_every': 4, 'retry_after': 0.05},
+                     'leaderboard': {'rate_limit_every': 5, 'retry_after': 0.05}},
+    'ambiguous': {'convertkit': {'fail_first': 1, 'process_on_error': True, 'error_status': 502},
+                  'discord': {'fail_first': 3, 'process_on_error': True, 'error_status': 502}},
+}
+SEED = 202545
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def run_scenario(name, faults, args):
+    """Run one scenario against a fresh stub. Returns its report dict."""
+    cache_dir = tempfile.mkdtemp(prefix='leaderboard-')
+    server = StubServer(faults=faults, seed=args.seed)
+    try:
+        server.start()
+        session = make_session(args.workers)
+        queue = DeliveryQueue(Outbox(None), session=session, max_attempts=args.max_attempts,
+                              base_delay=args.base_delay, max_delay=args.base_delay * 8,
+                              max_workers=args.workers)
+        subject = f"Load test {name}"
+        api_url = f"{server.url}/v3"
+
+        def broadcast_exists():
+            response = session.get(f"{api_url}/broadcasts", params={'api_secret': 'load-test'}, timeout=5)
+            response.raise_for_status()
+            return any(broadcast.get('subject') == subject for broadcast in response.json().get('broadcasts', []))
+
+        queue.add(f"{SEED}:convertkit:broadcast", 'ConvertKit Email', f"{api_url}/broadcasts",
+                  {'api_secret': 'load-test', 'subject': subject, 'description': name, 'content': '<p>test</p>'},
+                  safe_to_repeat=False, already_delivered=broadcast_exists)
+        for i in range(args.webhooks):
+            wtype = 'discord' if i % 2 == 0 else 'googlechat'
+            label = f"{wtype}_{i}"
+            queue.add(f"{SEED}:webhook:{label}", label, server.webhook_url(wtype, label),
+                      webhook_payload(wtype, f"Message {i}"))
+
+        start = time.perf_counter()
+        results = queue.run()
+        delivery_time = time.perf_counter() - start
+
+        client = LeaderboardClient(cache_dir=cache_dir, ttl=0, offline=False, session=session,
+                                   api_url=f"{server.url}/listGameScores", max_workers=args.workers,
+                                   max_attempts=args.max_attempts, base_delay=args.base_delay,
+                                   max_delay=args.base_delay * 8)
+        game_ids = [f"game{i}" for i in range(args.games)]
+        start = time.perf_counter()
+        scores, errors = client.fetch_many(game_ids)
+        fetch_time = time.perf_counter() - start
+        session.close()
+
+        once = {f"{SEED}:convertkit:broadcast"}
+        return check_scenario(name, server, results, once, delivery_time, scores, errors, fetch_time)
+    finally:
+        server.stop()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def check_scenario(name, server, results, once, delivery_time, scores, errors, fetch_time):
+    """Measure a scenario's results and check them against what the stub recorded.
+
+    Deliveries whose key is in once (not safe to repeat) must be processed exactly
+    once; the others at least once, their repeats being counted as duplicates.
+    """
+    records = server.requests_for()
+    process_on_error = {service for service, faults in server.faults.items() if faults.process_on_error}
+    processed_by_key = Counter(
+        record['idempotency_key'] for record in records
+        if record['idempotency_key'] and (
+            200 <= record['status'] < 300
+            or (record['fault'] == 'error' and record['service'] in process_on_error)
+        )
+    )
+    violations = []
+    duplicates = 0
+    for result in results:
+        count = processed_by_key.get(result.key, 0)
+        if result.ok and count == 0:
+            violations.append(f"{result.key} reported sent but never processed")
+        elif not result.ok and count and result.key in once:
+            violations.append(f"{result.key} reported failed but processed {count} times")
+        elif count > 1:
+            if result.key in once:
+                violations.append(f"{result.key} processed {count} times")
+            else:
+                # Webhooks are retried after ambiguous failures: at least once, possibly twice
+                duplicates += count - 1
+    if len(server.broadcasts) > 1:
+        violations.append(f"{len(server.broadcasts)} broadcasts created for one delivery")
+    for game_id, error in errors.items():
+        violations.append(f"leaderboard of {game_id} not fetched: {error}")
+    for game_id, game_scores in scores.items():
+        if game_scores != server.game_scores(game_id, 'all'):
+            violations.append(f"leaderboard of {game_id} does not match the stub")
+
+    elapsed = [result.elapsed for result in results]
+    faults = Counter(record['fault'] for record in records if record['fault'])
+    return {
+        'scenario': name,
+        'deliveries': len(results),
+        'sent': sum(1 for result in results if result.ok),
+        'attempts': sum(result.attempts for result in results),
+        'duplicates': duplicates,
+        'delivery_time': round(delivery_time, 3),
+        'deliveries_per_second': round(len(results) / delivery_time, 1) if delivery_time else None,
+        'p50_ms': round(percentile(elapsed, 0.5) * 1000, 1),
+        'p95_ms': round(percentile(elapsed, 0.95) * 1000, 1),
+        'max_ms': round(max(elapsed, default=0) * 1000, 1),
+        'leaderboards': len(scores),
+        'leaderboard_errors': len(errors),
+        'fetch_time': round(fetch_time, 3),
+        'requests': len(records),
+        'injected': dict(faults),
+        'violations': violations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the newsletter deliveries against the local stub server')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable; default: all)')
+    parser.add_argument('--webhooks', type=int, default=40, help='Webhook deliveries per scenario (default: 40)')
+    parser.add_argument('--games', type=int, default=20, help='Leaderboards fetched per scenario (default: 20)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent requests (default: 8)')
+    parser.add_argument('--max-attempts', type=int, default=5, help='Attempts per delivery (default: 5)')
+    parser.add_argument('--base-delay', type=float, default=0.01,
+                        help='Backoff base delay in seconds, scaled down from production (default: 0.01)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the injected faults (default: 0)')
+    parser.add_argument('--json', metavar='FILE', help='Also write the reports to this JSON file')
+    args = parser.parse_args()
+
+    reports = []
+    for name in args.scenario or list(SCENARIOS):
+        report = run_scenario(name, SCENARIOS[name], args)
+        reports.append(report)
+        status = '✅' if not report['violations'] else '❌'
+        injected = ', '.join(f"{fault}×{count}" for fault, count in report['injected'].items()) or 'none'
+        print(f"{status} {name}: {report['sent']}/{report['deliveries']} sent in {report['delivery_time']:.2f}s "
+              f"({report['deliveries_per_second']}/s, p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, "
+              f"{report['attempts']} attempts, {report['duplicates']} duplicates); {report['leaderboards']}/{args.games} leaderboards in "
+              f"{report['fetch_time']:.2f}s; injected: {injected}")
+        for violation in report['violations']:
+            print(f"   ❌ {violation}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'reports': reports}, f, indent=2)
+    if any(report['violations'] for report in reports):
+        print("💥 Delivery invariants broken")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Predictions Schedule Compiler for BonjourArcade
+
+This script compiles public/plinko/predict/predictions.yaml into a normalized,
+seed-sorted public/plinko/predict/predictions.json, so the other scripts do not
+have to re-parse the YAML every time they need the game of a given week.
+The format and the shared loader live in arcade_core/predictions.py.
+
+Usage:
+    python3 scripts/predictions_schedule.py [--input predictions.yaml] [--output predictions.json]
+"""
+
+import argparse
+import os
+import sys
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.predictions import PREDICTIONS_JSON, PREDICTIONS_YAML, write_schedule
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile predictions.yaml into predictions.json')
+    parser.add_argument('--input', default=PREDICTIONS_YAML, help=f'Path to predictions.yaml (default: {PREDICTIONS_YAML})')
+    parser.add_argument('--output', default=PREDICTIONS_JSON, help=f'Path to predictions.json (default: {PREDICTIONS_JSON})')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Error: predictions.yaml not found at {args.input}")
+        sys.exit(1)
+    try:
+        count = write_schedule(args.input, args.output)
+    except (OSError, yaml.YAMLError) as e:
+        print(f"❌ Error: Could not compile {args.input}: {e}")
+        sys.exit(1)
+    print(f"✅ Compiled {count} weeks into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
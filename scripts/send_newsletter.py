@@ -8,6 +8,23 @@ to subscribers using ConvertKit API and to one or more webhooks (e.g., Google Ch
 The announcement message is automatically read from the game's metadata.yaml file
 under the 'announcement_message' field. You can also override it with --custom-message.
 
+Webhooks are posted concurrently through one pooled HTTP session, with a
+timeout per request, and a per-label report is printed once they are all done.
+Every delivery is retried with exponential backoff on rate limits and transient
+errors, and recorded in an outbox (.cache/newsletter/outbox.json) keyed by week
+seed and label: re-running a failed job only retries the deliveries that failed
+(see arcade_core/delivery.py).
+
+The week's game, its metadata and last week's highlight are resolved once into
+an immutable NewsletterContext, rendered once per output format (HTML email,
+Discord and Google Chat messages) and handed to every selected transport. The
+formats share precompiled templates (arcade_core/templates.py), compiled once
+per process.
+
+With --weeks, nothing is sent: the previews of every scheduled week in the range
+are rendered in parallel into --output-dir (one .html and one message per
+webhook type per week, each week's log, and an index.html linking them all).
+
 The script requires the game's metadata.yaml to contain:
 - announcement_message: Description of the game for the newsletter
 - controls: Array of control instructions for the game
@@ -21,39 +38,162 @@ Requirements:
 - Set the corresponding environment variables for webhook URLs
 
 Usage:
-    python send_newsletter.py [--dry-run] [--mail-api-url URL] [--mail-only] [--webhook-only] [--webhook-map webhook_map.json] [--webhook-label LABEL] [--custom-message MESSAGE]
+    python send_newsletter.py [--dry-run] [--mail-api-url URL] [--mail-only] [--webhook-only] [--webhook-map webhook_map.json] [--webhook-label LABEL] [--custom-message MESSAGE] [--outbox PATH] [--resend]
+    python send_newsletter.py --weeks 202540..202552 [--output-dir DIR] [--jobs N] [--dry-run]
 
 Options:
-    --mail-api-url      Override the ConvertKit API URL for sending email (default: https://api.convertkit.com/v3)
+    --mail-api-url      Override the ConvertKit API URL for sending email (default: $CONVERTKIT_API_URL or https://api.convertkit.com/v3)
     --mail-only         Only send the email (no webhooks)
     --webhook-only      Only send to webhooks (no email)
     --webhook-map       Path to JSON file mapping webhook labels to env var names
     --webhook-label     Only send to the webhook with this label from the map
     --custom-message    Override the announcement message from metadata.yaml
     --dry-run           Show what would be sent without actually sending
+    --outbox            Delivery outbox file (default: .cache/newsletter/outbox.json)
+    --max-attempts      Attempts per delivery before giving up (default: 5)
+    --resend            Send again even the deliveries the outbox records as sent
+    --weeks             Render previews of a range of weeks (e.g. 202540..202552) instead of sending
+    --output-dir        Directory for the --weeks previews (default: newsletter-previews)
+    --jobs              Weeks rendered in parallel with --weeks (default: 4)
 """
 
+import html
+import io
 import json
-import requests
 import argparse
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from pathlib import Path
 import re
+from collections import namedtuple
+from types import MappingProxyType
 import yaml
 import questionary
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core import get_catalog, get_game_metadata, get_predictions
+from arcade_core.delivery import MAX_ATTEMPTS, OUTBOX_PATH, TIMEOUT, DeliveryQueue, Outbox, print_delivery_report
+from arcade_core.leaderboard import LeaderboardError, get_leaderboard_client
+from arcade_core.leaderboard_archive import read_history_week
+from arcade_core.predictions import get_current_week_seed
+from arcade_core.templates import Template, medal, medal_scores
+from arcade_core.webhooks import WebhookTarget, make_session, render_webhook_messages, webhook_payload
+
 # Configuration - Only keep what's needed
 DEFAULT_API_URL = 'https://api.convertkit.com/v3'
 BASE_URL = 'https://bonjourarcade-f11f7f.gitlab.io'
+MAILING_LIST_LABEL = "ConvertKit Email"
+
+NewsletterContext = namedtuple('NewsletterContext', ['seed', 'game_id', 'meta', 'announcement_message', 'last_week_highlight'])
+NewsletterContext.__doc__ = """Everything a newsletter is rendered from, resolved once by NewsletterSender.build_context().
+
+meta is a read-only view of the game's metadata.yaml, and last_week_highlight
+(None when unavailable) holds its top_scores as a tuple, so the context can be
+shared by every output format without one renderer changing what another sees.
+"""
+
+# Newsletter templates (str.format() syntax, see arcade_core/templates.py), compiled once per process
+EMAIL_SCORE_LINE = Template('<li style="margin:8px 0;"><strong>{medal} {player}</strong>: {score:,} points</li>')
+EMAIL_HIGHLIGHT = Template('''
+        <div style="background:#f8f9fa;border-left:4px solid #007bff;padding:16px;margin:18px 0;border-radius:4px;">
+            <h3 style="margin:0 0 12px 0;color:#007bff;">🏆 Top scores de la semaine dernière sur {game_title}</h3>
+            <ul style="margin:0;padding-left:20px;font-size:1.1em;">
+                {scores}
+            </ul>
+        </div>''')
+EMAIL_BODY = Template('''
+        <html><body>
+        <h1 style="color:#333;text-align:center;margin-bottom:30px;">🎮 Annonce du jeu de la semaine!</h1>
+        
+        <div style="background:#f0f8ff;border:2px solid #007bff;border-radius:8px;padding:20px;margin:20px 0;">
+            <h2 style="color:#007bff;margin-top:0;">🎯 Jeu de la semaine : {clean_title}</h2>
+            
+            <!-- Description du jeu -->
+            <div style="margin-bottom:20px;font-size:1.1em;line-height:1.6;">
+                {announcement_message}
+            </div>
+            
+            <!-- Layout responsive en deux colonnes -->
+            <div style="display:flex;flex-direction:row;gap:20px;align-items:flex-start;">
+                <div style="flex:1;min-width:0;">
+                    <ul style="margin:0;padding-left:20px;font-size:1.1em;">
+                        <li><b>Développeur :</b> {developer}</li>
+                        <li><b>Année :</b> {year}</li>
+                        <li><b>Genre :</b> {genre}</li>
+                        <li><b>Contrôles :</b> {controls}</li>
+                    </ul>
+                </div>
+                <div style="flex:1;min-width:0;text-align:center;">
+                    <img src="{cover_url}" alt="Cover de {clean_title}" style="max-width:100%;height:auto;border-radius:8px;box-shadow:0 4px 8px rgba(0,0,0,0.1);" />
+                </div>
+            </div>
+            
+            <!-- Media query pour mobile -->
+            <style>
+                @media (max-width: 600px) {{
+                    .game-section {{
+                        flex-direction: column !important;
+                    }}
+                    .game-section > div {{
+                        flex: none !important;
+                        width: 100% !important;
+                        margin-bottom: 15px;
+                    }}
+                    .game-section > div:last-child {{
+                        margin-bottom: 0;
+                    }}
+                }}
+            </style>
+        </div>
+        
+        <div style="text-align:center;margin:30px 0;">
+            <a href="{play_url}" style="background:#007bff;color:white;padding:15px 30px;text-decoration:none;border-radius:5px;font-size:18px;font-weight:bold;margin-right:15px;display:inline-block;margin-bottom:10px;">🎮 Jouer maintenant !</a>
+            <a href="{leaderboard_url}" style="background:#ffc107;color:#212529;padding:15px 30px;text-decoration:none;border-radius:5px;font-size:18px;font-weight:bold;display:inline-block;margin-bottom:10px;">🏆 Classements</a>
+        </div>
+        
+        {last_week_html}
+        
+        <p style="text-align:center;color:#666;font-style:italic;">Bonne semaine ! ☀️</p>
+        </body></html>
+        ''')
+
+WEBHOOK_SCORE_LINE = Template("{medal} {player}: {score:,} points\n")
+WEBHOOK_HIGHLIGHT = Template("""
+Top scores de la semaine dernière sur {game_title} :
+{scores}""")
+# {{b}} renders as {b}, the bold marker replaced per webhook type by render_webhook_messages()
+WEBHOOK_BODY = Template("""
+Annonce du jeu de la semaine!
+{custom_text}{{b}}Jeu de la semaine :{{b}} {title}
+{{b}}Développeur :{{b}} {developer}
+{{b}}Année :{{b}} {year}
+{{b}}Genre :{{b}} {genre}
+{{b}}Contrôles :{{b}} {controls}
+{{b}}Image :{{b}} {cover_url}
+{{b}}Classements :{{b}} {leaderboard_url}
+
+🕹️ {{b}}Faites-en l'essai :{{b}} {play_url}
+{last_week_text}
+Bonne semaine ! ☀️
+""")
 
 class NewsletterSender:
-    def __init__(self, api_secret, api_url=DEFAULT_API_URL, dry_run=False, webhook_only=False, week_seed=None):
+    def __init__(self, api_secret, api_url=DEFAULT_API_URL, dry_run=False, webhook_only=False, week_seed=None,
+                 outbox_path=OUTBOX_PATH, max_attempts=MAX_ATTEMPTS, resend=False):
         self.api_secret = api_secret
         self.api_url = api_url
         self.dry_run = dry_run
         self.webhook_only = webhook_only
+        # One pooled keep-alive session for every HTTP post of this process
+        self.session = make_session()
+        # Deliveries already sent for this week are skipped; dry runs never touch the outbox
+        self.outbox = Outbox(None if dry_run else outbox_path)
+        self.max_attempts = max_attempts
+        self.resend = resend
         # Compute plinko_url based on week seed or current week
         if week_seed:
             plinko_seed = week_seed
@@ -94,48 +234,31 @@ class NewsletterSender:
         return f"{previous_week.year}{week:02d}"
 
     def get_game_from_seed(self, seed):
-        """Get the game title that would be selected for a given seed using the predictions.yaml file."""
+        """Get the game title that would be selected for a given seed using the predictions schedule."""
         try:
-            # Read the predictions.yaml file to get the game for this seed
-            predictions_path = 'public/plinko/predict/predictions.yaml'
-            if not os.path.exists(predictions_path):
+            predictions = get_predictions()
+            if predictions.schedule is None:
                 print(f"⚠️  Warning: predictions.yaml not found, cannot determine previous week's game")
                 return None
-                
-            with open(predictions_path, 'r') as f:
-                predictions = yaml.safe_load(f)
-            
-            if not predictions:
+
+            if not predictions.available():
                 print(f"⚠️  Warning: predictions.yaml is empty or invalid")
                 return None
-            
-            # Look up the game title for this seed
-            # YAML parser converts string keys to integers, so we need to convert the seed to int
-            try:
-                seed_int = int(seed)
-                game_data = predictions.get(seed_int)
-            except ValueError:
-                # If seed is not a valid integer, try as string
-                game_data = predictions.get(seed)
-            
-            if not game_data:
+
+            # Look up the game for this seed
+            week = predictions.game_for_seed(seed)
+            if not week:
                 print(f"⚠️  Warning: No prediction found for seed {seed}")
                 return None
-            
-            # Extract the title from the game data (which can be a dict or string)
-            if isinstance(game_data, dict):
-                game_title = game_data.get('title')
-            else:
-                # If it's already a string, use it directly
-                game_title = game_data
-            
+
+            game_title = week['title']
             if not game_title:
                 print(f"⚠️  Warning: No title found in prediction data for seed {seed}")
                 return None
-            
+
             print(f"🎯 For seed {seed}, predicted game: {game_title}")
             return game_title
-            
+
         except Exception as e:
             print(f"⚠️  Warning: Could not determine previous week's game: {e}")
             return None
@@ -143,146 +266,71 @@ class NewsletterSender:
     def find_game_id_by_title(self, game_title):
         """Find a game ID in the gamelist that matches the given title."""
         try:
-            gamelist_path = 'public/gamelist.json'
-            if not os.path.exists(gamelist_path):
+            catalog = get_catalog()
+            if not catalog.exists():
                 print(f"⚠️  Warning: gamelist.json not found, cannot search for game title")
                 return None
-                
-            with open(gamelist_path, 'r') as f:
-                gamelist = json.load(f)
-            
-            # Search through all games for a title match
-            all_games = []
-            # Add games from the main games array
-            if gamelist.get('games'):
-                all_games.extend(gamelist['games'])
-            # Add game of the week if it exists
-            if gamelist.get('gameOfTheWeek') and gamelist['gameOfTheWeek'].get('id'):
-                all_games.append(gamelist['gameOfTheWeek'])
-            # Add previous games if they exist
-            if gamelist.get('previousGames'):
-                all_games.extend(gamelist['previousGames'])
-            
-            # Try exact match first
-            for game in all_games:
-                if game.get('title') == game_title:
-                    return game.get('id')
-            
-            # Try case-insensitive match
-            for game in all_games:
-                if game.get('title', '').lower() == game_title.lower():
-                    return game.get('id')
-            
-            # Try partial match (in case titles have slight differences)
-            for game in all_games:
-                game_title_lower = game.get('title', '').lower()
-                search_title_lower = game_title.lower()
-                if search_title_lower in game_title_lower or game_title_lower in search_title_lower:
-                    print(f"🔍 Found partial match: '{game.get('title')}' for '{game_title}'")
-                    return game.get('id')
-            
+
+            # Exact title first, then casefolded, normalized and partial (token) matches
+            match = catalog.resolve_title(game_title)
+            if match.ambiguous and match.game_id is None:
+                print(f"⚠️  Warning: Ambiguous partial match for '{game_title}': {', '.join(match.candidates)}")
+                return None
+            if match.game_id is not None:
+                if match.ambiguous:
+                    print(f"⚠️  Warning: Several games are titled '{game_title}' ({', '.join(match.candidates)}), using {match.game_id}")
+                if match.tier != 'exact':
+                    print(f"🔍 Found {match.tier} match: '{catalog.get(match.game_id).get('title')}' for '{game_title}'")
+                return match.game_id
+
             print(f"⚠️  Warning: No game found with title: {game_title}")
             return None
-            
+
         except Exception as e:
             print(f"⚠️  Warning: Error searching for game title: {e}")
             return None
 
     def get_top_scores(self, game_id, top_count=3):
-        """Fetch the top scores for a given game from the leaderboard API."""
-        try:
-            # API endpoint for fetching game scores
-            api_url = 'https://us-central1-alloarcade.cloudfunctions.net/listGameScores'
-            
-            # Request payload
-            payload = {
-                'data': {
-                    'timeRange': 'all',
-                    'gameId': game_id
+        """Fetch the top scores for a given game from the leaderboard API (through the on-disk leaderboard cache)."""
+        if self.dry_run:
+            print(f"[DRY RUN] Would fetch leaderboard for game: {game_id}")
+            # Return mock data for dry run
+            return [
+                {
+                    'player': 'Joueur Test 1',
+                    'score': 50000,
+                    'rank': 1
+                },
+                {
+                    'player': 'Joueur Test 2',
+                    'score': 45000,
+                    'rank': 2
+                },
+                {
+                    'player': 'Joueur Test 3',
+                    'score': 40000,
+                    'rank': 3
                 }
-            }
-            
-            # Headers (simplified version)
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'BonjourArcade-Newsletter/1.0'
-            }
-            
-            if self.dry_run:
-                print(f"[DRY RUN] Would fetch leaderboard for game: {game_id}")
-                # Return mock data for dry run
-                return [
-                    {
-                        'player': 'Joueur Test 1',
-                        'score': 50000,
-                        'rank': 1
-                    },
-                    {
-                        'player': 'Joueur Test 2',
-                        'score': 45000,
-                        'rank': 2
-                    },
-                    {
-                        'player': 'Joueur Test 3',
-                        'score': 40000,
-                        'rank': 3
-                    }
-                ]
-            
-            # Make the API request
-            response = requests.post(api_url, json=payload, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data.get('result', {}).get('success'):
-                print(f"⚠️  Warning: Leaderboard API returned unsuccessful response for {game_id}")
-                return None
-            
-            scores = data['result'].get('scores', [])
-            if not scores:
-                print(f"ℹ️  No scores found for game {game_id}")
-                return None
-            
-            # Get best score for each unique player (similar to the logic in play/index.html)
-            player_best_scores = {}
-            
-            for score in scores:
-                user_id = score.get('userId')
-                current_best = player_best_scores.get(user_id)
-                
-                if not current_best or score.get('score', 0) > current_best.get('score', 0):
-                    player_best_scores[user_id] = {
-                        'player': score.get('player', 'Joueur Inconnu'),
-                        'score': score.get('score', 0),
-                        'rank': score.get('rank', 0)
-                    }
-            
-            # Convert to array and sort by score (highest first)
-            sorted_scores = sorted(player_best_scores.values(), key=lambda x: x.get('score', 0), reverse=True)
-            
-            # Return top N scores
-            top_scores = sorted_scores[:top_count]
-            
-            # Add rank information
-            for i, score in enumerate(top_scores):
-                score['rank'] = i + 1
-            
-            return top_scores
-            
-        except requests.exceptions.RequestException as e:
-            print(f"⚠️  Warning: Could not fetch leaderboard for {game_id}: {e}")
+            ]
+
+        try:
+            # Best score of each of the top_count best players (same logic as play/index.html)
+            top_scores = get_leaderboard_client().top_scores(game_id, top_count)
+        except LeaderboardError as e:
+            print(f"⚠️  Warning: {e}")
             return None
-        except Exception as e:
-            print(f"⚠️  Warning: Error processing leaderboard data for {game_id}: {e}")
+
+        if not top_scores:
+            print(f"ℹ️  No scores found for game {game_id}")
             return None
+        return top_scores
 
-    def get_last_week_highlight(self):
-        """Get information about the highest score from last week's game."""
+    def get_last_week_highlight(self, current_seed=None):
+        """Get information about the highest score from the week before current_seed (default: this sender's week)."""
         try:
             # Get previous week's seed based on current week
             # Extract current seed from plinko_url
-            current_seed = self.plinko_url.split('/')[-1]
+            current_seed = current_seed or self.plinko_url.split('/')[-1]
             prev_week_seed = self.get_previous_week_seed(current_seed)
             print(f"🔍 Looking for previous week's game (seed: {prev_week_seed})...")
             
@@ -304,14 +352,19 @@ class NewsletterSender:
             
             # Get the top scores for that game
             top_scores = self.get_top_scores(prev_game_id, top_count=3)
+            if not top_scores:
+                # Fall back to the snapshot archived by archive_leaderboards.py
+                archived = read_history_week(prev_week_seed)
+                if archived and archived['game_id'] == prev_game_id and archived['top']:
+                    print(f"📚 Using the archived top scores of week {prev_week_seed} (taken {archived['taken_at']})")
+                    top_scores = archived['top'][:3]
             if not top_scores:
                 print("⚠️  Could not fetch top scores for previous week's game")
                 return None
             
             print(f"🏆 Top scores found:")
             for score in top_scores:
-                medal = "🥇" if score['rank'] == 1 else "🥈" if score['rank'] == 2 else "🥉"
-                print(f"  {medal} {score['player']}: {score['score']:,}")
+                print(f"  {medal(score['rank'])} {score['player']}: {score['score']:,}")
             
             return {
                 'game_id': prev_game_id,
@@ -415,10 +468,10 @@ class NewsletterSender:
     
     def read_game_metadata(self, game_id):
         """Read metadata from public/games/{gameid}/metadata.yaml."""
-        meta_path = f'public/games/{game_id}/metadata.yaml'
+        metadata = get_game_metadata()
+        meta_path = metadata.path(game_id)
         try:
-            with open(meta_path, 'r') as f:
-                meta = yaml.safe_load(f)
+            meta = metadata.get(game_id)
             
             # Validate required fields
             missing_fields = []
@@ -459,6 +512,67 @@ class NewsletterSender:
             print(f"Error: Invalid YAML in metadata file for game {game_id}: {e}")
             sys.exit(1)
     
+    def build_context(self, week_seed=None, custom_message=None):
+        """Resolve the week's game, its metadata and last week's highlight once, into a NewsletterContext."""
+        seed = week_seed or get_current_week_seed()
+
+        # Read game data
+        print("📖 Reading game of the week...")
+        game_id = self.read_game_of_the_week(week_seed)
+        print(f'✅ Game of the week: {game_id}')
+
+        # Read metadata
+        print("📖 Reading game metadata...")
+        meta = self.read_game_metadata(game_id)
+        print('✅ Metadata:')
+        for k, v in meta.items():
+            print(f'  - {k}: {v}')
+
+        # Get announcement message from metadata, fallback to custom_message if provided
+        announcement_message = meta.get('announcement_message', '') or custom_message or ''
+
+        # Get last week's highlight
+        print("🏆 Getting last week's highlight...")
+        last_week_highlight = self.get_last_week_highlight(week_seed)
+        if last_week_highlight:
+            print(f"✅ Last week's highlight: Top {len(last_week_highlight['top_scores'])} scores on {last_week_highlight['game_title']}")
+            last_week_highlight = MappingProxyType(dict(
+                last_week_highlight,
+                top_scores=tuple(MappingProxyType(score) for score in last_week_highlight['top_scores']),
+            ))
+        else:
+            print("ℹ️  No last week's highlight available")
+
+        return NewsletterContext(
+            seed=seed,
+            game_id=game_id,
+            meta=MappingProxyType(dict(meta)),
+            announcement_message=announcement_message,
+            last_week_highlight=last_week_highlight,
+        )
+
+    def game_fields(self, game_id, meta):
+        """The template fields every format shares: links, title, developer, year, genre and the controls summary."""
+        return {
+            'play_url': f'https://felx.cc/b/{game_id}',
+            'cover_url': f'{BASE_URL}/games/{game_id}/cover.png',
+            'leaderboard_url': f'https://alloarcade.web.app/leaderboards/{game_id}',
+            'title': meta.get('title', game_id),
+            'developer': meta.get('developer', 'Inconnu'),
+            'year': meta.get('year', 'Inconnue'),
+            'genre': meta.get('genre', 'Non spécifié'),
+            'controls': self.summarize_controls(meta.get('controls')),
+        }
+
+    def render_highlight(self, template, score_line, last_week_highlight):
+        """Last week's top scores with their medals, through a highlight and a score-line template ('' without a highlight)."""
+        if not last_week_highlight:
+            return ''
+        return template.render(
+            game_title=last_week_highlight['game_title'],
+            scores=score_line.render_each(medal_scores(last_week_highlight['top_scores'])),
+        )
+
     def create_email_content(self, game_id, meta, custom_message=None, last_week_highlight=None):
         """
         Create email content for the newsletter.
@@ -466,37 +580,9 @@ class NewsletterSender:
         Note: This method assumes that meta['controls'] and meta['to_start'] are present
         and have values, as they are validated in read_game_metadata().
         """
-        from datetime import datetime
-        import re
-        cover_url = f'{BASE_URL}/games/{game_id}/cover.png'
-        play_url = f'https://felx.cc/b/{game_id}'
-        leaderboard_url = f'https://alloarcade.web.app/leaderboards/{game_id}'
-        title = meta.get('title', game_id)
+        fields = self.game_fields(game_id, meta)
         # Remove parenthetical content for display in email body
-        clean_title = re.sub(r'\s*\([^)]*\)', '', title).strip()
-        developer = meta.get('developer', 'Inconnu')
-        year = meta.get('year', 'Inconnue')
-        genre = meta.get('genre', 'Non spécifié')
-        controls = self.summarize_controls(meta.get('controls'))
-        description = clean_title
-        subject = f'🕹️ Jeu de la semaine - {title}'
-        
-        # Create last week's highlight section if available
-        last_week_html = ''
-        if last_week_highlight:
-            # Create the top scores list with medals
-            scores_list = ''
-            for score in last_week_highlight['top_scores']:
-                medal = "🥇" if score['rank'] == 1 else "🥈" if score['rank'] == 2 else "🥉"
-                scores_list += f'<li style="margin:8px 0;"><strong>{medal} {score["player"]}</strong>: {score["score"]:,} points</li>'
-            
-            last_week_html = f'''
-        <div style="background:#f8f9fa;border-left:4px solid #007bff;padding:16px;margin:18px 0;border-radius:4px;">
-            <h3 style="margin:0 0 12px 0;color:#007bff;">🏆 Top scores de la semaine dernière sur {last_week_highlight['game_title']}</h3>
-            <ul style="margin:0;padding-left:20px;font-size:1.1em;">
-                {scores_list}
-            </ul>
-        </div>'''
+        clean_title = re.sub(r'\s*\([^)]*\)', '', fields['title']).strip()
         
         # Get announcement message from metadata, fallback to custom_message if provided
         announcement_message = meta.get('announcement_message', '') or custom_message or ''
@@ -505,70 +591,35 @@ class NewsletterSender:
         if not announcement_message.strip():
             raise ValueError("Announcement message is empty. Cannot create email content without an announcement.")
         
-        custom_html = f'<div style="margin-bottom:18px;font-size:1.1em;">{announcement_message}</div>' if announcement_message else ''
-        html_content = f'''
-        <html><body>
-        <h1 style="color:#333;text-align:center;margin-bottom:30px;">🎮 Annonce du jeu de la semaine!</h1>
-        
-        <div style="background:#f0f8ff;border:2px solid #007bff;border-radius:8px;padding:20px;margin:20px 0;">
-            <h2 style="color:#007bff;margin-top:0;">🎯 Jeu de la semaine : {clean_title}</h2>
-            
-            <!-- Description du jeu -->
-            <div style="margin-bottom:20px;font-size:1.1em;line-height:1.6;">
-                {announcement_message}
-            </div>
-            
-            <!-- Layout responsive en deux colonnes -->
-            <div style="display:flex;flex-direction:row;gap:20px;align-items:flex-start;">
-                <div style="flex:1;min-width:0;">
-                    <ul style="margin:0;padding-left:20px;font-size:1.1em;">
-                        <li><b>Développeur :</b> {developer}</li>
-                        <li><b>Année :</b> {year}</li>
-                        <li><b>Genre :</b> {genre}</li>
-                        <li><b>Contrôles :</b> {controls}</li>
-                    </ul>
-                </div>
-                <div style="flex:1;min-width:0;text-align:center;">
-                    <img src="{cover_url}" alt="Cover de {clean_title}" style="max-width:100%;height:auto;border-radius:8px;box-shadow:0 4px 8px rgba(0,0,0,0.1);" />
-                </div>
-            </div>
-            
-            <!-- Media query pour mobile -->
-            <style>
-                @media (max-width: 600px) {{
-                    .game-section {{
-                        flex-direction: column !important;
-                    }}
-                    .game-section > div {{
-                        flex: none !important;
-                        width: 100% !important;
-                        margin-bottom: 15px;
-                    }}
-                    .game-section > div:last-child {{
-                        margin-bottom: 0;
-                    }}
-                }}
-            </style>
-        </div>
-        
-        <div style="text-align:center;margin:30px 0;">
-            <a href="{play_url}" style="background:#007bff;color:white;padding:15px 30px;text-decoration:none;border-radius:5px;font-size:18px;font-weight:bold;margin-right:15px;display:inline-block;margin-bottom:10px;">🎮 Jouer maintenant !</a>
-            <a href="{leaderboard_url}" style="background:#ffc107;color:#212529;padding:15px 30px;text-decoration:none;border-radius:5px;font-size:18px;font-weight:bold;display:inline-block;margin-bottom:10px;">🏆 Classements</a>
-        </div>
-        
-        {last_week_html}
-        
-        <p style="text-align:center;color:#666;font-style:italic;">Bonne semaine ! ☀️</p>
-        </body></html>
-        '''
+        html_content = EMAIL_BODY.render(
+            fields,
+            clean_title=clean_title,
+            announcement_message=announcement_message,
+            last_week_html=self.render_highlight(EMAIL_HIGHLIGHT, EMAIL_SCORE_LINE, last_week_highlight),
+        )
         return {
-            'description': description,
-            'subject': subject,
+            'description': clean_title,
+            'subject': f'🕹️ Jeu de la semaine - {fields["title"]}',
             'content': html_content
         }
     
-    def send_email(self, content):
-        """Send the email using ConvertKit API."""
+    def delivery_queue(self):
+        """A DeliveryQueue sharing this sender's session and outbox."""
+        return DeliveryQueue(self.outbox, session=self.session, max_attempts=self.max_attempts, resend=self.resend)
+
+    def broadcast_exists(self, subject):
+        """Return True if a ConvertKit broadcast with this subject already exists."""
+        response = self.session.get(f'{self.api_url}/broadcasts', params={'api_secret': self.api_secret}, timeout=TIMEOUT)
+        response.raise_for_status()
+        return any(broadcast.get('subject') == subject for broadcast in response.json().get('broadcasts', []))
+
+    def send_email(self, content, seed=None):
+        """Send the email using ConvertKit API.
+
+        The broadcast is retried on rate limits and transient errors, but after a
+        failure where ConvertKit may have created it (timeout, 5xx), only once
+        broadcast_exists() confirms it was not, so it is never created twice.
+        """
         if self.dry_run:
             print('=== DRY RUN MODE ===')
             print('Subject:', content['subject'])
@@ -590,24 +641,69 @@ class NewsletterSender:
         url = f'{self.api_url}/broadcasts'
         headers = {'Content-Type': 'application/json'}
         
-        try:
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            
-            print('API response code:', response.status_code)
+        queue = self.delivery_queue()
+        queue.add(
+            f"{seed or get_current_week_seed()}:convertkit:broadcast", MAILING_LIST_LABEL, url, data,
+            headers=headers,
+            safe_to_repeat=False,
+            already_delivered=lambda: self.broadcast_exists(content['subject'])
+        )
+        result = queue.run()[0]
+        if result.skipped:
+            print(f"⏭️  The broadcast for this week was already created ({result.key}), skipping")
             return True
-            
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error sending email: {e}")
-            if hasattr(e, 'response') and e.response:
-                print(f"Response: {e.response.text}")
-            return False
+        if result.ok:
+            if result.status_code:
+                print('API response code:', result.status_code)
+            else:
+                print('✅ ConvertKit already had the broadcast after an ambiguous failure; not creating it again')
+            return True
+        print(f"❌ Error sending email after {result.attempts} attempt{'s' if result.attempts != 1 else ''}: {result.error}")
+        if result.response is not None and result.response.text:
+            print(f"Response: {result.response.text}")
+        return False
     
-    def send_webhook(self, content, game_id, meta, webhook_map_path=None, filter_label=None, custom_message=None, last_week_highlight=None):
-        """Send a plaintext version of the newsletter to one or more webhooks, using a JSON map of label:{env,type}. Optionally filter by label."""
-        import requests
-        import os
-        import json
+    def create_webhook_message(self, context):
+        """Create the plaintext webhook message of a context, with {b} marking bold text."""
+        announcement_message = context.announcement_message
+        
+        # Validate that we have an announcement message
+        if not announcement_message.strip():
+            raise ValueError("Announcement message is empty. Cannot send webhook without an announcement.")
+        
+        return WEBHOOK_BODY.render(
+            self.game_fields(context.game_id, context.meta),
+            custom_text=f"{announcement_message}\n\n" if announcement_message else '',
+            last_week_text=self.render_highlight(WEBHOOK_HIGHLIGHT, WEBHOOK_SCORE_LINE, context.last_week_highlight),
+        ).strip()
+
+    def render(self, context, email=True, webhooks=True):
+        """Render a context once per output format.
+
+        Returns {'email': {description, subject, content}, 'webhooks': {type: text}};
+        formats that are not requested are left out.
+        """
+        rendered = {}
+        if email:
+            print("✍️  Generating email content...")
+            rendered['email'] = self.create_email_content(
+                context.game_id, context.meta,
+                custom_message=context.announcement_message,
+                last_week_highlight=context.last_week_highlight
+            )
+            print(f'✅ Email content ready: {rendered["email"]["subject"]}')
+        if webhooks:
+            rendered['webhooks'] = render_webhook_messages(self.create_webhook_message(context))
+        return rendered
+
+    def send_webhook(self, messages, webhook_map_path=None, filter_label=None, seed=None):
+        """Send the plaintext newsletter to one or more webhooks, using a JSON map of label:{env,type}. Optionally filter by label (or a list of labels).
+
+        messages holds the message already rendered for each webhook type (see render()).
+        The webhooks are posted concurrently, with retries, through a DeliveryQueue
+        (see arcade_core/delivery.py); labels already sent for the week's seed are
+        skipped. Returns the list of DeliveryResults, or None when nothing was sent.
+        """
         if webhook_map_path is None:
             webhook_map_path = "webhook_map.json"
         # Read webhook map JSON file
@@ -620,83 +716,19 @@ class NewsletterSender:
             except Exception as e:
                 print(f"⚠️  Failed to parse webhook map JSON: {e}. Skipping webhook notification.")
                 return
-        play_url = f'https://felx.cc/b/{game_id}'
-        cover_url = f'{BASE_URL}/games/{game_id}/cover.png'
-        leaderboard_url = f'https://alloarcade.web.app/leaderboards/{game_id}'
-        title = meta.get('title', game_id)
-        developer = meta.get('developer', 'Inconnu')
-        year = meta.get('year', 'Inconnue')
-        genre = meta.get('genre', 'Non spécifié')
-        controls = self.summarize_controls(meta.get('controls'))
-        
-        # Create last week's highlight text if available
-        last_week_text = ''
-        if last_week_highlight:
-            # Create the top scores list with medals
-            scores_list = ''
-            for score in last_week_highlight['top_scores']:
-                medal = "🥇" if score['rank'] == 1 else "🥈" if score['rank'] == 2 else "🥉"
-                scores_list += f"{medal} {score['player']}: {score['score']:,} points\n"
-            
-            last_week_text = f"""
-Top scores de la semaine dernière sur {last_week_highlight['game_title']} :
-{scores_list}"""
-        
-        # Get announcement message from metadata, fallback to custom_message if provided
-        announcement_message = meta.get('announcement_message', '') or custom_message or ''
-        
-        # Validate that we have an announcement message
-        if not announcement_message.strip():
-            raise ValueError("Announcement message is empty. Cannot send webhook without an announcement.")
-        
-        custom_text = f"{announcement_message}\n\n" if announcement_message else ''
-        # Message template with {b} for bold, now includes plinko link and last week's highlight
-        message_template = f"""
-Annonce du jeu de la semaine!
-{custom_text}{{b}}Jeu de la semaine :{{b}} {title}
-{{b}}Développeur :{{b}} {developer}
-{{b}}Année :{{b}} {year}
-{{b}}Genre :{{b}} {genre}
-{{b}}Contrôles :{{b}} {controls}
-{{b}}Image :{{b}} {cover_url}
-{{b}}Classements :{{b}} {leaderboard_url}
-
-🕹️ {{b}}Faites-en l'essai :{{b}} {play_url}
-{last_week_text}
-Bonne semaine ! ☀️
-""".strip()
-        sent_any = False
-        # If filter_label is set, only use that label
+        # If filter_label is set, only use that label (or those labels, for a list)
         if filter_label:
-            if filter_label not in webhook_map:
-                print(f"⚠️  Webhook label '{filter_label}' not found in map. Skipping webhook notification.")
+            labels = [filter_label] if isinstance(filter_label, str) else list(filter_label)
+            for label in labels:
+                if label not in webhook_map:
+                    print(f"⚠️  Webhook label '{label}' not found in map. Skipping it.")
+            items = [(label, webhook_map[label]) for label in labels if label in webhook_map]
+            if not items:
+                print("⚠️  No known webhook label selected. Skipping webhook notification.")
                 return
-            items = [(filter_label, webhook_map[filter_label])]
         else:
             items = webhook_map.items()
-        if self.dry_run:
-            print("=== DRY RUN MODE (WEBHOOKS) ===")
-            for label, info in items:
-                env_var = info.get('env')
-                wtype = info.get('type')
-                url = os.getenv(env_var) if env_var else None
-                if not url:
-                    print(f"⚠️  Env var '{env_var}' for webhook label '{label}' is not set. Skipping.")
-                    continue
-                if wtype == 'discord':
-                    bold = '**'
-                    payload = {"content": message_template.replace('{b}', bold)}
-                elif wtype == 'googlechat':
-                    bold = '*'
-                    payload = {"text": message_template.replace('{b}', bold)}
-                else:
-                    print(f"⚠️  Unknown webhook type '{wtype}' for label '{label}'. Skipping.")
-                    continue
-                print(f"[DRY RUN] Would send webhook to '{label}' (env: {env_var}, type: {wtype}, url: {url}):\n{payload}\n")
-                sent_any = True
-            if not sent_any:
-                print("⚠️  No webhook messages would be sent (no valid URLs found).")
-            return
+        targets = []
         for label, info in items:
             env_var = info.get('env')
             wtype = info.get('type')
@@ -704,109 +736,207 @@ Bonne semaine ! ☀️
             if not url:
                 print(f"⚠️  Env var '{env_var}' for webhook label '{label}' is not set. Skipping.")
                 continue
-            if wtype == 'discord':
-                bold = '**'
-                payload = {"content": message_template.replace('{b}', bold)}
-            elif wtype == 'googlechat':
-                bold = '*'
-                payload = {"text": message_template.replace('{b}', bold)}
-            else:
+            payload = webhook_payload(wtype, messages.get(wtype))
+            if payload is None:
                 print(f"⚠️  Unknown webhook type '{wtype}' for label '{label}'. Skipping.")
                 continue
-            try:
-                resp = requests.post(url, json=payload)
-                resp.raise_for_status()
-                print(f"✅ Webhook message sent to '{label}' (env: {env_var}, type: {wtype})")
-                sent_any = True
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Error sending webhook to '{label}' (env: {env_var}, type: {wtype}): {e}")
-                if hasattr(e, 'response') and e.response:
-                    print(f"Response: {e.response.text}")
-        if not sent_any:
+            targets.append(WebhookTarget(label, wtype, env_var, url, payload))
+        if self.dry_run:
+            print("=== DRY RUN MODE (WEBHOOKS) ===")
+            for target in targets:
+                print(f"[DRY RUN] Would send webhook to '{target.label}' (env: {target.env}, type: {target.type}, url: {target.url}):\n{target.payload}\n")
+            if not targets:
+                print("⚠️  No webhook messages would be sent (no valid URLs found).")
+            return
+        if not targets:
             print("⚠️  No webhook messages sent (no valid URLs found).")
+            return
+        # Post to every webhook at once; a slow endpoint only costs its own timeout and retries
+        print(f"📤 Sending {len(targets)} webhook message{'s' if len(targets) > 1 else ''}...")
+        seed = seed or get_current_week_seed()
+        queue = self.delivery_queue()
+        for target in targets:
+            queue.add(f"{seed}:webhook:{target.label}", target.label, target.url, target.payload)
+        results = queue.run()
+        print_delivery_report(results, 'Webhooks')
+        return results
 
-    def run(self, webhook_map_path=None, filter_label=None, mail_only=False, custom_message=None, week_seed=None):
-        """
-        Run the newsletter process with the following safety rules:
-        - If webhook_only=True: Send webhooks (respecting filter_label) and skip email
-        - If mail_only=True: Send only the email (no webhooks)
-        - If neither flag is set: Send both webhooks and email
-        - If dry_run=True: Skip ConvertKit API call, but still generate and preview content
+    def deliver(self, context, send_email=True, send_webhooks=True, webhook_map_path=None, filter_label=None):
+        """Render a context once and hand it to the selected transports: webhooks first, then the email.
+
+        filter_label (a label or a list of labels) restricts the webhooks; dry_run is respected by both.
         """
-        print('📧 Starting newsletter email process...')
-        
-        # Read game data
-        print("📖 Reading game of the week...")
-        game_id = self.read_game_of_the_week(week_seed)
-        print(f'✅ Game of the week: {game_id}')
-        
-        # Read metadata
-        print("📖 Reading game metadata...")
-        meta = self.read_game_metadata(game_id)
-        print('✅ Metadata:')
-        for k, v in meta.items():
-            print(f'  - {k}: {v}')
-        
-        # Get last week's highlight
-        print("🏆 Getting last week's highlight...")
-        last_week_highlight = self.get_last_week_highlight()
-        if last_week_highlight:
-            print(f"✅ Last week's highlight: Top {len(last_week_highlight['top_scores'])} scores on {last_week_highlight['game_title']}")
-        else:
-            print("ℹ️  No last week's highlight available")
-        
-        # Generate email content
-        print("✍️  Generating email content...")
-        content = self.create_email_content(game_id, meta, custom_message=custom_message, last_week_highlight=last_week_highlight)
-        print(f'✅ Email content ready: {content["subject"]}')
-        
-        # Webhook-only: send webhooks and exit before email
-        if self.webhook_only:
-            self.send_webhook(
-                content, game_id, meta,
+        rendered = self.render(context, email=send_email, webhooks=send_webhooks)
+
+        webhooks_failed = False
+        if send_webhooks:
+            results = self.send_webhook(
+                rendered['webhooks'],
                 webhook_map_path=webhook_map_path,
                 filter_label=filter_label,
-                custom_message=custom_message,
-                last_week_highlight=last_week_highlight
+                seed=context.seed
             )
+            webhooks_failed = any(not result.ok for result in results or [])
+
+        if not send_email:
             print("🛑 Webhook-only mode: Skipping email send.")
+            if webhooks_failed:
+                print("💥 Some webhook messages could not be sent; re-run to retry only those")
+                sys.exit(1)
             return
-        
-        # If not mail-only, send webhooks (normal case: both)
-        if not mail_only:
-            self.send_webhook(
-                content, game_id, meta,
-                webhook_map_path=webhook_map_path,
-                filter_label=filter_label,
-                custom_message=custom_message,
-                last_week_highlight=last_week_highlight
-            )
-        
-        # Mail-only: do NOT return early; proceed to email sending only
+
         # Send email (but respect dry_run flag)
         if not self.dry_run:
             print("📤 Sending email...")
-            success = self.send_email(content)
+            success = self.send_email(rendered['email'], seed=context.seed)
             if success:
                 print("🎉 Newsletter sent successfully!")
             else:
                 print("💥 Failed to send newsletter")
                 sys.exit(1)
+            if webhooks_failed:
+                print("💥 Some webhook messages could not be sent; re-run to retry only those")
+                sys.exit(1)
         else:
             print("🛑 DRY RUN MODE: Skipping email send.")
             # Print HTML content for preview when ConvertKit is selected
             print("\n" + "="*50)
             print("📧 EMAIL HTML PREVIEW (DRY RUN)")
             print("="*50)
-            print(content['content'])
+            print(rendered['email']['content'])
             print("="*50)
 
+    def run(self, webhook_map_path=None, filter_label=None, mail_only=False, custom_message=None, week_seed=None, context=None):
+        """
+        Run the newsletter process with the following safety rules:
+        - If webhook_only=True: Send webhooks (respecting filter_label) and skip email
+        - If mail_only=True: Send only the email (no webhooks)
+        - If neither flag is set: Send both webhooks and email
+        - If dry_run=True: Skip ConvertKit API call, but still generate and preview content
+
+        Pass a context from build_context() to reuse an already resolved game.
+        """
+        print('📧 Starting newsletter email process...')
+        if context is None:
+            context = self.build_context(week_seed, custom_message)
+        self.deliver(
+            context,
+            send_email=not self.webhook_only,
+            send_webhooks=not mail_only,
+            webhook_map_path=webhook_map_path,
+            filter_label=filter_label
+        )
+
+PREVIEW_DIR = 'newsletter-previews'
+PREVIEW_JOBS = 4
+
+PreviewResult = namedtuple('PreviewResult', ['seed', 'game_id', 'subject', 'files', 'error', 'elapsed'])
+PreviewResult.__doc__ = """Outcome of rendering one week's preview: files maps each format to the file written, error is None on success."""
+
+
+class ThreadOutput:
+    """A sys.stdout stand-in sending the prints of each batch worker thread to its own buffer.
+
+    Threads that did not start capturing (the main thread) still print to the real output.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.buffer = io.StringIO()
+
+    def release(self):
+        """Stop capturing the current thread's prints and return them."""
+        buffer = getattr(self.local, 'buffer', None)
+        self.local.buffer = None
+        return buffer.getvalue() if buffer is not None else ''
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer if buffer is not None else self.output).write(text)
+
+    def flush(self):
+        self.output.flush()
+
+
+def render_preview(sender, seed, output_dir, custom_message=None):
+    """Resolve and render one week, writing its email and webhook messages to output_dir."""
+    start = time.perf_counter()
+    context = sender.build_context(seed, custom_message)
+    rendered = sender.render(context)
+    files = {}
+    stem = os.path.join(output_dir, f"{seed}-{context.game_id}")
+    outputs = [('email', '.html', rendered['email']['content'])]
+    outputs += [(wtype, f'.{wtype}.txt', text) for wtype, text in rendered['webhooks'].items()]
+    for name, suffix, text in outputs:
+        with open(stem + suffix, 'w', encoding='utf-8') as f:
+            f.write(text)
+        files[name] = os.path.basename(stem + suffix)
+    return PreviewResult(seed, context.game_id, rendered['email']['subject'], files, None, time.perf_counter() - start)
+
+
+def write_preview_index(results, output_dir):
+    """Write index.html, linking every week's previews (and the log of the weeks that failed)."""
+    rows = []
+    for result in results:
+        if result.error is None:
+            links = ' '.join(f'<a href="{html.escape(path)}">{html.escape(name)}</a>' for name, path in result.files.items())
+            rows.append(f'<tr><td>{result.seed}</td><td>{html.escape(result.game_id)}</td>'
+                        f'<td>{html.escape(result.subject)}</td><td>{links}</td></tr>')
+        else:
+            rows.append(f'<tr><td>{result.seed}</td><td>{html.escape(result.game_id or "?")}</td>'
+                        f'<td>❌ {html.escape(result.error)}</td><td><a href="{result.seed}.log">log</a></td></tr>')
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<html><head><meta charset="utf-8"><title>Newsletter previews</title></head><body>\n'
+                '<table border="1" cellpadding="6">\n<tr><th>Seed</th><th>Game</th><th>Subject</th><th>Previews</th></tr>\n'
+                + '\n'.join(rows) + '\n</table>\n</body></html>\n')
+
+
+def render_previews(sender, seeds, output_dir=PREVIEW_DIR, custom_message=None, jobs=PREVIEW_JOBS):
+    """Render the previews of several weeks concurrently into output_dir. Returns the PreviewResults, by seed.
+
+    Nothing is sent. Each week's log (what a single-week run would print) is written
+    to <seed>.log, and a week that fails (missing metadata, unknown game...) does
+    not stop the others.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Load the schedule and the gamelist once, before the workers share them
+    get_predictions().available()
+    get_catalog().exists()
+
+    output = ThreadOutput(sys.stdout)
+
+    def work(seed):
+        output.capture()
+        start = time.perf_counter()
+        try:
+            result = render_preview(sender, seed, output_dir, custom_message)
+        except SystemExit:
+            result = PreviewResult(seed, None, None, {}, 'stopped before rendering (see its log)', time.perf_counter() - start)
+        except Exception as e:
+            result = PreviewResult(seed, None, None, {}, str(e), time.perf_counter() - start)
+        with open(os.path.join(output_dir, f"{seed}.log"), 'w', encoding='utf-8') as f:
+            f.write(output.release())
+        return result
+
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(seeds)))) as pool:
+            results = list(pool.map(work, seeds))
+    finally:
+        sys.stdout = output.output
+    write_preview_index(results, output_dir)
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description='Send BonjourArcade newsletter')
     parser.add_argument('--dry-run', action='store_true', 
                        help='Show what would be sent without actually sending')
-    parser.add_argument('--mail-api-url', default=DEFAULT_API_URL,
-                       help='ConvertKit API URL (for sending email/broadcasts)')
+    parser.add_argument('--mail-api-url', default=os.getenv('CONVERTKIT_API_URL', DEFAULT_API_URL),
+                       help=f'ConvertKit API URL (for sending email/broadcasts; default: $CONVERTKIT_API_URL or {DEFAULT_API_URL})')
     parser.add_argument('--webhook-only', action='store_true',
                        help='Send only to webhook and skip email (for testing)')
     parser.add_argument('--mail-only', action='store_true',
@@ -819,62 +949,101 @@ def main():
                       help='Override the announcement message from metadata.yaml (appears at the top of the email and webhook)')
     parser.add_argument('--week-seed', default=None, type=str,
                       help='Specific week seed (YYYYWW format) to use instead of current week (useful for testing or past weeks)')
+    parser.add_argument('--outbox', default=os.getenv('NEWSLETTER_OUTBOX', OUTBOX_PATH),
+                      help=f'Delivery outbox; deliveries it records as sent for the week are skipped (default: $NEWSLETTER_OUTBOX or {OUTBOX_PATH})')
+    parser.add_argument('--max-attempts', default=MAX_ATTEMPTS, type=int,
+                      help=f'Attempts per delivery before giving up (default: {MAX_ATTEMPTS})')
+    parser.add_argument('--resend', action='store_true',
+                      help='Send again even the deliveries the outbox records as sent')
+    parser.add_argument('--weeks', default=None, type=str,
+                      help='Render previews of these scheduled weeks instead of sending ("202540..202552", "202540,202542"); nothing is sent')
+    parser.add_argument('--output-dir', default=PREVIEW_DIR,
+                      help=f'Directory for the --weeks previews (default: {PREVIEW_DIR})')
+    parser.add_argument('--jobs', default=PREVIEW_JOBS, type=int,
+                      help=f'Weeks rendered in parallel with --weeks (default: {PREVIEW_JOBS})')
     
     args = parser.parse_args()
 
     # Use custom message from command line if provided, otherwise it will be read from metadata
     custom_message = args.custom_message
 
+    if args.weeks:
+        schedule = get_predictions().schedule
+        if schedule is None:
+            print("❌ Error: predictions.yaml not found")
+            sys.exit(1)
+        try:
+            seeds = schedule.select(args.weeks)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        if not seeds:
+            print(f"⚠️  No scheduled week matches {args.weeks}")
+            sys.exit(1)
+        # Previews never send anything, so no API secret and no outbox are needed
+        sender = NewsletterSender(api_secret=None, dry_run=args.dry_run, outbox_path=None)
+        start_time = time.perf_counter()
+        print(f"🖨️  Rendering {len(seeds)} week{'s' if len(seeds) != 1 else ''} ({seeds[0]}..{seeds[-1]}) into {args.output_dir}...")
+        results = render_previews(sender, seeds, args.output_dir, custom_message, args.jobs)
+        for result in results:
+            if result.error is None:
+                print(f"✅ {result.seed} {result.game_id}: {result.subject} ({result.elapsed:.2f}s)")
+            else:
+                print(f"❌ {result.seed}: {result.error} ({args.output_dir}/{result.seed}.log)")
+        failed = sum(1 for result in results if result.error is not None)
+        print(f"📊 Previews: {len(results) - failed}/{len(results)} rendered in {time.perf_counter() - start_time:.2f}s; "
+              f"open {os.path.join(args.output_dir, 'index.html')}")
+        if failed:
+            sys.exit(1)
+        return
+
     api_secret = os.getenv('CONVERTKIT_API_SECRET')
     if not api_secret:
         print('❌ Error: API secret is required. Set CONVERTKIT_API_SECRET environment variable.')
         sys.exit(1)
     
-    # EARLY VALIDATION: Check if we have an announcement message and required metadata fields before any user interaction
-    if not custom_message:
-        print("🔍 Checking game of the week metadata...")
-        try:
-            # Create a temporary sender to check the metadata
-            temp_sender = NewsletterSender(
-                api_secret=api_secret,
-                api_url=args.mail_api_url,
-                dry_run=True,  # Use dry run to avoid any actual sending
-                webhook_only=False,
-                week_seed=args.week_seed
-            )
-            
-            # Read game data and metadata to check announcement and required fields
-            game_id = temp_sender.read_game_of_the_week(args.week_seed)
-            meta = temp_sender.read_game_metadata(game_id)
-            
-            # Check announcement message
-            announcement_message = meta.get('announcement_message', '')
-            if not announcement_message.strip():
-                print("❌ ERROR: The announcement message for the game of the week is empty!")
-                print("📝 Please add an 'announcement_message' field to the metadata.yaml file")
-                print(f"   File: public/games/{game_id}/metadata.yaml")
-                print("   Or use --custom-message to provide a message via command line.")
-                print("\n🛑 Aborting newsletter send to allow you to write the announcement.")
-                print("\n💡 Example of what to add to metadata.yaml:")
-                print("   announcement_message: \"Ce jeu classique de plateforme vous emmène dans une aventure...\"")
-                print("\n💡 Or run with: --custom-message \"Your announcement text here\"")
-                print("\n📝 The announcement message should describe why this game is special,")
-                print("   what makes it fun, or any interesting facts about it.")
-                print("   This text appears prominently at the top of the newsletter.")
-                print(f"\n📋 Current metadata structure for {game_id}:")
-                for key, value in meta.items():
-                    if key == 'announcement_message':
-                        print(f"   {key}: {'[EMPTY]' if not value else value[:50] + '...' if len(str(value)) > 100 else value}")
-                    else:
-                        print(f"   {key}: {value}")
-                sys.exit(1)
-            
-            print(f"✅ Announcement message found: {announcement_message[:100]}{'...' if len(announcement_message) > 100 else ''}")
-            print("✅ Required metadata fields (controls, to_start) are present")
-            
-        except Exception as e:
-            print(f"⚠️  Warning: Could not validate metadata early: {e}")
-            print("   Will check again during the main process...")
+    sender = NewsletterSender(
+        api_secret=api_secret,
+        api_url=args.mail_api_url,
+        dry_run=args.dry_run,
+        webhook_only=args.webhook_only,
+        week_seed=args.week_seed,
+        outbox_path=args.outbox,
+        max_attempts=args.max_attempts,
+        resend=args.resend
+    )
+
+    # Resolve the game, its metadata and last week's highlight once, before any user
+    # interaction; every selected transport is then rendered from this context
+    print('📧 Starting newsletter email process...')
+    context = sender.build_context(args.week_seed, custom_message)
+    game_id = context.game_id
+    meta = context.meta
+
+    # EARLY VALIDATION: Check if we have an announcement message (required metadata fields are checked by build_context)
+    announcement_message = context.announcement_message
+    if not announcement_message.strip():
+        print("❌ ERROR: The announcement message for the game of the week is empty!")
+        print("📝 Please add an 'announcement_message' field to the metadata.yaml file")
+        print(f"   File: public/games/{game_id}/metadata.yaml")
+        print("   Or use --custom-message to provide a message via command line.")
+        print("\n🛑 Aborting newsletter send to allow you to write the announcement.")
+        print("\n💡 Example of what to add to metadata.yaml:")
+        print("   announcement_message: \"Ce jeu classique de plateforme vous emmène dans une aventure...\"")
+        print("\n💡 Or run with: --custom-message \"Your announcement text here\"")
+        print("\n📝 The announcement message should describe why this game is special,")
+        print("   what makes it fun, or any interesting facts about it.")
+        print("   This text appears prominently at the top of the newsletter.")
+        print(f"\n📋 Current metadata structure for {game_id}:")
+        for key, value in meta.items():
+            if key == 'announcement_message':
+                print(f"   {key}: {'[EMPTY]' if not value else value[:50] + '...' if len(str(value)) > 100 else value}")
+            else:
+                print(f"   {key}: {value}")
+        sys.exit(1)
+
+    print(f"✅ Announcement message found: {announcement_message[:100]}{'...' if len(announcement_message) > 100 else ''}")
+    print("✅ Required metadata fields (controls, to_start) are present")
     
     # Interactive webhook selection if no --webhook-label is provided
     selected_webhook_labels = None
@@ -892,7 +1061,6 @@ def main():
             if webhook_map:
                 choices = list(webhook_map.keys())
                 # Add ConvertKit Email as a selectable option
-                MAILING_LIST_LABEL = "ConvertKit Email"
                 choices.insert(0, MAILING_LIST_LABEL)
                 selected = questionary.checkbox(
                     "Sélectionnez les webhooks auxquels envoyer :",
@@ -908,63 +1076,32 @@ def main():
         # In mail-only mode, we don't need webhook selection
         selected_webhook_labels = None
 
-    sender = NewsletterSender(
-        api_secret=api_secret,
-        api_url=args.mail_api_url,
-        dry_run=args.dry_run,
-        webhook_only=args.webhook_only,
-        week_seed=args.week_seed
-    )
-    
-    # If selected_webhook_labels is set, send to each label in turn
+    # If selected_webhook_labels is set, send the context to every selected transport at once
     if selected_webhook_labels is not None:
-        MAILING_LIST_LABEL = "ConvertKit Email"
-        # If ConvertKit Email is selected, send ONLY the email
-        if MAILING_LIST_LABEL in selected_webhook_labels:
-            sender.run(
-                webhook_map_path=args.webhook_map,
-                filter_label=None,
-                mail_only=True,     # Email only
-                custom_message=custom_message,
-                week_seed=args.week_seed
-            )
-            # Remove it from the list so it's not treated as a webhook
-            selected_webhook_labels = [lbl for lbl in selected_webhook_labels if lbl != MAILING_LIST_LABEL]
-        
-        # Send each selected webhook as webhook-only runs
-        for label in selected_webhook_labels or []:
-            # For each webhook, run in webhook-only mode so no email is sent
-            sender.webhook_only = True
-            sender.run(
-                webhook_map_path=args.webhook_map,
-                filter_label=label,
-                mail_only=False,
-                custom_message=custom_message,
-                week_seed=args.week_seed
-            )
-            # Reset webhook_only flag for safety
-            sender.webhook_only = args.webhook_only
+        # ConvertKit Email is a pseudo-label for the mailing list, not a webhook
+        send_email = MAILING_LIST_LABEL in selected_webhook_labels
+        webhook_labels = [lbl for lbl in selected_webhook_labels if lbl != MAILING_LIST_LABEL]
+        sender.deliver(
+            context,
+            send_email=send_email,
+            send_webhooks=bool(webhook_labels),
+            webhook_map_path=args.webhook_map,
+            filter_label=webhook_labels
+        )
     else:
         # In non-interactive mode, respect flags
         if args.dry_run:
             print("🛑 DRY RUN MODE: Skipping ConvertKit email send.")
         if args.webhook_only:
-            sender.run(
+            sender.deliver(
+                context,
+                send_email=False,
                 webhook_map_path=args.webhook_map,
-                filter_label=args.webhook_label,
-                mail_only=False,
-                custom_message=custom_message,
-                week_seed=args.week_seed
+                filter_label=args.webhook_label
             )
         elif args.mail_only or (not args.webhook_label and not args.webhook_only):
             # Default to email only if no webhook label is specified and not webhook-only
-            sender.run(
-                webhook_map_path=args.webhook_map,
-                filter_label=None,
-                mail_only=True,
-                custom_message=custom_message,
-                week_seed=args.week_seed
-            )
+            sender.deliver(context, send_email=True, send_webhooks=False)
 
 if __name__ == '__main__':
     main() 
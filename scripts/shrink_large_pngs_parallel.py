@@ -1,8 +1,17 @@
+import argparse
+import fnmatch
+import hashlib
+import io
+import json
 import os
 import glob
+import subprocess
+import time
 import multiprocessing as mp
 from PIL import Image
 
+from arcade_core.telemetry import Telemetry
+
 try:
     from tqdm import tqdm
     use_tqdm = True
@@ -11,6 +20,9 @@ except ImportError:
 
 MAX_SIZE = 100 * 1024  # 100KB in bytes (matching your original script)
 TARGET_WIDTH = 800  # fallback width for resizing if needed
+MIN_WIDTH = 100  # never resize below this width
+COVER_PATTERN = "public/games/*/cover.png"
+MANIFEST_PATH = ".cache/png-shrink/manifest.json"  # hashes of covers that are already as small as we can make them
 
 
 def is_ci_environment():
@@ -23,6 +35,95 @@ def is_ci_environment():
     return any(os.environ.get(var) for var in ci_vars)
 
 
+def encode_png(img):
+    """Encode an image as an optimized PNG in memory and return the bytes."""
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def to_palette(img):
+    """Quantize an RGB/RGBA image to a 256-color palette (FASTOCTREE is the only method that keeps alpha)."""
+    method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    return img.quantize(colors=256, method=method)
+
+
+def write_atomic(filepath, data):
+    """Replace filepath with data in a single write."""
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+
+
+def solve_png(img, max_size=MAX_SIZE):
+    """Find the cheapest encoding of img that fits in max_size, keeping as many pixels as possible.
+
+    Tries, in order: lossless recompression, a 256-color palette, then a binary
+    search on the width (guided by the size/area ratio of the last encode) for
+    the largest resize that fits. Everything is encoded in memory.
+
+    Returns (data, (width, height), steps, encodes); data is the smallest
+    encoding found when nothing fits.
+    """
+    encodes = 0
+    steps = []
+
+    data = encode_png(img)
+    encodes += 1
+    if len(data) <= max_size:
+        steps.append(f"Optimized to {len(data) // 1024} KB")
+        return data, img.size, steps, encodes
+
+    if img.mode in ('1', 'P', 'L', 'LA', 'I', 'F'):
+        # Resample in full color; palette images can only be resized with NEAREST
+        img = img.convert('RGBA' if img.mode in ('LA', 'P') else 'RGB')
+
+    use_palette = img.mode in ('RGB', 'RGBA')
+    if use_palette:
+        quantized = encode_png(to_palette(img))
+        encodes += 1
+        if len(quantized) <= max_size:
+            steps.append(f"Quantized to 256 colors, {len(quantized) // 1024} KB")
+            return quantized, img.size, steps, encodes
+        if len(quantized) < len(data):
+            data = quantized
+            steps.append(f"Quantized to 256 colors, {len(data) // 1024} KB")
+        else:
+            use_palette = False
+
+    width, height = img.size
+    best = None
+    smallest = (data, img.size)
+    lo, hi = MIN_WIDTH, width - 1  # widths known to fit (lo is a guess) / known not to fit
+    last_width, last_size = width, len(data)
+    tolerance = max(1, width // 100)
+    while lo <= hi:
+        # Aim for max_size assuming the encoded size scales with the pixel count
+        guess = int(last_width * (max_size / last_size) ** 0.5 * 0.98)
+        probe = min(max(guess, lo), hi) if best is None else (lo + hi) // 2
+        probe_height = max(1, round(height * probe / width))
+        resized = img.resize((probe, probe_height), Image.LANCZOS)
+        candidate = encode_png(to_palette(resized) if use_palette else resized)
+        encodes += 1
+        last_width, last_size = probe, len(candidate)
+        if len(candidate) <= max_size:
+            best = (candidate, (probe, probe_height))
+            lo = probe + 1
+        else:
+            if len(candidate) < len(smallest[0]):
+                smallest = (candidate, (probe, probe_height))
+            hi = probe - 1
+        if best is not None and hi - best[1][0] < tolerance:
+            break
+
+    if best is None:
+        steps.append(f"Resized to {smallest[1][0]}x{smallest[1][1]}, {len(smallest[0]) // 1024} KB")
+        return smallest[0], smallest[1], steps, encodes
+    steps.append(f"Resized to {best[1][0]}x{best[1][1]}, {len(best[0]) // 1024} KB")
+    return best[0], best[1], steps, encodes
+
+
 def shrink_png(filepath):
     """Shrink PNG file to be under MAX_SIZE, overwriting the original."""
     try:
@@ -31,76 +132,151 @@ def shrink_png(filepath):
             return f"OK: {filepath} is already under {MAX_SIZE // 1024}KB ({orig_size // 1024} KB)"
 
         result_msg = f"Shrinking: {filepath} ({orig_size // 1024} KB)"
-        
+
         with Image.open(filepath) as img:
-            # Try saving with optimization first
-            img.save(filepath, optimize=True)
-            new_size = os.path.getsize(filepath)
-            if new_size <= MAX_SIZE:
-                result_msg += f" -> Optimized to {new_size // 1024} KB"
-                return result_msg
-            
-            # If still too big, resize down until under MAX_SIZE
-            width, height = img.size
-            while new_size > MAX_SIZE and width > 100:
-                width = int(width * 0.9)
-                height = int(height * 0.9)
-                img_resized = img.resize((width, height), Image.LANCZOS)
-                img_resized.save(filepath, optimize=True)
-                new_size = os.path.getsize(filepath)
-                result_msg += f" -> Resized to {width}x{height}, {new_size // 1024} KB"
-                img = img_resized
-            
-            if new_size > MAX_SIZE:
-                result_msg += f" !! Could not shrink below {MAX_SIZE // 1024}KB (final size: {new_size // 1024} KB)"
-            else:
-                result_msg += f" -> Final size: {new_size // 1024} KB"
-        
+            img.load()
+            data, size, steps, encodes = solve_png(img)
+
+        for step in steps:
+            result_msg += f" -> {step}"
+
+        # Write the result once, and only if it is an improvement
+        if len(data) < orig_size:
+            write_atomic(filepath, data)
+            new_size = len(data)
+        else:
+            new_size = orig_size
+        if new_size > MAX_SIZE:
+            result_msg += f" !! Could not shrink below {MAX_SIZE // 1024}KB (final size: {new_size // 1024} KB)"
+        else:
+            result_msg += f" -> Final size: {new_size // 1024} KB"
+        result_msg += f" ({encodes} encode{'s' if encodes > 1 else ''})"
+
         return result_msg
-    
+
     except Exception as e:
         return f"ERROR processing {filepath}: {str(e)}"
 
 
+def timed_shrink(filepath):
+    """shrink_png() with its duration: (result message, seconds)."""
+    start = time.perf_counter()
+    result = shrink_png(filepath)
+    return result, time.perf_counter() - start
+
+
+def staged_png_files():
+    """Return the covers staged in git (added, copied, modified or renamed)."""
+    output = subprocess.run(
+        ['git', 'diff', '--cached', '--name-only', '--diff-filter=ACMR'],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return [path for path in output.splitlines()
+            if fnmatch.fnmatch(path, COVER_PATTERN) and os.path.isfile(path)]
+
+
+def file_hash(filepath):
+    with open(filepath, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r') as f:
+            return set(json.load(f).get('optimized', []))
+    except (OSError, ValueError, AttributeError):
+        return set()
+
+
+def save_manifest(hashes, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'optimized': sorted(hashes)}, f, indent=0)
+    os.replace(tmp_path, path)
+
+
 def main():
-    png_files = glob.glob("public/games/*/cover.png")
+    parser = argparse.ArgumentParser(description=f'Shrink game covers larger than {MAX_SIZE // 1024}KB')
+    parser.add_argument('--staged', action='store_true',
+                        help='Only process the covers staged in git (used by the pre-commit hook)')
+    parser.add_argument('--report', default=os.getenv('BUILD_REPORT'),
+                        help='Build report to merge the stage timings into (default: $BUILD_REPORT, none if unset)')
+    args = parser.parse_args()
+    telemetry = Telemetry('png-shrink', args.report)
+
+    png_files = staged_png_files() if args.staged else glob.glob(COVER_PATTERN)
     if not png_files:
-        print("No PNG files found.")
+        print("No staged PNG files." if args.staged else "No PNG files found.")
         return
-    
-    print(f"Found {len(png_files)} PNG files to process")
-    
-    # Check if we're in CI/CD environment
-    if is_ci_environment():
-        print("CI/CD environment detected - using single-process mode for reliability")
-        # Process files sequentially in CI/CD
-        results = []
+
+    # Covers under the limit need no work; covers whose content we already
+    # processed (e.g. ones that cannot get under the limit) are not reopened.
+    with telemetry.span('scan'):
+        optimized = load_manifest()
+        pending = []
         for png_file in png_files:
-            result = shrink_png(png_file)
-            results.append(result)
-            print(result)  # Print each result immediately for CI/CD visibility
-    else:
-        # Use multiprocessing for local development
-        # Determine optimal number of processes
-        # Use fewer processes than CPU cores to avoid overwhelming the system
-        num_processes = max(1, min(mp.cpu_count() - 1, len(png_files)))
-        print(f"Local environment detected - using {num_processes} processes for parallel processing")
+            if os.path.getsize(png_file) <= MAX_SIZE:
+                continue
+            if file_hash(png_file) in optimized:
+                print(f"SKIP: {png_file} was already optimized")
+                continue
+            pending.append(png_file)
+
+    print(f"Found {len(png_files)} PNG files, {len(pending)} to process")
+    telemetry.count(covers=len(png_files), processed=len(pending))
+    if not pending:
+        telemetry.save()
+        return
+    png_files = pending
+    
+    with telemetry.span('shrink'):
+        # Check if we're in CI/CD environment
+        if is_ci_environment():
+            print("CI/CD environment detected - using single-process mode for reliability")
+            # Process files sequentially in CI/CD
+            results = []
+            for png_file in png_files:
+                result = timed_shrink(png_file)
+                results.append(result)
+                print(result[0])  # Print each result immediately for CI/CD visibility
+        else:
+            # Use multiprocessing for local development
+            # Determine optimal number of processes
+            # Use fewer processes than CPU cores to avoid overwhelming the system
+            num_processes = max(1, min(mp.cpu_count() - 1, len(png_files)))
+            print(f"Local environment detected - using {num_processes} processes for parallel processing")
         
-        # Process files in parallel
-        with mp.Pool(processes=num_processes) as pool:
-            if use_tqdm:
-                # Use tqdm for progress tracking
-                results = list(tqdm(
-                    pool.imap(shrink_png, png_files),
-                    total=len(png_files),
-                    desc="Processing PNGs"
-                ))
+            if num_processes == 1:
+                # Not worth starting a process pool for a single worker
+                results = [timed_shrink(png_file) for png_file in png_files]
+                for result, _ in results:
+                    print(result)
             else:
-                results = pool.map(shrink_png, png_files)
+                # Process files in parallel
+                with mp.Pool(processes=num_processes) as pool:
+                    if use_tqdm:
+                        # Use tqdm for progress tracking
+                        results = list(tqdm(
+                            pool.imap(timed_shrink, png_files),
+                            total=len(png_files),
+                            desc="Processing PNGs"
+                        ))
+                    else:
+                        results = pool.map(timed_shrink, png_files)
+    for png_file, (_, seconds) in zip(png_files, results):
+        telemetry.item('cover', png_file, seconds)
     
+    # Remember what the processed covers look like now, so they are skipped next time
+    for png_file in png_files:
+        if os.path.isfile(png_file):
+            optimized.add(file_hash(png_file))
+    save_manifest(optimized)
+
     print(f"\nCompleted processing {len(png_files)} files")
     if not is_ci_environment():
         print(f"Used {'parallel' if num_processes > 1 else 'single'}-process mode")
+    telemetry.save()
 
 
 if __name__ == "__main__":
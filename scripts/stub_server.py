@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Stub Server for BonjourArcade
+
+Runs the local stand-in of ConvertKit, the Discord and Google Chat webhooks and
+the listGameScores cloud function (arcade_core/stub_server.py), so the newsletter
+delivery paths can be exercised without network access, with injected latency,
+errors and rate limits. Every request is recorded.
+
+Given a command after "--", the server runs it with the environment pointing at
+the stub (CONVERTKIT_API_URL, LEADERBOARD_API_URL and, with --webhook-map, every
+webhook's env var), prints a summary of the recorded requests and exits with the
+command's exit code. Without a command, it prints those variables and serves until
+interrupted.
+
+Usage:
+    # Send the test webhook through a flaky stub
+    python3 scripts/stub_server.py --webhook-map webhook_map.json --error-rate 0.3 -- \\
+        python3 scripts/send_newsletter.py --webhook-only --webhook-label test_hook --outbox /tmp/outbox.json
+
+    # Serve on a fixed port, rate limiting every 3rd Discord message
+    python3 scripts/stub_server.py --port 8765 --service discord --rate-limit-every 3 --retry-after 0.5
+
+--faults FILE takes a JSON object of per-service faults instead, e.g.
+{"convertkit": {"fail_first": 1, "process_on_error": true, "error_status": 502}}.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.stub_server import SERVICES, StubServer
+
+
+def stub_environment(server, webhook_map_path=None):
+    """Environment variables pointing the scripts at the stub: {name: url}."""
+    env = {
+        'CONVERTKIT_API_URL': f"{server.url}/v3",
+        'LEADERBOARD_API_URL': f"{server.url}/listGameScores",
+    }
+    if webhook_map_path:
+        with open(webhook_map_path, 'r', encoding='utf-8') as f:
+            webhook_map = json.load(f)
+        for label, info in webhook_map.items():
+            if info.get('env') and info.get('type') in ('discord', 'googlechat'):
+                env[info['env']] = server.webhook_url(info['type'], label)
+    return env
+
+
+def print_summary(server):
+    """One line per service: requests, statuses and injected faults."""
+    records = server.requests_for()
+    print(f"📊 Stub server: {len(records)} request{'s' if len(records) != 1 else ''} recorded")
+    for service in SERVICES:
+        service_records = [record for record in records if record['service'] == service]
+        if not service_records:
+            continue
+        statuses = Counter(record['status'] for record in service_records)
+        faults = Counter(record['fault'] for record in service_records if record['fault'])
+        status_text = ', '.join(f"{status}×{count}" for status, count in sorted(statuses.items()))
+        fault_text = f"; injected: {', '.join(f'{fault}×{count}' for fault, count in faults.items())}" if faults else ''
+        print(f"  {service}: {len(service_records)} ({status_text}{fault_text})")
+    if server.broadcasts:
+        print(f"  📧 {len(server.broadcasts)} broadcast{'s' if len(server.broadcasts) != 1 else ''} created")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the local stub of the newsletter services')
+    parser.add_argument('--port', type=int, default=0, help='Port to listen on (default: any free port)')
+    parser.add_argument('--service', action='append', choices=SERVICES,
+                        help='Service the fault options apply to (repeatable; default: every service)')
+    parser.add_argument('--latency', type=float, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, help='Random extra latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, help='Probability of an injected error (0-1)')
+    parser.add_argument('--error-status', type=int, help='HTTP status of injected errors (default: 503)')
+    parser.add_argument('--fail-first', type=int, help='Fail the first N requests of each service')
+    parser.add_argument('--rate-limit-every', type=int, help='Answer 429 to every Nth request')
+    parser.add_argument('--retry-after', type=float, help='Retry-After of the 429 responses, in seconds (default: 1)')
+    parser.add_argument('--process-on-error', action='store_true',
+                        help='Process the request before answering with an injected error (ambiguous failures)')
+    parser.add_argument('--faults', metavar='FILE', help='JSON file of per-service faults')
+    parser.add_argument('--scores', metavar='FIXTURE',
+                        help='listGameScores fixture ({game_id: [scores]}, as for leaderboard_cache.py --seed)')
+    parser.add_argument('--webhook-map', help='Webhook map whose env vars should point at the stub')
+    parser.add_argument('--record', metavar='FILE', help='Also append every request to this JSONL file')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random faults and generated scores')
+    parser.add_argument('command', nargs=argparse.REMAINDER, help='Command to run against the stub, after --')
+    args = parser.parse_args()
+
+    faults = {}
+    if args.faults:
+        with open(args.faults, 'r', encoding='utf-8') as f:
+            faults.update(json.load(f))
+    options = {
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'error_rate': args.error_rate,
+        'error_status': args.error_status,
+        'fail_first': args.fail_first,
+        'rate_limit_every': args.rate_limit_every,
+        'retry_after': args.retry_after,
+        'process_on_error': args.process_on_error or None,
+    }
+    options = {name: value for name, value in options.items() if value is not None}
+    if options:
+        for service in args.service or ['*']:
+            faults.setdefault(service, {}).update(options)
+
+    scores = None
+    if args.scores:
+        with open(args.scores, 'r', encoding='utf-8') as f:
+            scores = json.load(f)
+
+    try:
+        server = StubServer(port=args.port, faults=faults, scores=scores, record_path=args.record, seed=args.seed)
+        server.start()
+        env = stub_environment(server, args.webhook_map)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    print(f"🧪 Stub server listening on {server.url}")
+    try:
+        if command:
+            result = subprocess.run(command, env=dict(os.environ, **env))
+            print_summary(server)
+            sys.exit(result.returncode)
+        for name, value in env.items():
+            print(f"export {name}={value}")
+        print("Press Ctrl+C to stop")
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print_summary(server)
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
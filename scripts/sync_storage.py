@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Storage Sync for BonjourArcade
+
+Uploads to the bucket only what changed since the last sync (see
+arcade_core/storage_sync.py): the site's gamelist artifacts (target "pages",
+run by the CI pages job after compress_artifacts.py) or the ROMs listed in the
+ROM manifest (target "roms", see generate_rom_manifest.py). Objects are
+compared by content hash and headers against the sync manifest kept in the
+bucket, uploaded concurrently, and the sync manifest is rewritten at the end.
+
+--dir PATH syncs to a local directory instead of the bucket, with optional
+--latency/--bandwidth to simulate the network, so a sync can be planned and
+timed offline. --dry-run only prints the plan.
+
+Usage:
+    python3 scripts/sync_storage.py pages [--bucket bonjourarcade | --dir PATH] [--delete] [--dry-run] [--jobs N]
+    python3 scripts/sync_storage.py roms [--roms-manifest roms-manifest.json] [--roms-dir roms] [...]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arcade_core.roms import MANIFEST_PATH as ROMS_MANIFEST_PATH
+from arcade_core.roms import ROMS_DIR, parse_manifest
+from arcade_core.storage_sync import (
+    MAX_WORKERS,
+    SYNC_MANIFEST_KEY,
+    DirectoryBackend,
+    GCSBackend,
+    SyncError,
+    pages_objects,
+    plan_sync,
+    roms_objects,
+    run_sync,
+)
+
+BUCKET = 'bonjourarcade'
+
+
+def load_objects(args):
+    """The local SyncObjects of the target."""
+    if args.target == 'pages':
+        return pages_objects(args.public_dir)
+    try:
+        with open(args.roms_manifest, 'r', encoding='utf-8') as f:
+            manifest = parse_manifest(f.read())
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not read the ROM manifest {args.roms_manifest}: {e}")
+        sys.exit(1)
+    if manifest is None:
+        print(f"❌ Error: {args.roms_manifest} is not a JSON ROM manifest, run scripts/generate_rom_manifest.py")
+        sys.exit(1)
+    return roms_objects(manifest, args.roms_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload the changed artifacts or ROMs to the storage bucket')
+    parser.add_argument('target', choices=['pages', 'roms'], help='What to sync: the gamelist artifacts or the ROMs')
+    parser.add_argument('--bucket', default=BUCKET, help=f'Cloud Storage bucket (default: {BUCKET})')
+    parser.add_argument('--dir', help='Sync to this local directory instead of the bucket (offline stand-in)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='With --dir: simulated seconds of latency per request')
+    parser.add_argument('--bandwidth', type=float, default=None,
+                        help='With --dir: simulated upload bandwidth of each request, in MB/s')
+    parser.add_argument('--public-dir', default='public', help='Built site directory, for pages (default: public)')
+    parser.add_argument('--roms-manifest', default=ROMS_MANIFEST_PATH,
+                        help=f'ROM manifest, for roms (default: {ROMS_MANIFEST_PATH})')
+    parser.add_argument('--roms-dir', default=ROMS_DIR, help=f'ROM directory, for roms (default: {ROMS_DIR})')
+    parser.add_argument('--manifest-key', help=f"Key of the sync manifest in the bucket (default: {SYNC_MANIFEST_KEY.format(target='<target>')})")
+    parser.add_argument('--delete', action='store_true',
+                        help='Delete the remote objects that no longer exist locally (detail files, ROMs, '
+                             'hashed gamelist copies older than the previous deploy)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the plan without uploading anything')
+    parser.add_argument('--jobs', type=int, default=MAX_WORKERS,
+                        help=f'Number of concurrent uploads (default: {MAX_WORKERS})')
+    parser.add_argument('--verbose', action='store_true', help='Print every upload')
+    args = parser.parse_args()
+
+    manifest_key = args.manifest_key or SYNC_MANIFEST_KEY.format(target=args.target)
+    try:
+        if args.dir:
+            bandwidth = args.bandwidth * 1e6 if args.bandwidth else None
+            backend = DirectoryBackend(args.dir, latency=args.latency, bandwidth=bandwidth)
+            destination = args.dir
+        else:
+            backend = GCSBackend(args.bucket)
+            destination = f"gs://{args.bucket}"
+        remote = backend.read_manifest(manifest_key)
+    except SyncError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    objects = load_objects(args)
+    if remote is None:
+        print(f"⚠️  Warning: no sync manifest at {destination}/{manifest_key}, uploading everything")
+    plan = plan_sync(objects, remote, delete=args.delete)
+    upload_bytes = sum(os.path.getsize(obj.path) for obj in plan.uploads)
+    print(f"📋 {args.target} -> {destination}: {len(plan.uploads)} to upload ({upload_bytes / 1e6:.1f} MB), "
+          f"{len(plan.deletes)} to delete, {plan.unchanged} unchanged")
+
+    if args.dry_run:
+        for obj in plan.uploads:
+            encoding = f", {obj.content_encoding}" if obj.content_encoding else ''
+            print(f"   ⬆️  {obj.key} ({obj.cache_control}{encoding})")
+        for key in plan.deletes:
+            print(f"   🗑️  {key}")
+        return
+
+    def progress(item, error):
+        name = item if isinstance(item, str) else item.key
+        if error:
+            print(f"❌ Error: {name}: {error}")
+        elif args.verbose:
+            print(f"   ✅ {name}")
+
+    try:
+        result = run_sync(plan, backend, manifest_key, max_workers=args.jobs, progress=progress)
+    except SyncError as e:
+        print(f"❌ Error: Could not write the sync manifest: {e}")
+        sys.exit(1)
+    rate = result.bytes / 1e6 / result.seconds if result.seconds else 0
+    objects_rate = len(result.uploaded) / result.seconds if result.seconds else 0
+    print(f"✅ Uploaded {len(result.uploaded)} objects ({result.bytes / 1e6:.1f} MB) and deleted {len(result.deleted)} "
+          f"in {result.seconds:.2f}s ({rate:.1f} MB/s, {objects_rate:.0f} objects/s)")
+    if result.failed:
+        print(f"❌ {len(result.failed)} operations failed; they will be retried on the next sync")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,19 @@
-python3 scripts/send_newsletter.py --webhook-only --webhook-label test_hook
+#!/bin/bash
+# Send the newsletter to the test webhook.
+# With --stub, send it to the local stub server instead (no network or credentials needed), then
+# show what the stub received; extra arguments are passed to scripts/stub_server.py
+# (e.g. --error-rate 0.3 or --rate-limit-every 2 --retry-after 0.5).
+# Set WEEK_SEED=YYYYWW to send another week than the current one.
+
+if [ "$1" == "--stub" ]; then
+    shift
+    OUTBOX=$(mktemp)
+    # The stub accepts any secret: only require the real one outside of stub mode
+    CONVERTKIT_API_SECRET=${CONVERTKIT_API_SECRET:-stub} python3 scripts/stub_server.py --webhook-map webhook_map.json "$@" -- \
+        python3 scripts/send_newsletter.py --webhook-only --webhook-label test_hook --outbox "$OUTBOX" ${WEEK_SEED:+--week-seed "$WEEK_SEED"}
+    STATUS=$?
+    rm -f "$OUTBOX"
+    exit $STATUS
+fi
+
+python3 scripts/send_newsletter.py --webhook-only --webhook-label test_hook ${WEEK_SEED:+--week-seed "$WEEK_SEED"}